@@ -0,0 +1,282 @@
+"""
+Search-engine benchmark for the phase2 adversarial engines.
+
+Runs each engine on the saved positions in benchmarks/engine_positions.json
+with iterative deepening under a per-position time budget (depth 1, 2, ...,
+with the cache the scenario keeps between its calls, if any), and reports:
+
+    nodes       positions searched by the deepest completed iteration
+    nodes/sec   all nodes of all iterations / search time
+    EBF         effective branching factor b of the deepest iteration,
+                solving nodes = 1 + b + b^2 + ... + b^depth
+    hit rate    cache hits / nodes over all iterations
+    depth       deepest completed iteration (mean / min / max)
+
+An iteration is started only if the last one's time, scaled by the growth
+seen so far, still fits the budget; a running iteration is never cut off,
+so a position can overrun its budget by at most one iteration. Deepening
+also stops once the result is a forced win or loss. --depth D instead
+searches every position to exactly depth D, which makes node counts
+deterministic for comparing pruning or caching changes.
+
+Engines (the searches behind the phase2 scenarios):
+    both_players    minimax_both_players: alpha-beta, both sides searched, kept table
+    evasive_prey    minimax_evasive_prey: prey search against an A* chaser, kept table
+    ambush_monster  minimax_ambush_monster: monster search against the prey's A* path, no cache
+    bounded_astar   utils.get_minimax_path: depth-bounded A* (no cache)
+
+Usage:
+    python3 benchmarks/bench_engines.py                  # 50 ms per position
+    python3 benchmarks/bench_engines.py --budget 200
+    python3 benchmarks/bench_engines.py --depth 4        # fixed depth
+    python3 benchmarks/bench_engines.py --regenerate 12  # new position suite (12 per grid)
+
+Outputs:
+ - benchmarks/engines.csv
+"""
+import argparse
+import csv
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import profiling
+import config
+from utils import get_astar_path, get_minimax_path, get_bfs_distance_field
+from phase2.game_engine import (
+    INF, grid_graph, AdversarialSearch, AStarChaseOpponent, PathFollowerOpponent, TranspositionTable,
+    distance_evaluation, chase_evaluation,
+)
+from phase2 import minimax_both_players as both_scenario       # needs pygame (scenario constants)
+from phase2 import minimax_evasive_prey as evasive_scenario
+from phase2 import minimax_ambush_monster as ambush_scenario
+
+OUT_DIR = Path(__file__).parent
+POSITIONS_PATH = OUT_DIR / "engine_positions.json"
+CSV_PATH = OUT_DIR / "engines.csv"
+
+GRIDS = ["GRID_LARGE", "GRID_XLARGE"]
+DEFAULT_BUDGET_MS = 50
+MAX_DEPTH = 60
+
+
+# ==============================================================================
+#  POSITIONS
+# ==============================================================================
+def generate_positions(per_grid, seed=0):
+    """Prey and reward far apart, monster 3-12 steps from the prey: positions where the search matters."""
+    rng = random.Random(seed)
+    positions = []
+    for name in GRIDS:
+        grid = getattr(config, name)
+        width = len(grid[0])
+        cells = [(x, y) for y, row in enumerate(grid) for x, cell in enumerate(row) if cell != 1]
+        while len([p for p in positions if p["grid"] == name]) < per_grid:
+            prey = rng.choice(cells)
+            dist, _ = get_bfs_distance_field(list(prey), grid)
+            rewards = [c for c in cells if dist[c[1] * width + c[0]] >= 10]
+            monsters = [c for c in cells if 3 <= dist[c[1] * width + c[0]] <= 12]
+            if rewards and monsters:
+                positions.append({"grid": name, "prey": list(prey), "monster": list(rng.choice(monsters)),
+                                  "reward": list(rng.choice(rewards))})
+    return positions
+
+
+def load_positions(path=POSITIONS_PATH):
+    with open(path) as f:
+        return json.load(f)
+
+
+# ==============================================================================
+#  ENGINES
+# ==============================================================================
+# engine(grid, prey, monster, reward) -> search(depth) -> (score, nodes, cache_hits)
+# Each mirrors its scenario's search: same evaluation, opponent model and
+# cache (a TranspositionTable kept across calls, or none), with the
+# scenario's own constants, so the numbers describe the shipped engines.
+def both_players(grid, prey, monster, reward):
+    """minimax_both_players: its TranspositionTable is kept across ticks, so across iterations here."""
+    graph = grid_graph(grid)
+    table = TranspositionTable(both_scenario.MINIMAX_CACHE_ENTRIES)
+
+    def search(depth):
+        s = AdversarialSearch(graph, graph.index(reward), distance_evaluation, cache=table)
+        _, score = s.best_move(graph.index(prey), graph.index(monster), depth, True)
+        return score, s.nodes, s.cache_hits
+    return search
+
+
+def evasive_prey(grid, prey, monster, reward):
+    """minimax_evasive_prey: A* chaser opponent, kept TranspositionTable."""
+    graph = grid_graph(grid)
+    opponent = AStarChaseOpponent()
+    table = TranspositionTable(evasive_scenario.MINIMAX_CACHE_ENTRIES)
+
+    def search(depth):
+        s = AdversarialSearch(graph, graph.index(reward), distance_evaluation, opponent=opponent, cache=table)
+        _, score = s.best_move(graph.index(prey), graph.index(monster), depth, True)
+        return score, s.nodes, s.cache_hits
+    return search
+
+
+def ambush_monster(grid, prey, monster, reward):
+    """minimax_ambush_monster: prey on its A* path, no cache kept between searches."""
+    graph = grid_graph(grid)
+    prey_path = [graph.index(p) for p in get_astar_path(prey, reward, grid)]
+    opponent = PathFollowerOpponent(prey_path, ambush_scenario.PREY_LOOKAHEAD)
+
+    def search(depth):
+        s = AdversarialSearch(graph, None, chase_evaluation, opponent=opponent)
+        _, score = s.best_move(graph.index(prey), graph.index(monster), depth, False)
+        return score, s.nodes, s.cache_hits
+    return search
+
+
+def bounded_astar(grid, prey, monster, reward):
+    """utils.get_minimax_path, as called by BoundedAStarPolicy."""
+    def search(depth):
+        path, info = get_minimax_path(prey, reward, grid, return_info=True, depth=depth)
+        # A found path ends the deepening like a forced result does
+        return (INF if path else 0), info["nodes_expanded"], 0
+    return search
+
+
+ENGINES = {
+    "both_players": both_players,
+    "evasive_prey": evasive_prey,
+    "ambush_monster": ambush_monster,
+    "bounded_astar": bounded_astar,
+}
+
+
+# ==============================================================================
+#  MEASUREMENT
+# ==============================================================================
+def effective_branching_factor(nodes, depth):
+    """b with 1 + b + ... + b^depth = nodes (bisection); 0 for depth 0."""
+    if depth <= 0 or nodes <= 1:
+        return 0.0
+    total = lambda b: depth + 1 if b == 1 else (b ** (depth + 1) - 1) / (b - 1)
+    lo, hi = 0.0, float(nodes)
+    for _ in range(100):
+        mid = (lo + hi) / 2
+        if total(mid) < nodes:
+            lo = mid
+        else:
+            hi = mid
+    return (lo + hi) / 2
+
+
+def run_position(search, budget_s=None, fixed_depth=None):
+    """
+    Iteratively deepen one position (or search it once at fixed_depth).
+
+    Returns dict(depth, nodes, total_nodes, cache_hits, seconds, ebf).
+    """
+    depths = [fixed_depth] if fixed_depth else range(1, MAX_DEPTH + 1)
+    elapsed = 0.0
+    last = prev = None
+    reached = nodes = total_nodes = hits = 0
+    for depth in depths:
+        if budget_s is not None and last is not None:
+            growth = last / prev if prev else 1.0
+            if elapsed + last * max(growth, 1.0) > budget_s:
+                break
+        t0 = time.perf_counter()
+        score, nodes, depth_hits = search(depth)
+        took = time.perf_counter() - t0
+        prev, last = last, took
+        elapsed += took
+        reached = depth
+        total_nodes += nodes
+        hits += depth_hits
+        if abs(score) == INF:
+            break
+    return {"depth": reached, "nodes": nodes, "total_nodes": total_nodes, "cache_hits": hits,
+            "seconds": elapsed, "ebf": effective_branching_factor(nodes, reached)}
+
+
+def run(positions, engines, budget_ms, fixed_depth):
+    rows = []
+    budget_s = None if fixed_depth else budget_ms / 1000
+    for name in engines:
+        for i, pos in enumerate(positions):
+            grid = getattr(config, pos["grid"])
+            search = ENGINES[name](grid, pos["prey"], pos["monster"], pos["reward"])
+            r = run_position(search, budget_s, fixed_depth)
+            rows.append({"engine": name, "position": i, "grid": pos["grid"], **r})
+    return rows
+
+
+def summarize(rows):
+    """Per-engine aggregate dicts, in engine order."""
+    summary = {}
+    for r in rows:
+        summary.setdefault(r["engine"], []).append(r)
+    out = {}
+    for name, rs in summary.items():
+        seconds = sum(r["seconds"] for r in rs)
+        total = sum(r["total_nodes"] for r in rs)
+        depths = [r["depth"] for r in rs]
+        out[name] = {
+            "positions": len(rs),
+            "nodes": sum(r["nodes"] for r in rs) / len(rs),
+            "nodes_per_sec": total / seconds if seconds else 0.0,
+            "ebf": sum(r["ebf"] for r in rs) / len(rs),
+            "hit_rate": sum(r["cache_hits"] for r in rs) / total if total else 0.0,
+            "depth_mean": sum(depths) / len(depths),
+            "depth_min": min(depths),
+            "depth_max": max(depths),
+            "ms_per_position": 1000 * seconds / len(rs),
+        }
+    return out
+
+
+def print_summary(summary, label):
+    print(f"\n{label}")
+    print(f"{'engine':<15} | {'nodes':>9} | {'nodes/sec':>10} | {'EBF':>5} | {'hit rate':>8} | "
+          f"{'depth':>5} | {'min-max':>7} | {'ms/pos':>7}")
+    print("-" * 88)
+    for name, s in summary.items():
+        print(f"{name:<15} | {s['nodes']:>9.0f} | {s['nodes_per_sec']:>10.0f} | {s['ebf']:>5.2f} | "
+              f"{s['hit_rate']:>8.1%} | {s['depth_mean']:>5.1f} | {s['depth_min']:>3}-{s['depth_max']:<3} | "
+              f"{s['ms_per_position']:>7.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the phase2 search engines.")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET_MS, help="ms per position")
+    parser.add_argument("--depth", type=int, default=None, help="search to exactly this depth instead")
+    parser.add_argument("--engines", nargs="+", default=list(ENGINES), choices=list(ENGINES))
+    parser.add_argument("--positions", default=str(POSITIONS_PATH), help="position suite JSON")
+    parser.add_argument("--regenerate", type=int, metavar="N", default=None,
+                        help="write a new suite with N positions per grid to --positions first")
+    parser.add_argument("--seed", type=int, default=0, help="seed for --regenerate")
+    args = parser.parse_args()
+
+    if args.regenerate:
+        with open(args.positions, "w") as f:
+            json.dump(generate_positions(args.regenerate, args.seed), f, indent=1)
+        print(f"Wrote {args.regenerate * len(GRIDS)} positions to {args.positions}")
+    positions = load_positions(args.positions)
+
+    mode = f"fixed depth {args.depth}" if args.depth else f"iterative deepening, {args.budget:g} ms per position"
+    print(f"{len(positions)} positions, {mode}")
+    rows = run(positions, args.engines, args.budget, args.depth)
+
+    with open(CSV_PATH, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=rows[0].keys())
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"Wrote results to {CSV_PATH}")
+    print_summary(summarize(rows), mode)
+
+
+if __name__ == "__main__":
+    profiling.install()
+    main()
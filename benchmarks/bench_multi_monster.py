@@ -0,0 +1,71 @@
+"""
+Multi-monster tick throughput on GRID_XLARGE.
+
+Plays A* prey against N shortest-path monsters (phase2/multi_monster.py)
+and reports ticks/sec and time per tick for each monster count. Only
+tick() is timed; a game that ends is reset (untimed) and play continues.
+
+Usage: python3 benchmarks/bench_multi_monster.py
+
+Outputs:
+ - benchmarks/multi_monster.csv
+"""
+import time
+import csv
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import profiling
+profiling.install()  # --profile / $PROFILE, see profiling.py
+from config import GRID_XLARGE, PLAYER_START_POS_XLARGE, GOAL_POS_XLARGE
+from phase2.game_engine import AStarPolicy
+from phase2.multi_monster import MultiMonsterGame, spread_positions
+
+OUT_DIR = Path(__file__).parent
+CSV_PATH = OUT_DIR / "multi_monster.csv"
+
+MONSTER_COUNTS = [1, 2, 5, 10, 20, 50, 100, 200, 500]
+TICKS = 400
+MIN_START_DISTANCE = 8
+
+
+def measure(count):
+    monsters = spread_positions(GRID_XLARGE, count, avoid=[PLAYER_START_POS_XLARGE],
+                                min_distance=MIN_START_DISTANCE, seed=count)
+    game = MultiMonsterGame(GRID_XLARGE, PLAYER_START_POS_XLARGE, monsters, GOAL_POS_XLARGE,
+                            prey_policy=AStarPolicy())
+    elapsed = 0.0
+    games = 1
+    for _ in range(TICKS):
+        if game.result:
+            game.reset()
+            games += 1
+        t0 = time.perf_counter()
+        game.tick()
+        elapsed += time.perf_counter() - t0
+    return elapsed, games
+
+
+rows = []
+print(f"{TICKS} ticks per monster count on GRID_XLARGE (A* prey)\n")
+print(f"{'monsters':>8} | {'ticks/sec':>10} | {'ms/tick':>8} | {'games':>5}")
+print("-" * 42)
+for count in MONSTER_COUNTS:
+    elapsed, games = measure(count)
+    row = {
+        "monsters": count,
+        "ticks_per_sec": TICKS / elapsed,
+        "ms_per_tick": 1000 * elapsed / TICKS,
+        "games": games,
+    }
+    rows.append(row)
+    print(f"{count:>8} | {row['ticks_per_sec']:>10.1f} | {row['ms_per_tick']:>8.3f} | {games:>5}")
+
+with CSV_PATH.open("w", newline="") as f:
+    writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+    writer.writeheader()
+    writer.writerows(rows)
+print(f"\nWrote {CSV_PATH}")
@@ -0,0 +1,174 @@
+"""
+Pathfinder scaling across generated maps from 10x10 to 2000x2000.
+
+Runs every function in utils.PATHFINDERS on every map family in
+benchmarks/grids.py at every size, between two far-apart cells (see
+grids.endpoints), and fits time ~ cells^k and nodes ~ cells^k per family
+and pathfinder by least squares on the log-log points. Sizes below
+FIT_MIN_CELLS are left out of the fit: fixed per-call overhead dominates
+there. Time is the median of a few calls (more on small maps).
+
+Usage:
+    python3 benchmarks/bench_scaling.py                  # full sweep (minutes)
+    python3 benchmarks/bench_scaling.py --max-size 500   # quick sweep
+    python3 benchmarks/bench_scaling.py --families maze rooms --algorithms astar_fast
+
+Outputs:
+ - benchmarks/scaling.csv
+ - benchmarks/scaling_time.png
+ - benchmarks/scaling_nodes.png
+"""
+import argparse
+import csv
+import math
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import profiling
+from utils import PATHFINDERS
+from grids import FAMILIES, SIZES, endpoints
+
+try:
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    HAS_PLOTTING = True
+except Exception:
+    plt = None
+    HAS_PLOTTING = False
+
+OUT_DIR = Path(__file__).parent
+CSV_PATH = OUT_DIR / "scaling.csv"
+PLOT_TIME = OUT_DIR / "scaling_time.png"
+PLOT_NODES = OUT_DIR / "scaling_nodes.png"
+
+MAX_REPEATS = 7
+TARGET_SECONDS = 0.2       # stop repeating once this much time was spent on one point
+FIT_MIN_CELLS = 2500
+
+
+def time_call(func, start, goal, grid):
+    """(median seconds, info, path) over up to MAX_REPEATS calls."""
+    times = []
+    while len(times) < MAX_REPEATS and sum(times) < TARGET_SECONDS:
+        t0 = time.perf_counter_ns()
+        path, info = func(list(start), list(goal), grid, return_info=True)
+        times.append((time.perf_counter_ns() - t0) / 1e9)
+    return statistics.median(times), info, path
+
+
+def fit_exponent(points):
+    """Least-squares slope of log(y) on log(x); None with fewer than two usable points."""
+    pts = [(math.log(x), math.log(y)) for x, y in points if x >= FIT_MIN_CELLS and y > 0]
+    if len(pts) < 2:
+        return None
+    mx = sum(p[0] for p in pts) / len(pts)
+    my = sum(p[1] for p in pts) / len(pts)
+    sxx = sum((p[0] - mx) ** 2 for p in pts)
+    return sum((p[0] - mx) * (p[1] - my) for p in pts) / sxx if sxx else None
+
+
+def run(families, sizes, algorithms, seed):
+    rows = []
+    for family in families:
+        for size in sizes:
+            grid = FAMILIES[family](size, seed)
+            start, goal = endpoints(grid)
+            cells = size * size
+            for name in algorithms:
+                seconds, info, path = time_call(PATHFINDERS[name], start, goal, grid)
+                rows.append({
+                    "family": family,
+                    "size": size,
+                    "cells": cells,
+                    "algorithm": name,
+                    "time": seconds,
+                    "nodes_expanded": info.get("nodes_expanded", 0),
+                    "path_len": len(path),
+                })
+                print(f"  {family:<9} {size:>5}x{size:<5} {name:<11} {1000 * seconds:>10.3f} ms "
+                      f"{rows[-1]['nodes_expanded']:>9} nodes  path {len(path)}")
+    return rows
+
+
+def exponents(rows):
+    """{(family, algorithm): (time exponent, nodes exponent)}."""
+    groups = {}
+    for r in rows:
+        groups.setdefault((r["family"], r["algorithm"]), []).append(r)
+    return {
+        key: (fit_exponent([(r["cells"], r["time"]) for r in rs]),
+              fit_exponent([(r["cells"], r["nodes_expanded"]) for r in rs]))
+        for key, rs in groups.items()
+    }
+
+
+def print_exponents(fits):
+    fmt = lambda k: f"{k:.2f}" if k is not None else "-"
+    print(f"\nFitted exponents k (metric ~ cells^k, maps >= {FIT_MIN_CELLS} cells)")
+    print(f"{'family':<10} | {'algorithm':<11} | {'time k':>6} | {'nodes k':>7}")
+    print("-" * 44)
+    for (family, name), (tk, nk) in fits.items():
+        print(f"{family:<10} | {name:<11} | {fmt(tk):>6} | {fmt(nk):>7}")
+
+
+def plot(rows, fits, metric, ylabel, path):
+    families = list(dict.fromkeys(r["family"] for r in rows))
+    cols = min(3, len(families))
+    nrows = math.ceil(len(families) / cols)
+    fig, axes = plt.subplots(nrows, cols, figsize=(5 * cols, 4 * nrows), squeeze=False)
+    for ax, family in zip(axes.flat, families):
+        for name in dict.fromkeys(r["algorithm"] for r in rows):
+            pts = [(r["cells"], r[metric]) for r in rows if r["family"] == family and r["algorithm"] == name]
+            k = fits[family, name][0 if metric == "time" else 1]
+            label = f"{name} (k={k:.2f})" if k is not None else name
+            ax.loglog([p[0] for p in pts], [p[1] for p in pts], "o-", label=label)
+        ax.set_title(family)
+        ax.set_xlabel("cells")
+        ax.set_ylabel(ylabel)
+        ax.legend(fontsize=8)
+    for ax in list(axes.flat)[len(families):]:
+        ax.set_visible(False)
+    plt.tight_layout()
+    fig.savefig(path)
+    print(f"Wrote {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pathfinder scaling on generated maps.")
+    parser.add_argument("--families", nargs="+", default=list(FAMILIES), choices=list(FAMILIES))
+    parser.add_argument("--algorithms", nargs="+", default=list(PATHFINDERS), choices=list(PATHFINDERS))
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="map side lengths")
+    parser.add_argument("--max-size", type=int, default=max(SIZES), help="skip sizes above this")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    sizes = [s for s in sorted(args.sizes) if s <= args.max_size]
+    print(f"Families {', '.join(args.families)}; sizes {sizes}; pathfinders {', '.join(args.algorithms)}")
+    rows = run(args.families, sizes, args.algorithms, args.seed)
+
+    with open(CSV_PATH, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=rows[0].keys())
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"Wrote results to {CSV_PATH}")
+
+    fits = exponents(rows)
+    print_exponents(fits)
+
+    if HAS_PLOTTING:
+        plot(rows, fits, "time", "time (s)", PLOT_TIME)
+        plot(rows, fits, "nodes_expanded", "nodes expanded", PLOT_NODES)
+    else:
+        print("matplotlib not available: CSV written but plots were skipped.")
+
+
+if __name__ == "__main__":
+    profiling.install()
+    main()
@@ -0,0 +1,237 @@
+"""
+Differential fuzzing of every registered pathfinder against get_bfs_path.
+
+Each case is a random grid (random size, wall density and endpoints, the
+goal sometimes marked 3 as in config's maps). Every function in
+utils.PATHFINDERS must return a path that
+
+    - has the same length as get_bfs_path's (or is empty exactly when BFS
+      finds no path)
+    - starts at start and ends at goal
+    - moves one orthogonal step at a time
+    - stays on the grid and off walls
+
+A failing case is shrunk before it is reported: rows and columns are
+dropped, then walls removed, for as long as the same pathfinder still
+fails the same check; every step makes the case smaller, so it ends. The minimal grid is printed and
+saved as JSON so it can be replayed with --replay.
+
+Usage:
+    python3 benchmarks/fuzz_pathfinders.py                    # 2000 cases
+    python3 benchmarks/fuzz_pathfinders.py --cases 50000 --max-size 40 --seed 7
+    python3 benchmarks/fuzz_pathfinders.py --replay benchmarks/fuzz_failure.json
+
+Outputs (on failure):
+ - benchmarks/fuzz_failure.json
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import profiling
+from utils import PATHFINDERS, get_bfs_path
+
+OUT_DIR = Path(__file__).parent
+FAILURE_PATH = OUT_DIR / "fuzz_failure.json"
+
+DEFAULT_CASES = 2000
+DEFAULT_MAX_SIZE = 24
+WALL, GOAL = 1, 3
+
+
+# ==============================================================================
+#  CASES
+# ==============================================================================
+def random_case(rng, max_size):
+    """(grid, start, goal): any shape from 1x1 up, walls at a random density, endpoints on open cells."""
+    width = rng.randint(1, max_size)
+    height = rng.randint(1, max_size)
+    density = rng.choice([0.0, 0.1, 0.25, 0.4, rng.random()])
+    grid = [[WALL if rng.random() < density else 0 for _ in range(width)] for _ in range(height)]
+    start = [rng.randrange(width), rng.randrange(height)]
+    goal = [rng.randrange(width), rng.randrange(height)]
+    grid[start[1]][start[0]] = 0
+    grid[goal[1]][goal[0]] = GOAL if rng.random() < 0.5 else 0
+    return grid, start, goal
+
+
+# ==============================================================================
+#  CHECKS
+# ==============================================================================
+def check_path(path, grid, start, goal, expected_len):
+    """Name of the first property `path` violates, or None."""
+    if expected_len == 0:
+        return None if not path else "path where BFS found none"
+    if not path:
+        return "no path where BFS found one"
+    if len(path) != expected_len:
+        return f"length {len(path)} != BFS {expected_len}"
+    if list(path[0]) != list(start):
+        return "does not start at start"
+    if list(path[-1]) != list(goal):
+        return "does not end at goal"
+    height, width = len(grid), len(grid[0])
+    for (x, y) in path:
+        if not (0 <= x < width and 0 <= y < height):
+            return "leaves the grid"
+        if grid[y][x] == WALL:
+            return "crosses a wall"
+    for (x0, y0), (x1, y1) in zip(path, path[1:]):
+        if abs(x0 - x1) + abs(y0 - y1) != 1:
+            return "non-adjacent step"
+    return None
+
+
+def run_case(name, grid, start, goal):
+    """Failure message of pathfinder `name` on this case, or None."""
+    expected = get_bfs_path(list(start), list(goal), grid)
+    reference = check_path(expected, grid, start, goal, len(expected))
+    if reference is not None:
+        return f"get_bfs_path itself: {reference}"
+    try:
+        path, _ = PATHFINDERS[name](list(start), list(goal), grid, return_info=True)
+    except Exception as e:
+        return f"raised {type(e).__name__}: {e}"
+    return check_path(path, grid, start, goal, len(expected))
+
+
+def _kind(message):
+    """The failing property, without the numbers, so shrinking keeps the same failure."""
+    return message.split(" ")[0] if message.startswith("length") else message.split(":")[0]
+
+
+# ==============================================================================
+#  SHRINKING
+# ==============================================================================
+def _drop_row(grid, start, goal, r):
+    if r in (start[1], goal[1]) or len(grid) == 1:
+        return None
+    shift = lambda p: [p[0], p[1] - (p[1] > r)]
+    return [row for i, row in enumerate(grid) if i != r], shift(start), shift(goal)
+
+
+def _drop_col(grid, start, goal, c):
+    if c in (start[0], goal[0]) or len(grid[0]) == 1:
+        return None
+    shift = lambda p: [p[0] - (p[0] > c), p[1]]
+    return [[v for i, v in enumerate(row) if i != c] for row in grid], shift(start), shift(goal)
+
+
+def _open_cell(grid, start, goal, x, y):
+    if grid[y][x] != WALL:
+        return None
+    new = [row[:] for row in grid]
+    new[y][x] = 0
+    return new, start, goal
+
+
+def _candidates(grid, start, goal):
+    """Strictly smaller variants of a case (fewer rows, columns or walls), biggest reductions first."""
+    for r in range(len(grid) - 1, -1, -1):
+        yield _drop_row(grid, start, goal, r)
+    for c in range(len(grid[0]) - 1, -1, -1):
+        yield _drop_col(grid, start, goal, c)
+    for y in range(len(grid)):
+        for x in range(len(grid[0])):
+            yield _open_cell(grid, start, goal, x, y)
+
+
+def shrink(name, grid, start, goal, message):
+    """Greedily reduce a failing case while `name` keeps failing the same way."""
+    kind = _kind(message)
+    changed = True
+    while changed:
+        changed = False
+        for candidate in _candidates(grid, start, goal):
+            if candidate is None:
+                continue
+            failure = run_case(name, *candidate)
+            if failure is not None and _kind(failure) == kind:
+                grid, start, goal = candidate
+                message = failure
+                changed = True
+                break
+    return grid, start, goal, message
+
+
+def render(grid, start, goal):
+    chars = {0: ".", WALL: "#", GOAL: "."}
+    rows = []
+    for y, row in enumerate(grid):
+        line = ""
+        for x, v in enumerate(row):
+            line += "S" if [x, y] == list(start) else "G" if [x, y] == list(goal) else chars.get(v, "?")
+        rows.append(line)
+    return "\n".join(rows)
+
+
+def report(name, grid, start, goal, message, seed, case):
+    print(f"\nFAIL {name} (seed {seed}, case {case}): {message}")
+    print(f"shrunk to {len(grid[0])}x{len(grid)}, start {start}, goal {goal}:")
+    print(render(grid, start, goal))
+    with open(FAILURE_PATH, "w") as f:
+        json.dump({"pathfinder": name, "message": message, "seed": seed, "case": case,
+                   "grid": grid, "start": start, "goal": goal}, f)
+    print(f"Saved to {FAILURE_PATH} (rerun with --replay)")
+
+
+# ==============================================================================
+#  MAIN
+# ==============================================================================
+def fuzz(cases, max_size, seed, names, time_limit=None):
+    """Run up to `cases` random cases; returns the number of failures (each reported shrunk)."""
+    rng = random.Random(seed)
+    deadline = time.perf_counter() + time_limit if time_limit else None
+    failed = set()
+    run = 0
+    for case in range(cases):
+        if deadline is not None and time.perf_counter() > deadline:
+            break
+        grid, start, goal = random_case(rng, max_size)
+        run += 1
+        for name in names:
+            if name in failed:
+                continue
+            message = run_case(name, grid, start, goal)
+            if message is not None:
+                failed.add(name)
+                report(name, *shrink(name, grid, start, goal, message), seed, case)
+    print(f"\n{run} cases x {len(names)} pathfinders: "
+          + (f"{len(failed)} failing ({', '.join(sorted(failed))})" if failed else "all agree with get_bfs_path"))
+    return len(failed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Differential fuzzing of the registered pathfinders.")
+    parser.add_argument("--cases", type=int, default=DEFAULT_CASES)
+    parser.add_argument("--max-size", type=int, default=DEFAULT_MAX_SIZE, help="largest grid side")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--time", type=float, default=None, help="stop after this many seconds")
+    parser.add_argument("--pathfinders", nargs="+", default=list(PATHFINDERS), choices=list(PATHFINDERS))
+    parser.add_argument("--replay", metavar="FILE", help="rerun a saved failure")
+    args = parser.parse_args()
+
+    if args.replay:
+        with open(args.replay) as f:
+            case = json.load(f)
+        if case["pathfinder"] not in PATHFINDERS:
+            raise SystemExit(f"{case['pathfinder']!r} is not in utils.PATHFINDERS")
+        print(render(case["grid"], case["start"], case["goal"]))
+        message = run_case(case["pathfinder"], case["grid"], case["start"], case["goal"])
+        print(f"{case['pathfinder']}: {message or 'passes'}")
+        sys.exit(1 if message else 0)
+
+    print(f"Fuzzing {', '.join(args.pathfinders)} against get_bfs_path "
+          f"({args.cases} cases up to {args.max_size}x{args.max_size}, seed {args.seed})...")
+    sys.exit(1 if fuzz(args.cases, args.max_size, args.seed, args.pathfinders, args.time) else 0)
+
+
+if __name__ == "__main__":
+    profiling.install()
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark map generators for any size.
+
+Every generator returns a size x size grid (list of rows, 0 = open,
+1 = wall) and is deterministic for a given seed:
+
+    open      no walls
+    randomNN  independent walls with NN% density
+    rooms     square rooms separated by walls, with doors between neighbours
+    maze      perfect maze (recursive backtracker on odd cells)
+
+endpoints() picks a far-apart start and goal in one connected region.
+"""
+import random
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from utils import get_bfs_distance_field
+
+SIZES = [10, 25, 50, 100, 250, 500, 1000, 2000]
+ROOM_SIZE = 8
+
+
+def open_field(size, seed=0):
+    return [[0] * size for _ in range(size)]
+
+
+def random_obstacles(size, density, seed=0):
+    rng = random.Random(seed)
+    return [[1 if rng.random() < density else 0 for _ in range(size)] for _ in range(size)]
+
+
+def rooms(size, seed=0, room=ROOM_SIZE):
+    """Rooms of `room` x `room` open cells; every shared wall gets one door at a random spot."""
+    rng = random.Random(seed)
+    grid = [[0] * size for _ in range(size)]
+    step = room + 1
+    for line in range(room, size, step):
+        for i in range(size):
+            grid[line][i] = 1
+            grid[i][line] = 1
+    for line in range(room, size, step):
+        for start in range(0, size, step):
+            end = min(start + room, size)
+            door = rng.randrange(start, end)
+            grid[line][door] = 0        # door in a horizontal wall
+            door = rng.randrange(start, end)
+            grid[door][line] = 0        # door in a vertical wall
+    return grid
+
+
+def perfect_maze(size, seed=0):
+    """Recursive-backtracker maze (as config.GRID_XLARGE), iterative so any size works."""
+    rng = random.Random(seed)
+    grid = [[1] * size for _ in range(size)]
+    if size < 3:
+        return [[0] * size for _ in range(size)]
+    grid[1][1] = 0
+    stack = [(1, 1)]
+    dirs = [(-2, 0), (2, 0), (0, -2), (0, 2)]
+    while stack:
+        r, c = stack[-1]
+        neighbors = [(r + dr, c + dc) for dr, dc in dirs
+                     if 1 <= r + dr < size - 1 and 1 <= c + dc < size - 1 and grid[r + dr][c + dc] == 1]
+        if neighbors:
+            nr, nc = rng.choice(neighbors)
+            grid[(r + nr) // 2][(c + nc) // 2] = 0
+            grid[nr][nc] = 0
+            stack.append((nr, nc))
+        else:
+            stack.pop()
+    return grid
+
+
+# family name -> generator(size, seed)
+FAMILIES = {
+    "open": open_field,
+    "random10": lambda size, seed=0: random_obstacles(size, 0.10, seed),
+    "random20": lambda size, seed=0: random_obstacles(size, 0.20, seed),
+    "random30": lambda size, seed=0: random_obstacles(size, 0.30, seed),
+    "rooms": rooms,
+    "maze": perfect_maze,
+}
+
+
+def _farthest(grid, start):
+    width = len(grid[0])
+    dist, _ = get_bfs_distance_field(start, grid)
+    far = max(range(len(dist)), key=dist.__getitem__)
+    return [far % width, far // width]
+
+
+def endpoints(grid):
+    """
+    (start, goal) as [x, y], roughly a diameter of the region around the centre.
+
+    Two BFS sweeps: the cell farthest from the open cell nearest the centre,
+    then the cell farthest from that one.
+    """
+    size = len(grid)
+    centre = size // 2
+    open_cells = ((x, y) for y, row in enumerate(grid) for x, cell in enumerate(row) if cell != 1)
+    seed_cell = min(open_cells, key=lambda c: abs(c[0] - centre) + abs(c[1] - centre))
+    start = _farthest(grid, list(seed_cell))
+    return start, _farthest(grid, start)
@@ -1,37 +1,70 @@
 """
 Benchmark runner for AI_Zombie_Project.
-Generates CSV results and PNG summary plots.
+Generates CSV results, PNG summary plots and a baseline JSON per run, and
+compares two baselines for statistically significant changes.
 
-Usage: python3 benchmarks/run_benchmarks.py
+Every (phase, pathfinder) case, and one decision of each phase2 engine in
+ENGINES, is timed with time.perf_counter_ns after
+WARMUP untimed calls, with the garbage collector off while timing (--gc
+keeps it on). Calls repeat until the 95% confidence interval of the mean is
+within --precision of the mean (at least MIN_REPEATS, at most MAX_REPEATS
+calls or MAX_CASE_SECONDS per case).
+
+--compare OLD NEW runs a Mann-Whitney U test on the raw samples of each
+case. A case is flagged when the difference is significant (p < --alpha)
+and the medians differ by more than --min-change; the exit status is 1 if
+any case got slower.
+
+--memory also runs every case once under tracemalloc and records its peak
+traced memory and the bytes and blocks still held when it returns (its
+result, e.g. the path, visited set and search info). --sizes adds generated
+maze maps of those side lengths (benchmarks/grids.py) to the two fixed maps.
+
+Usage:
+    python3 benchmarks/run_benchmarks.py
+    python3 benchmarks/run_benchmarks.py --memory --sizes 100 250
+    python3 benchmarks/run_benchmarks.py --save before      # baselines/before.json
+    python3 benchmarks/run_benchmarks.py --compare benchmarks/baselines/before.json benchmarks/baselines/after.json
 
 Outputs:
  - benchmarks/results.csv
  - benchmarks/plots_time.png
  - benchmarks/plots_nodes.png
+ - benchmarks/baselines/<name>.json
 """
-import time
+import argparse
 import csv
+import gc
+import json
+import math
+import platform
 import statistics
-from pathlib import Path
 import sys
+import time
+import tracemalloc
+from pathlib import Path
 
 # Ensure repository root is on sys.path so we can import config and utils
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
 
+import profiling
 from config import (
     GRID_LARGE, PLAYER_START_POS_LARGE, GOAL_POS_LARGE,
     GRID_XLARGE, PLAYER_START_POS_XLARGE, GOAL_POS_XLARGE,
 )
-from utils import get_bfs_path, get_astar_path, get_astar_path_fast
+from utils import PATHFINDERS, get_astar_path, get_bfs_path, get_minimax_path
+from phase2.game_engine import PREY, AStarChaseOpponent, grid_graph, minimax_path, intercept_path
+from grids import perfect_maze, endpoints
 
 try:
+    import matplotlib
+    matplotlib.use("Agg")
     import matplotlib.pyplot as plt
-    import pandas as pd
     HAS_PLOTTING = True
 except Exception:
     plt = None
-    pd = None
     HAS_PLOTTING = False
 
 OUT_DIR = Path(__file__).parent
@@ -39,95 +72,304 @@ OUT_DIR.mkdir(parents=True, exist_ok=True)
 CSV_PATH = OUT_DIR / "results.csv"
 PLOT_TIME = OUT_DIR / "plots_time.png"
 PLOT_NODES = OUT_DIR / "plots_nodes.png"
+BASELINE_DIR = OUT_DIR / "baselines"
 
-TRIALS = 50
+WARMUP = 5
+MIN_REPEATS = 20
+MAX_REPEATS = 2000
+MAX_CASE_SECONDS = 5.0
+PRECISION = 0.01          # target 95% CI half-width, relative to the mean
+ALPHA = 0.01              # significance level for --compare
+MIN_CHANGE = 0.02         # ignore significant median changes smaller than this
+ENGINE_DEPTH = 4          # minimax plies per engine decision
+BOUNDED_DEPTH = 10        # get_minimax_path depth (its default)
 
 phases = [
     ("phase2", GRID_LARGE, PLAYER_START_POS_LARGE, GOAL_POS_LARGE),
     ("phase3", GRID_XLARGE, PLAYER_START_POS_XLARGE, GOAL_POS_XLARGE),
 ]
 
-algos = [
-    ("bfs", get_bfs_path),
-    ("astar", get_astar_path),
-    ("astar_fast", get_astar_path_fast),
-]
+# One decision of each phase2 engine: engine(grid, prey, reward, monster) -> (path, info).
+# The prey heads from the phase's start to its goal; the monster waits halfway along the way.
+ENGINES = {
+    "bounded_astar": lambda grid, prey, reward, monster: get_minimax_path(
+        prey, reward, grid, return_info=True, depth=BOUNDED_DEPTH),
+    "minimax": lambda grid, prey, reward, monster: minimax_path(
+        grid_graph(grid), PREY, prey, monster, reward, ENGINE_DEPTH, return_info=True),
+    "evasive": lambda grid, prey, reward, monster: minimax_path(
+        grid_graph(grid), PREY, prey, monster, reward, ENGINE_DEPTH, opponent=AStarChaseOpponent(),
+        return_info=True),
+    "ambush": lambda grid, prey, reward, monster: intercept_path(
+        grid_graph(grid), monster, prey, get_astar_path(prey, reward, grid), return_info=True),
+}
+
+
+def generated_phases(sizes, seed=0):
+    """Extra (name, grid, start, goal) phases on generated mazes."""
+    extra = []
+    for size in sizes:
+        grid = perfect_maze(size, seed)
+        start, goal = endpoints(grid)
+        extra.append((f"maze{size}", grid, start, goal))
+    return extra
+
+
+def halfway(grid, start, goal):
+    """The middle cell of the shortest start-goal path (where the engines' monster stands)."""
+    path = get_bfs_path(start, goal, grid)
+    return list(path[len(path) // 2])
+
+
+def ci_halfwidth(samples):
+    """Half-width of the normal-approximation 95% confidence interval of the mean."""
+    return 1.96 * statistics.stdev(samples) / math.sqrt(len(samples))
+
+
+def measure(call, precision=PRECISION, keep_gc=False):
+    """
+    Time call() -> (path, info) until the mean is known to `precision`.
+
+    Returns (samples in ns, info, path) of the calls.
+    """
+    for _ in range(WARMUP):
+        call()
+
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    if not keep_gc:
+        gc.collect()
+        gc.disable()
+    try:
+        deadline = time.perf_counter_ns() + int(MAX_CASE_SECONDS * 1e9)
+        while len(samples) < MAX_REPEATS:
+            t0 = time.perf_counter_ns()
+            path, info = call()
+            samples.append(time.perf_counter_ns() - t0)
+            if len(samples) >= MIN_REPEATS:
+                mean = statistics.fmean(samples)
+                if ci_halfwidth(samples) <= precision * mean or time.perf_counter_ns() > deadline:
+                    break
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return samples, info, path
+
+
+def measure_memory(call):
+    """
+    One call() under tracemalloc.
+
+    Returns {"peak_bytes", "retained_bytes", "retained_blocks"}: the peak
+    traced memory during the call, and the memory and block count still
+    allocated by it when it returns (while its result is alive).
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = call()
+        retained, peak = tracemalloc.get_traced_memory()
+        blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+    finally:
+        tracemalloc.stop()
+    del result
+    return {"peak_bytes": peak, "retained_bytes": retained, "retained_blocks": blocks}
 
-rows = []
-print(f"Running {TRIALS} trials per algorithm per phase...")
-for phase_name, grid, start, goal in phases:
-    for alg_name, func in algos:
-        print(f"Phase={phase_name} Alg={alg_name}")
-        for i in range(TRIALS):
-            s = start.copy(); g = goal.copy()
-            t0 = time.time()
-            try:
-                res = func(s, g, grid, return_info=True)
-                if isinstance(res, tuple) and len(res) >= 2:
-                    path, info = res
-                else:
-                    path = res
-                    info = {}
-            except TypeError:
-                path = func(s, g, grid)
-                info = {}
-            t = time.time() - t0
-            rows.append({
+
+def _calls(grid, start, goal):
+    """(name, call) for every registered pathfinder and engine on one phase."""
+    calls = [(name, lambda f=func: f(list(start), list(goal), grid, return_info=True))
+             for name, func in PATHFINDERS.items()]
+    monster = halfway(grid, start, goal)
+    calls += [(name, lambda e=engine: e(grid, list(start), list(goal), list(monster)))
+              for name, engine in ENGINES.items()]
+    return calls
+
+
+def run_cases(all_phases, precision=PRECISION, keep_gc=False, memory=False):
+    """{"phase/algorithm": case dict} for every phase, registered pathfinder and engine."""
+    cases = {}
+    for phase_name, grid, start, goal in all_phases:
+        for alg_name, call in _calls(grid, start, goal):
+            samples, info, path = measure(call, precision, keep_gc)
+            mean = statistics.fmean(samples)
+            half = ci_halfwidth(samples)
+            cases[f"{phase_name}/{alg_name}"] = {
                 "phase": phase_name,
                 "algorithm": alg_name,
-                "run": i,
-                "time": t,
+                "samples_ns": samples,
+                "median_ns": statistics.median(samples),
+                "mean_ns": mean,
+                "ci95_ns": [mean - half, mean + half],
                 "nodes_expanded": info.get("nodes_expanded", 0),
                 "heap_ops": info.get("heap_ops", 0),
                 "path_len": len(path) if path else 0,
-            })
-
-# Write CSV
-with open(CSV_PATH, "w", newline="") as f:
-    writer = csv.DictWriter(f, fieldnames=rows[0].keys())
-    writer.writeheader()
-    writer.writerows(rows)
-print(f"Wrote results to {CSV_PATH}")
-if HAS_PLOTTING:
-    # Load into pandas and plot summary
-    df = pd.DataFrame(rows)
-
-    summary = df.groupby(["phase", "algorithm"]).agg({
-        "time": ["mean", "std"],
-        "nodes_expanded": ["mean", "std"],
-        "path_len": ["mean"],
-    }).reset_index()
-
-    # Time plot
-    fig, ax = plt.subplots(figsize=(8, 4))
-    for phase_name in df['phase'].unique():
-        sub = summary[summary['phase'] == phase_name]
-        algs = sub['algorithm']
-        means = sub[('time', 'mean')]
-        errs = sub[('time', 'std')]
-        ax.errorbar([f"{phase_name}\n{a}" for a in algs], means, yerr=errs, fmt='o', label=phase_name)
-    ax.set_ylabel('time (s)')
-    ax.set_title('Mean time per algorithm (with std)')
-    plt.xticks(rotation=45, ha='right')
-    plt.tight_layout()
-    fig.savefig(PLOT_TIME)
-    print(f"Wrote time plot to {PLOT_TIME}")
-
-    # Nodes plot
-    fig, ax = plt.subplots(figsize=(8, 4))
-    for phase_name in df['phase'].unique():
-        sub = summary[summary['phase'] == phase_name]
-        algs = sub['algorithm']
-        means = sub[('nodes_expanded', 'mean')]
-        errs = sub[('nodes_expanded', 'std')]
-        ax.errorbar([f"{phase_name}\n{a}" for a in algs], means, yerr=errs, fmt='o', label=phase_name)
-    ax.set_ylabel('nodes expanded')
-    ax.set_title('Mean nodes expanded per algorithm (with std)')
-    plt.xticks(rotation=45, ha='right')
-    plt.tight_layout()
-    fig.savefig(PLOT_NODES)
-    print(f"Wrote nodes plot to {PLOT_NODES}")
-else:
-    print("matplotlib / pandas not available: CSV written but plots were skipped. Install requirements from requirements.txt to enable plotting.")
-
-print('Done.')
+            }
+            line = (f"Phase={phase_name} Alg={alg_name}: mean {mean / 1e6:.4f} ms "
+                    f"(±{100 * half / mean:.1f}%, {len(samples)} runs)")
+            if memory:
+                mem = measure_memory(call)
+                cases[f"{phase_name}/{alg_name}"].update(mem)
+                line += (f", peak {mem['peak_bytes'] / 1024:.1f} KiB, "
+                         f"retained {mem['retained_bytes'] / 1024:.1f} KiB in {mem['retained_blocks']} blocks")
+            print(line)
+    return cases
+
+
+def write_csv(cases):
+    with open(CSV_PATH, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["phase", "algorithm", "run", "time", "nodes_expanded", "heap_ops", "path_len",
+                         "peak_bytes", "retained_bytes", "retained_blocks"])
+        for case in cases.values():
+            memory = [case.get(k, "") for k in ("peak_bytes", "retained_bytes", "retained_blocks")]
+            for i, ns in enumerate(case["samples_ns"]):
+                writer.writerow([case["phase"], case["algorithm"], i, ns / 1e9,
+                                 case["nodes_expanded"], case["heap_ops"], case["path_len"], *memory])
+    print(f"Wrote results to {CSV_PATH}")
+
+
+def save_baseline(cases, name, keep_gc, precision):
+    BASELINE_DIR.mkdir(parents=True, exist_ok=True)
+    path = BASELINE_DIR / f"{name}.json"
+    baseline = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "gc_enabled": keep_gc,
+        "warmup": WARMUP,
+        "precision": precision,
+        "cases": cases,
+    }
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=1)
+    print(f"Wrote baseline to {path}")
+    return path
+
+
+def plot(cases, all_phases):
+    labels = list(cases)
+    for metric, ylabel, title, out in (
+        ("time", "time (ms)", "Mean time per algorithm (95% CI)", PLOT_TIME),
+        ("nodes", "nodes expanded", "Nodes expanded per algorithm", PLOT_NODES),
+    ):
+        fig, ax = plt.subplots(figsize=(8, 4))
+        for phase_name, *_ in all_phases:
+            keys = [k for k in labels if cases[k]["phase"] == phase_name]
+            xs = [f"{phase_name}\n{cases[k]['algorithm']}" for k in keys]
+            if metric == "time":
+                ys = [cases[k]["mean_ns"] / 1e6 for k in keys]
+                errs = [(cases[k]["ci95_ns"][1] - cases[k]["mean_ns"]) / 1e6 for k in keys]
+            else:
+                ys = [cases[k]["nodes_expanded"] for k in keys]
+                errs = None
+            ax.errorbar(xs, ys, yerr=errs, fmt='o', label=phase_name)
+        ax.set_ylabel(ylabel)
+        ax.set_title(title)
+        ax.legend()
+        plt.xticks(rotation=45, ha='right')
+        plt.tight_layout()
+        fig.savefig(out)
+        print(f"Wrote {metric} plot to {out}")
+
+
+def mann_whitney_u(a, b):
+    """
+    Two-sided Mann-Whitney U test of samples a and b.
+
+    Returns (U of a, p-value) from the normal approximation with tie and
+    continuity corrections (accurate for the 20+ samples every case has).
+    """
+    n1, n2 = len(a), len(b)
+    pooled = sorted([(v, 0) for v in a] + [(v, 1) for v in b])
+    n = n1 + n2
+    rank_sum_a = 0.0
+    tie_term = 0
+    i = 0
+    while i < n:
+        j = i
+        while j + 1 < n and pooled[j + 1][0] == pooled[i][0]:
+            j += 1
+        rank = (i + j) / 2 + 1               # average rank of the tied run
+        rank_sum_a += rank * sum(1 for k in range(i, j + 1) if pooled[k][1] == 0)
+        t = j - i + 1
+        tie_term += t ** 3 - t
+        i = j + 1
+    u = rank_sum_a - n1 * (n1 + 1) / 2
+    mu = n1 * n2 / 2
+    sigma = math.sqrt(n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1))))
+    if sigma == 0:
+        return u, 1.0
+    z = (abs(u - mu) - 0.5) / sigma
+    return u, math.erfc(max(z, 0.0) / math.sqrt(2))
+
+
+def compare(old_path, new_path, alpha=ALPHA, min_change=MIN_CHANGE):
+    """Print a per-case comparison of two baselines; returns the keys of the cases that got slower."""
+    with open(old_path) as f:
+        old = json.load(f)["cases"]
+    with open(new_path) as f:
+        new = json.load(f)["cases"]
+    slower = []
+    print(f"{'case':<22} | {'old ms':>9} | {'new ms':>9} | {'change':>7} | {'p':>8} | verdict")
+    print("-" * 75)
+    for key in old:
+        if key not in new:
+            continue
+        a, b = old[key]["samples_ns"], new[key]["samples_ns"]
+        _, p = mann_whitney_u(a, b)
+        ratio = statistics.median(b) / statistics.median(a)
+        verdict = "same"
+        if p < alpha and abs(ratio - 1) > min_change:
+            verdict = "SLOWER" if ratio > 1 else "faster"
+            if ratio > 1:
+                slower.append(key)
+        print(f"{key:<22} | {statistics.median(a) / 1e6:>9.4f} | {statistics.median(b) / 1e6:>9.4f} | "
+              f"{100 * (ratio - 1):>+6.1f}% | {p:>8.2g} | {verdict}")
+    missing = sorted(set(old) ^ set(new))
+    if missing:
+        print(f"(only in one baseline: {', '.join(missing)})")
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the registered pathfinders.")
+    parser.add_argument("--save", metavar="NAME", default=None,
+                        help="baseline name (default: timestamp); written to benchmarks/baselines/NAME.json")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two baseline JSON files")
+    parser.add_argument("--precision", type=float, default=PRECISION,
+                        help="target 95%% CI half-width relative to the mean")
+    parser.add_argument("--gc", action="store_true", help="keep the garbage collector on while timing")
+    parser.add_argument("--memory", action="store_true", help="also record tracemalloc peak / retained memory")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[], help="add generated mazes of these sizes")
+    parser.add_argument("--alpha", type=float, default=ALPHA, help="significance level for --compare")
+    parser.add_argument("--min-change", type=float, default=MIN_CHANGE,
+                        help="smallest relative median change --compare reports")
+    args = parser.parse_args()
+
+    if args.compare:
+        slower = compare(*args.compare, alpha=args.alpha, min_change=args.min_change)
+        if slower:
+            print(f"\n{len(slower)} case(s) significantly slower: {', '.join(slower)}")
+            sys.exit(1)
+        print("\nNo significant slowdowns.")
+        return
+
+    all_phases = phases + generated_phases(args.sizes)
+    print(f"Timing {len(PATHFINDERS)} pathfinders and {len(ENGINES)} engines on {len(all_phases)} phases "
+          f"(warmup {WARMUP}, GC {'on' if args.gc else 'off'}, target ±{100 * args.precision:.0f}%)...")
+    with profiling.phase("search"):
+        cases = run_cases(all_phases, args.precision, args.gc, args.memory)
+    with profiling.phase("export"):
+        write_csv(cases)
+        save_baseline(cases, args.save or time.strftime("baseline-%Y%m%d-%H%M%S"), args.gc, args.precision)
+        if HAS_PLOTTING:
+            plot(cases, all_phases)
+        else:
+            print("matplotlib not available: CSV written but plots were skipped. Install requirements from requirements.txt to enable plotting.")
+
+    print('Done.')
+
+
+if __name__ == "__main__":
+    profiling.install()
+    main()
@@ -6,6 +6,8 @@ import time
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import profiling
+profiling.install()  # --profile / $PROFILE, see profiling.py
 from config import (
     TILE_SIZE, GRID_WIDTH, GRID_HEIGHT, FPS,
     GRID, PLAYER_START_POS, GOAL_POS,
@@ -8,6 +8,8 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 """
 import numpy as np
 import time
+import profiling
+profiling.install()  # --profile / $PROFILE, see profiling.py
 from config import (
     GRID, GRID_WIDTH, GRID_HEIGHT,
     PLAYER_START_POS, GOAL_POS
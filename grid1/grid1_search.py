@@ -7,6 +7,8 @@ import os
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import profiling
+profiling.install()  # --profile / $PROFILE, see profiling.py
 from config import (
     TILE_SIZE, GRID_WIDTH, GRID_HEIGHT, FPS,
     BG_COLOR, WALL_COLOR, PLAYER_COLOR, GOAL_COLOR, GRID_LINE_COLOR,
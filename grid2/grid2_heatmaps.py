@@ -8,6 +8,8 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 """
 import numpy as np
 import time
+import profiling
+profiling.install()  # --profile / $PROFILE, see profiling.py
 from config import (
     GRID_LARGE, GRID_WIDTH_LARGE, GRID_HEIGHT_LARGE,
     PLAYER_START_POS_LARGE, GOAL_POS_LARGE
@@ -6,6 +6,8 @@ import time
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import profiling
+profiling.install()  # --profile / $PROFILE, see profiling.py
 from config import (
     TILE_SIZE_XLARGE, GRID_WIDTH_XLARGE, GRID_HEIGHT_XLARGE,
     BG_COLOR, GRID_LINE_COLOR, WALL_COLOR, PLAYER_COLOR, GOAL_COLOR,
@@ -8,6 +8,8 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 """
 import numpy as np
 import time
+import profiling
+profiling.install()  # --profile / $PROFILE, see profiling.py
 from config import (
     GRID_XLARGE, GRID_WIDTH_XLARGE, GRID_HEIGHT_XLARGE,
     PLAYER_START_POS_XLARGE, GOAL_POS_XLARGE
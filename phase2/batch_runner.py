@@ -0,0 +1,275 @@
+"""
+Headless batch runner: thousands of scenario games on a process pool.
+
+Each job is one (scenario, seed) pair from compare_algorithms.SCENARIOS. The
+seed picks random prey, monster and reward cells on GRID_LARGE (see
+random_placement), so every seed is a different, reproducible game. Jobs are
+grouped into chunks, one pool task per chunk, to amortize the per-task
+pickling and scheduling overhead. Chunks are streamed back with as_completed
+as they finish and aggregated per scenario as they arrive (constant memory):
+
+    win rates      prey / monster / timeout share of games
+    timing         p50 / p90 / p99 / max wall time per game
+    steps          mean game length
+
+Usage:
+    python3 phase2/batch_runner.py                       # 250 games per scenario
+    python3 phase2/batch_runner.py --games 2000 --workers 8
+    python3 phase2/batch_runner.py --scaling             # games/sec vs worker count
+    python3 phase2/batch_runner.py --out runs.jsonl      # stream every game; rerun to resume
+"""
+
+import sys
+import os
+import time
+import math
+import random
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import profiling
+from config import GRID_LARGE
+from utils import get_bfs_distance_field
+from phase2.compare_algorithms import SCENARIOS, GameSimulator
+from phase2.latency import LatencyHistogram
+from phase2.metrics_sink import MetricsSink, output_path
+
+DEFAULT_GAMES = 250
+DEFAULT_MAX_STEPS = 500
+MIN_SEPARATION = 10       # minimum maze distance between prey, monster and reward
+TASKS_PER_WORKER = 4      # chunks per worker: small enough to balance, large enough to amortize
+
+
+class _Placements:
+    """Open cells of one grid and, per cell, the cells at least `min_separation` steps away (built on demand)."""
+
+    def __init__(self, grid, min_separation):
+        self.grid = grid
+        self.min_separation = min_separation
+        self.width = len(grid[0])
+        self.cells = [(x, y) for y, row in enumerate(grid) for x, cell in enumerate(row) if cell != 1]
+        self._far = {}
+
+    def far(self, cell):
+        """Open cells at least min_separation steps from `cell`, in grid order, and the same as a set."""
+        entry = self._far.get(cell)
+        if entry is None:
+            dist, _ = get_bfs_distance_field(list(cell), self.grid)
+            far = [c for c in self.cells if dist[c[1] * self.width + c[0]] >= self.min_separation]
+            entry = self._far[cell] = (far, set(far))
+        return entry
+
+    def has_triple(self):
+        """Whether any three cells are pairwise min_separation apart."""
+        for reward in self.cells:
+            far, _ = self.far(reward)
+            for prey in far:
+                _, far_from_prey = self.far(prey)
+                if any(c in far_from_prey for c in far):
+                    return True
+        return False
+
+
+_PLACEMENTS = {}
+
+
+def random_placement(grid, seed, min_separation=MIN_SEPARATION):
+    """
+    (prey, monster, reward) cells as [x, y] for one seed.
+
+    All three are open cells in one connected region, pairwise at least
+    `min_separation` steps apart by maze distance. Raises ValueError if the
+    grid has no such three cells. Distance fields are cached by grid
+    identity, so a grid must not be edited after its first placement.
+    """
+    key = (id(grid), min_separation)
+    placements = _PLACEMENTS.get(key)
+    if placements is None or placements.grid is not grid:
+        placements = _Placements(grid, min_separation)
+        if not placements.has_triple():
+            raise ValueError(f"no three open cells are pairwise {min_separation} steps apart")
+        _PLACEMENTS[key] = placements
+    rng = random.Random(seed)
+    while True:
+        reward = rng.choice(placements.cells)
+        far, _ = placements.far(reward)
+        if not far:
+            continue
+        prey = rng.choice(far)
+        _, far_from_prey = placements.far(prey)
+        far = [c for c in far if c in far_from_prey]
+        if far:
+            return list(prey), list(rng.choice(far)), list(reward)
+
+
+def _run_chunk(jobs, max_steps):
+    """Worker: play a list of (scenario index, seed) jobs, return (index, seed, GameMetrics) per game."""
+    rows = []
+    for index, seed in jobs:
+        name, _, kwargs = SCENARIOS[index]
+        prey, monster, reward = random_placement(GRID_LARGE, seed)
+        m = GameSimulator(name, max_steps=max_steps, prey_start=prey,
+                          monster_start=monster, reward_pos=reward, **kwargs).run()
+        rows.append((index, seed, m))
+    return rows
+
+
+def make_jobs(scenarios, games, first_seed=0):
+    """Every (scenario index, seed) pair, interleaved so each chunk mixes scenarios."""
+    return [(index, seed) for seed in range(first_seed, first_seed + games) for index in scenarios]
+
+
+def run_chunks(play_chunk, jobs, *args, workers=None, chunksize=None):
+    """
+    Split `jobs` into chunks and run play_chunk(chunk, *args) for each on a process pool.
+
+    Yields the items of every returned list, chunk by chunk in completion
+    order. workers defaults to all cores; with workers=1 the chunks run in
+    this process, which keeps profiles and tracebacks simple. play_chunk must
+    be a module-level function so it can be pickled.
+    """
+    workers = workers or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, math.ceil(len(jobs) / (workers * TASKS_PER_WORKER)))
+    chunks = [jobs[i:i + chunksize] for i in range(0, len(jobs), chunksize)]
+
+    if workers == 1:
+        for chunk in chunks:
+            yield from play_chunk(chunk, *args)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(play_chunk, chunk, *args) for chunk in chunks]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+def run_batch(jobs, workers=None, chunksize=None, max_steps=DEFAULT_MAX_STEPS):
+    """Play scenario `jobs`; yields (scenario index, seed, GameMetrics) as chunks complete."""
+    return run_chunks(_run_chunk, jobs, max_steps, workers=workers, chunksize=chunksize)
+
+
+class BatchSummary:
+    """Running per-scenario aggregates; memory stays constant however many games are added."""
+
+    def __init__(self):
+        self._stats = {}
+
+    def add(self, index, m):
+        st = self._stats.get(index)
+        if st is None:
+            st = self._stats[index] = {"games": 0, "prey": 0, "monster": 0, "timeout": 0,
+                                       "steps": 0, "nodes": 0, "time": LatencyHistogram()}
+        st["games"] += 1
+        st[m.winner or "timeout"] += 1
+        st["steps"] += m.steps_to_end
+        st["nodes"] += m.prey_nodes_expanded + m.monster_nodes_expanded
+        st["time"].record(int(m.computation_time * 1e9))
+
+    def result(self):
+        """{scenario name: stats dict} (times in seconds)."""
+        summary = {}
+        for index in sorted(self._stats):
+            st = self._stats[index]
+            n = st["games"]
+            times = st["time"]
+            summary[SCENARIOS[index][0]] = {
+                "games": n,
+                "prey_win_rate": st["prey"] / n,
+                "monster_win_rate": st["monster"] / n,
+                "timeout_rate": st["timeout"] / n,
+                "mean_steps": st["steps"] / n,
+                "mean_nodes": st["nodes"] / n,
+                "time_p50": times.percentile(50) / 1e9,
+                "time_p90": times.percentile(90) / 1e9,
+                "time_p99": times.percentile(99) / 1e9,
+                "time_max": times.max / 1e9,
+            }
+        return summary
+
+
+def print_summary(summary):
+    print(f"\n{'scenario':<22} | {'games':>6} | {'prey':>6} | {'monster':>7} | {'timeout':>7} | "
+          f"{'steps':>6} | {'p50 ms':>7} | {'p90 ms':>7} | {'p99 ms':>7} | {'max ms':>7}")
+    print("-" * 108)
+    for name, s in summary.items():
+        print(f"{name:<22} | {s['games']:>6} | {s['prey_win_rate']:>6.1%} | {s['monster_win_rate']:>7.1%} | "
+              f"{s['timeout_rate']:>7.1%} | {s['mean_steps']:>6.1f} | {1000 * s['time_p50']:>7.2f} | "
+              f"{1000 * s['time_p90']:>7.2f} | {1000 * s['time_p99']:>7.2f} | {1000 * s['time_max']:>7.2f}")
+
+
+def measure_scaling(scenarios, games, max_steps):
+    """Games/sec for 1, 2, 4, ... workers up to the core count."""
+    cores = os.cpu_count() or 1
+    counts = sorted({1, cores} | {2 ** k for k in range(1, cores.bit_length()) if 2 ** k < cores})
+    jobs = make_jobs(scenarios, games)
+    print(f"{len(jobs)} games per run, {cores} cores\n")
+    print(f"{'workers':>7} | {'games/sec':>9} | {'speedup':>7} | {'efficiency':>10}")
+    print("-" * 44)
+    base = None
+    for workers in counts:
+        t0 = time.perf_counter()
+        for _ in run_batch(jobs, workers, max_steps=max_steps):
+            pass
+        rate = len(jobs) / (time.perf_counter() - t0)
+        base = base or rate
+        print(f"{workers:>7} | {rate:>9.1f} | {rate / base:>6.2f}x | {rate / base / workers:>10.0%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run many randomized phase2 games on a process pool.")
+    parser.add_argument("--games", type=int, default=DEFAULT_GAMES, help="games (seeds) per scenario")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--chunksize", type=int, default=None, help="games per pool task")
+    parser.add_argument("--max-steps", type=int, default=DEFAULT_MAX_STEPS)
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--scenarios", type=int, nargs="+", default=list(range(len(SCENARIOS))),
+                        help="indices into compare_algorithms.SCENARIOS")
+    parser.add_argument("--scaling", action="store_true", help="measure games/sec vs worker count")
+    parser.add_argument("--out", default=None,
+                        help="append one record per game to this .jsonl/.csv file; reruns skip games already in it")
+    parser.add_argument("--output-dir", default=None, help="directory for a relative --out (default: phase2/)")
+    parser.add_argument("--flush-every", type=int, default=100, help="records per write to --out")
+    args = parser.parse_args()
+
+    if args.scaling:
+        measure_scaling(args.scenarios, args.games, args.max_steps)
+        return
+
+    jobs = make_jobs(args.scenarios, args.games, args.first_seed)
+    sink = None
+    if args.out:
+        sink = MetricsSink(output_path(args.out, args.output_dir), args.flush_every)
+        skipped = len(jobs)
+        jobs = [(index, seed) for index, seed in jobs if not sink.done(SCENARIOS[index][0], seed)]
+        skipped -= len(jobs)
+        print(f"Streaming results to {sink.path}" + (f" (resuming: {skipped} games already there)" if skipped else ""))
+    print(f"Running {len(jobs)} games ({args.games} seeds x {len(args.scenarios)} scenarios) "
+          f"on {args.workers or os.cpu_count()} workers...")
+    summary = BatchSummary()
+    done = 0
+    t0 = time.perf_counter()
+    report_every = max(1, len(jobs) // 10)
+    try:
+        for index, seed, m in run_batch(jobs, args.workers, args.chunksize, args.max_steps):
+            summary.add(index, m)
+            if sink is not None:
+                sink.write(m, seed)
+            done += 1
+            if done % report_every == 0:
+                elapsed = time.perf_counter() - t0
+                print(f"  {done:>6}/{len(jobs)} games  {done / elapsed:7.1f} games/sec")
+    finally:
+        if sink is not None:
+            sink.close()
+    elapsed = time.perf_counter() - t0
+
+    if done:
+        print_summary(summary.result())
+        print(f"\n{done} games in {elapsed:.1f}s ({done / elapsed:.1f} games/sec)")
+
+if __name__ == "__main__":
+    profiling.install()
+    main()
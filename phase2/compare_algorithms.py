@@ -12,6 +12,7 @@ from typing import Dict, List, Tuple, Optional
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import profiling
 from config import (
     GRID_LARGE,
     GRID_WIDTH_LARGE,
@@ -19,7 +20,10 @@ from config import (
     PLAYER_START_POS_LARGE,
     GOAL_POS_LARGE,
 )
-from utils import get_minimax_path, get_astar_path
+from phase2.game_engine import PREY, MONSTER, ChaseGame, MinimaxPolicy, make_policy
+from phase2.latency import LatencyHistogram
+from phase2.replay import ReplayRecorder
+from phase2.metrics_sink import output_dir, output_path
 
 
 @dataclass
@@ -35,10 +39,44 @@ class GameMetrics:
     prey_nodes_expanded: int  # actual nodes expanded by prey's algorithm
     monster_nodes_expanded: int  # actual nodes expanded by monster's algorithm
     total_path_calls: int  # total number of times pathfinding was called
+    replans_avoided: int = 0  # path calls answered by advancing a still-valid plan
+    prey_decisions: int = 0  # planning calls made for the prey (one per move)
+    monster_decisions: int = 0
+    # Per-decision latency (perf_counter_ns histograms, reported in ms)
+    prey_mean_ms: float = 0.0
+    prey_p50_ms: float = 0.0
+    prey_p90_ms: float = 0.0
+    prey_p99_ms: float = 0.0
+    prey_max_ms: float = 0.0
+    monster_mean_ms: float = 0.0
+    monster_p50_ms: float = 0.0
+    monster_p90_ms: float = 0.0
+    monster_p99_ms: float = 0.0
+    monster_max_ms: float = 0.0
 
 
 class GameSimulator:
-    """Simulates a game scenario without pygame visualization."""
+    """
+    Simulates a game scenario without pygame visualization.
+
+    prey_algorithm / monster_algorithm are game_engine.make_policy names:
+    "astar", "minimax" (depth-bounded A*), "adversarial", "evasive", "ambush",
+    "tablebase", "expectimax", "mcts" (per-move budget in prey_time_budget / monster_time_budget, ms).
+
+    With `monster_starts` (a list of [x, y]) the game has that many monsters,
+    all chasing the prey along shortest paths (multi_monster.MultiMonsterGame);
+    monster_algorithm must then be "astar".
+
+    prey_start / monster_start / reward_pos default to the scenario layout
+    (PLAYER_START_POS_LARGE, the opposite corner, GOAL_POS_LARGE).
+
+    With replay_path, the game is recorded tick by tick to that file
+    (phase2/replay.py; single-monster games only).
+
+    With opening_book=True, "adversarial" and "evasive" agents first consult
+    an opening book for the standard starts (phase2/opening_book.py), built
+    and cached under phase2/tablebases/ on first use.
+    """
 
     def __init__(
         self,
@@ -49,6 +87,14 @@ class GameSimulator:
         monster_depth=None,
         prey_lookahead=None,
         max_steps=1000,
+        prey_time_budget=None,
+        monster_time_budget=None,
+        monster_starts=None,
+        opening_book=False,
+        prey_start=None,
+        monster_start=None,
+        reward_pos=None,
+        replay_path=None,
     ):
         self.scenario_name = scenario_name
         self.prey_algorithm = prey_algorithm
@@ -57,101 +103,81 @@ class GameSimulator:
         self.monster_depth = monster_depth
         self.prey_lookahead = prey_lookahead
         self.max_steps = max_steps
+        self.prey_time_budget = prey_time_budget
+        self.monster_time_budget = monster_time_budget
+        self.monster_starts = monster_starts
+        self.opening_book = opening_book
+        self.replay_path = replay_path
 
         # Game state
-        self.prey_pos = list(PLAYER_START_POS_LARGE)
-        self.monster_pos = [GRID_WIDTH_LARGE - 2, GRID_HEIGHT_LARGE - 2]
-        self.reward_pos = list(GOAL_POS_LARGE)
+        self.prey_pos = list(prey_start or PLAYER_START_POS_LARGE)
+        self.monster_pos = list(monster_start or [GRID_WIDTH_LARGE - 2, GRID_HEIGHT_LARGE - 2])
+        self.monster_positions = [list(p) for p in monster_starts or [self.monster_pos]]
+        self.reward_pos = list(reward_pos or GOAL_POS_LARGE)
 
         self.step_count = 0
         self.result = None
         self.metrics = None
-        
-        # Track nodes expanded per agent
-        self.prey_nodes_expanded = []
-        self.monster_nodes_expanded = []
-
-    def _get_prey_path(self) -> List[Tuple[int, int]]:
-        """Get prey's next path based on algorithm."""
-        if self.prey_algorithm == "minimax":
-            path, info = get_minimax_path(
-                tuple(self.prey_pos),
-                tuple(self.reward_pos),
-                GRID_LARGE,
-                depth=self.prey_depth,
-                return_info=True,  # Get detailed metrics
+        self.game = None
+
+    def _policy(self, algorithm, depth, time_budget):
+        """make_policy, plus the opening book for minimax agents when enabled."""
+        policy = make_policy(algorithm, depth, self.prey_lookahead, time_budget)
+        if self.opening_book and isinstance(policy, MinimaxPolicy) and self.monster_starts is None:
+            from phase2.opening_book import load_or_build  # needs NumPy
+            policy.book = load_or_build(GRID_LARGE, self.reward_pos, self.prey_pos, self.monster_pos,
+                                        depth, evaluate=policy.evaluate, opponent=policy.opponent)
+        return policy
+
+    def _new_game(self) -> ChaseGame:
+        """Build the engine game for this configuration (plans the first move)."""
+        if self.monster_starts is not None:
+            if self.monster_algorithm != "astar":
+                raise ValueError("Multi-monster games only support the 'astar' chase")
+            from phase2.multi_monster import MultiMonsterGame  # needs NumPy
+            return MultiMonsterGame(
+                GRID_LARGE, self.prey_pos, self.monster_starts, self.reward_pos,
+                prey_policy=self._policy(self.prey_algorithm, self.prey_depth, self.prey_time_budget),
+                max_steps=self.max_steps,
             )
-            self.prey_nodes_expanded.append(info.get("nodes_expanded", 0))
-            return path
-        elif self.prey_algorithm == "astar":
-            path = get_astar_path(
-                tuple(self.prey_pos),
-                tuple(self.reward_pos),
-                GRID_LARGE,
-            )
-            self.prey_nodes_expanded.append(len(path))  # A* path length as proxy
-            return path
-        return []
-
-    def _get_monster_path(self) -> List[Tuple[int, int]]:
-        """Get monster's next path based on algorithm."""
-        if self.monster_algorithm == "minimax":
-            path, info = get_minimax_path(
-                tuple(self.monster_pos),
-                tuple(self.prey_pos),
-                GRID_LARGE,
-                depth=self.monster_depth,
-                return_info=True,  # Get detailed metrics
-            )
-            self.monster_nodes_expanded.append(info.get("nodes_expanded", 0))
-            return path
-        elif self.monster_algorithm == "astar":
-            path = get_astar_path(
-                tuple(self.monster_pos),
-                tuple(self.prey_pos),
-                GRID_LARGE,
-            )
-            self.monster_nodes_expanded.append(len(path))  # A* path length as proxy
-            return path
-        return []
+        return ChaseGame(
+            GRID_LARGE, self.prey_pos, self.monster_pos, self.reward_pos,
+            prey_policy=self._policy(self.prey_algorithm, self.prey_depth, self.prey_time_budget),
+            monster_policy=self._policy(self.monster_algorithm, self.monster_depth, self.monster_time_budget),
+            max_steps=self.max_steps,
+            recorder=ReplayRecorder(self.replay_path) if self.replay_path else None,
+        )
 
     def run(self) -> GameMetrics:
         """Run the simulation and collect metrics."""
-        start_time = time.time()
-        prey_paths_computed = []
-        monster_paths_computed = []
-        
+        start_time = time.perf_counter()
+        game = None
+
         try:
-            while self.step_count < self.max_steps:
-                # Get paths (now tracking nodes expanded)
-                prey_path = self._get_prey_path()
-                monster_path = self._get_monster_path()
-
-                if prey_path:
-                    prey_paths_computed.append(len(prey_path))
-                if monster_path:
-                    monster_paths_computed.append(len(monster_path))
-
-                # Move agents
-                if len(prey_path) > 1:
-                    self.prey_pos = list(prey_path[1])
-                if len(monster_path) > 1:
-                    self.monster_pos = list(monster_path[1])
-
-                self.step_count += 1
-
-                # Check conditions
-                if self.prey_pos == self.reward_pos:
-                    self.result = "prey"
-                    break
-                if self.monster_pos == self.prey_pos:
-                    self.result = "monster"
-                    break
+            game = self.game = self._new_game()
+            while not game.result and not game.timed_out:
+                game.tick()
+            self.result = game.result
         except Exception as e:
             print(f"  ⚠️  Error in {self.scenario_name}: {e}")
             self.result = None
 
-        computation_time = time.time() - start_time
+        computation_time = time.perf_counter() - start_time
+
+        if game is not None:
+            if game.recorder is not None:
+                game.recorder.close()
+            self.prey_pos, self.monster_pos = game.prey_pos, game.monster_pos
+            self.monster_positions = getattr(game, "monster_positions", [game.monster_pos])
+            self.step_count = game.step_count
+            nodes = game.nodes_expanded
+            lengths = game.path_lengths
+            replans_avoided = sum(game.replans_avoided.values())
+            latency = {agent: game.latency[agent].summary_ms() for agent in (PREY, MONSTER)}
+        else:
+            nodes = lengths = {PREY: [], MONSTER: []}
+            replans_avoided = 0
+            latency = {agent: LatencyHistogram().summary_ms() for agent in (PREY, MONSTER)}
 
         # Create metrics
         self.metrics = GameMetrics(
@@ -159,99 +185,86 @@ class GameSimulator:
             winner=self.result,
             steps_to_end=self.step_count,
             computation_time=computation_time,
-            prey_path_length=sum(prey_paths_computed) if prey_paths_computed else 0,
-            monster_path_length=sum(monster_paths_computed) if monster_paths_computed else 0,
-            total_nodes_evaluated=sum(prey_paths_computed) + sum(monster_paths_computed),
-            prey_nodes_expanded=sum(self.prey_nodes_expanded) if self.prey_nodes_expanded else 0,
-            monster_nodes_expanded=sum(self.monster_nodes_expanded) if self.monster_nodes_expanded else 0,
-            total_path_calls=len(self.prey_nodes_expanded) + len(self.monster_nodes_expanded),
+            prey_path_length=sum(lengths[PREY]),
+            monster_path_length=sum(lengths[MONSTER]),
+            total_nodes_evaluated=sum(lengths[PREY]) + sum(lengths[MONSTER]),
+            prey_nodes_expanded=sum(nodes[PREY]),
+            monster_nodes_expanded=sum(nodes[MONSTER]),
+            total_path_calls=len(nodes[PREY]) + len(nodes[MONSTER]),
+            replans_avoided=replans_avoided,
+            prey_decisions=len(nodes[PREY]),
+            monster_decisions=len(nodes[MONSTER]),
+            prey_mean_ms=latency[PREY]["mean"],
+            prey_p50_ms=latency[PREY]["p50"],
+            prey_p90_ms=latency[PREY]["p90"],
+            prey_p99_ms=latency[PREY]["p99"],
+            prey_max_ms=latency[PREY]["max"],
+            monster_mean_ms=latency[MONSTER]["mean"],
+            monster_p50_ms=latency[MONSTER]["p50"],
+            monster_p90_ms=latency[MONSTER]["p90"],
+            monster_p99_ms=latency[MONSTER]["p99"],
+            monster_max_ms=latency[MONSTER]["max"],
         )
 
         return self.metrics
 
 
+# The 4 phase2 scenarios: (scenario name, script it mirrors, GameSimulator arguments)
+SCENARIOS = [
+    # minimax_game.py - Both players use MINIMAX with depth 60
+    ("Both MINIMAX (d=60)", "minimax_game (Both MINIMAX, depth 60)",
+     dict(prey_algorithm="minimax", monster_algorithm="minimax", prey_depth=60, monster_depth=60)),
+    # minimax_ambush_monster.py - Monster uses MINIMAX with lookahead on prey
+    ("Ambush Monster", "minimax_ambush_monster (Monster strategic, Prey A*)",
+     dict(prey_algorithm="astar", monster_algorithm="minimax", monster_depth=8)),
+    # minimax_both_players.py - Both use MINIMAX with shallow depth
+    ("Both MINIMAX (d=3)", "minimax_both_players (Both MINIMAX, d=3)",
+     dict(prey_algorithm="minimax", monster_algorithm="minimax", prey_depth=3, monster_depth=3)),
+    # minimax_evasive_prey.py - Prey uses MINIMAX, monster uses A*
+    ("Evasive Prey", "minimax_evasive_prey (Prey MINIMAX, Monster A*)",
+     dict(prey_algorithm="minimax", monster_algorithm="astar", prey_depth=2)),
+]
+
+
 def run_all_scenarios() -> List[GameMetrics]:
     """Run all 4 phase2 scenarios and collect metrics."""
     scenarios = []
-
-    # Scenario 1: minimax_game.py - Both players use MINIMAX with depth 60
-    print("Running: minimax_game (Both MINIMAX, depth 60)...")
-    sim1 = GameSimulator(
-        scenario_name="Both MINIMAX (d=60)",
-        prey_algorithm="minimax",
-        monster_algorithm="minimax",
-        prey_depth=60,
-        monster_depth=60,
-        max_steps=500,
-    )
-    scenarios.append(sim1.run())
-
-    # Scenario 2: minimax_ambush_monster.py - Monster uses MINIMAX with lookahead on prey
-    print("Running: minimax_ambush_monster (Monster strategic, Prey A*)...")
-    sim2 = GameSimulator(
-        scenario_name="Ambush Monster",
-        prey_algorithm="astar",
-        monster_algorithm="minimax",
-        monster_depth=8,
-        max_steps=500,
-    )
-    scenarios.append(sim2.run())
-
-    # Scenario 3: minimax_both_players.py - Both use MINIMAX with shallow depth
-    print("Running: minimax_both_players (Both MINIMAX, d=3)...")
-    sim3 = GameSimulator(
-        scenario_name="Both MINIMAX (d=3)",
-        prey_algorithm="minimax",
-        monster_algorithm="minimax",
-        prey_depth=3,
-        monster_depth=3,
-        max_steps=500,
-    )
-    scenarios.append(sim3.run())
-
-    # Scenario 4: minimax_evasive_prey.py - Prey uses MINIMAX, monster uses A*
-    print("Running: minimax_evasive_prey (Prey MINIMAX, Monster A*)...")
-    sim4 = GameSimulator(
-        scenario_name="Evasive Prey",
-        prey_algorithm="minimax",
-        monster_algorithm="astar",
-        prey_depth=2,
-        max_steps=500,
-    )
-    scenarios.append(sim4.run())
-
+    for name, script, kwargs in SCENARIOS:
+        print(f"Running: {script}...")
+        scenarios.append(GameSimulator(scenario_name=name, max_steps=500, **kwargs).run())
     return scenarios
 
 
 def print_comparison_table(metrics_list: List[GameMetrics]):
     """Print a formatted comparison table."""
-    print("\n" + "=" * 140)
+    print("\n" + "=" * 158)
     print("ALGORITHM COMPARISON METRICS")
-    print("=" * 140)
+    print("=" * 158)
     print(
-        f"{'Scenario':<25} | {'Result':<10} | {'Steps':<6} | {'Time':<8} | {'Prey Path':<10} | {'Monster Path':<12} | {'Prey Nodes':<12} | {'Monster Nodes':<14} | {'Total Calls':<11}"
+        f"{'Scenario':<25} | {'Result':<10} | {'Steps':<6} | {'Time':<8} | {'Prey Path':<10} | {'Monster Path':<12} | {'Prey Nodes':<12} | {'Monster Nodes':<14} | {'Total Calls':<11} | {'Reused':<6}"
     )
-    print("-" * 140)
+    print("-" * 158)
 
     for m in metrics_list:
         result_str = m.winner.upper() if m.winner else "TIMEOUT"
         print(
-            f"{m.scenario_name:<25} | {result_str:<10} | {m.steps_to_end:<6} | {m.computation_time:<8.4f} | {m.prey_path_length:<10} | {m.monster_path_length:<12} | {m.prey_nodes_expanded:<12} | {m.monster_nodes_expanded:<14} | {m.total_path_calls:<11}"
+            f"{m.scenario_name:<25} | {result_str:<10} | {m.steps_to_end:<6} | {m.computation_time:<8.4f} | {m.prey_path_length:<10} | {m.monster_path_length:<12} | {m.prey_nodes_expanded:<12} | {m.monster_nodes_expanded:<14} | {m.total_path_calls:<11} | {m.replans_avoided:<6}"
         )
 
-    print("=" * 140)
+    print("=" * 158)
     print("\n📊 METRIC DEFINITIONS:")
     print("  • Steps: Number of game turns until outcome")
     print("  • Time: Total simulation time (seconds)")
     print("  • Prey/Monster Path: Sum of path lengths computed during game")
     print("  • Prey/Monster Nodes: Actual nodes expanded by each algorithm during all pathfinding calls")
     print("  • Total Calls: Total number of pathfinding function calls (Prey + Monster)")
+    print("  • Reused: Calls that advanced the previous, still-valid path instead of replanning")
     print()
 
 
 
-def generate_visualizations(metrics_list: List[GameMetrics]):
-    """Generate simple matplotlib visualizations."""
+def generate_visualizations(metrics_list: List[GameMetrics], out_dir=None):
+    """Generate simple matplotlib visualizations (PNGs in the output directory)."""
     try:
         import matplotlib.pyplot as plt
         import numpy as np
@@ -326,7 +339,7 @@ def generate_visualizations(metrics_list: List[GameMetrics]):
     )
 
     plt.tight_layout()
-    plt.savefig("/home/lum/AI_Zombie_Project/phase2/comparison_metrics.png", dpi=100)
+    plt.savefig(output_path("comparison_metrics.png", out_dir), dpi=100)
     print("✓ Saved visualization: comparison_metrics.png")
     plt.close()
 
@@ -358,12 +371,19 @@ def generate_visualizations(metrics_list: List[GameMetrics]):
                     ha='center', va='bottom', fontsize=8)
 
     plt.tight_layout()
-    plt.savefig("/home/lum/AI_Zombie_Project/phase2/nodes_complexity.png", dpi=100)
+    plt.savefig(output_path("nodes_complexity.png", out_dir), dpi=100)
     print("✓ Saved visualization: nodes_complexity.png")
     plt.close()
 
 
 def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the 4 phase2 scenarios and chart them.")
+    parser.add_argument("--output-dir", default=None,
+                        help="where to write the PNGs (default: $PHASE2_OUTPUT_DIR or phase2/)")
+    args = parser.parse_args()
+
     print("\n" + "=" * 100)
     print("PHASE 2: MINIMAX ALGORITHM COMPARISON")
     print("=" * 100 + "\n")
@@ -376,12 +396,14 @@ def main():
 
     # Generate visualizations
     print("Generating visualizations...")
-    generate_visualizations(metrics_list)
+    with profiling.phase("export"):
+        generate_visualizations(metrics_list, args.output_dir)
 
     print("\n✓ Comparison complete!")
     print("  - Metrics table printed above")
-    print("  - Visualizations saved to phase2/ folder")
+    print(f"  - Visualizations saved to {output_dir(args.output_dir)}")
 
 
 if __name__ == "__main__":
+    profiling.install()
     main()
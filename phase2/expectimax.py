@@ -0,0 +1,256 @@
+"""
+Expectimax search: the opponent is a probability distribution, not an adversary.
+
+minimax_both_players assumes a perfect opponent and minimax_ambush_monster a
+prey that walks its A* path exactly. Here the opponent instead picks each
+move from a softmax over distance-field gradients:
+
+  monster  P(step) ~ exp(-beta * maze distance from the step to the prey)
+  prey     P(step) ~ exp(-beta * maze distance from the step to the reward)
+
+The probabilities are precomputed once per grid (and beta) and cached as
+tables: (monster cell, prey cell, move) for the monster, (cell, move) for
+the prey.
+
+The tree is expanded level by level as NumPy arrays, four padded moves per
+state, so every chance node of a level (and every leaf evaluation) is
+computed in one batch. Values are then backed up: the searching side takes
+the best legal child, chance nodes take the probability-weighted mean.
+Reaching the reward / a capture scores +/-WIN_SCORE and freezes that branch.
+There is no pruning, so a search costs about 4**depth states.
+
+Usage: python3 phase2/expectimax.py   (expectimax vs minimax agents)
+"""
+
+import sys
+import os
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import profiling
+from config import GOAL_POS_LARGE
+from utils import get_astar_path
+from phase2.game_engine import PREY, INF, distance_evaluation, chase_evaluation
+from phase2.grid_arrays import padded_moves, distance_matrix
+
+WIN_SCORE = 10_000.0   # finite stand-in for +/-inf so expectations stay defined
+
+_MONSTER_TABLES = {}
+_PREY_TABLES = {}
+
+
+def _softmax(score, mask):
+    """Row-wise softmax of `score` over the legal (mask) entries (all-zero rows for walls)."""
+    top = np.where(mask, score, -np.inf).max(axis=-1, keepdims=True)
+    top[~np.isfinite(top)] = 0.0
+    weights = np.where(mask, np.exp(np.minimum(score - top, 0.0)), 0.0)
+    total = weights.sum(axis=-1, keepdims=True)
+    return weights / np.where(total > 0, total, 1.0)
+
+
+def monster_policy_table(graph, beta=1.0):
+    """P(monster move k | monster cell, prey cell): float32 array of shape (N, N, 4)."""
+    key = (id(graph), beta)
+    entry = _MONSTER_TABLES.get(key)
+    if entry is None or entry[0] is not graph:
+        nbr, mask, _ = padded_moves(graph)
+        dist = distance_matrix(graph).astype(np.float32)
+        dist[dist < 0] = graph.size
+        step_dist = dist[nbr]                                   # (N, 4, N): from each step to each prey
+        table = _softmax(-beta * step_dist.transpose(0, 2, 1), mask[:, None, :])
+        entry = _MONSTER_TABLES[key] = (graph, table.astype(np.float32))
+    return entry[1]
+
+
+def prey_policy_table(graph, reward, beta=1.0):
+    """P(prey move k | prey cell) towards the reward: float32 array of shape (N, 4)."""
+    key = (id(graph), reward, beta)
+    entry = _PREY_TABLES.get(key)
+    if entry is None or entry[0] is not graph:
+        nbr, mask, _ = padded_moves(graph)
+        dist = distance_matrix(graph)[reward].astype(np.float32)
+        dist[dist < 0] = graph.size
+        table = _softmax(-beta * dist[nbr], mask)
+        entry = _PREY_TABLES[key] = (graph, table.astype(np.float32))
+    return entry[1]
+
+
+def _vector_evaluation(evaluate, graph):
+    """NumPy version of a game_engine evaluation over arrays of prey / monster cells."""
+    xs = np.asarray(graph.xs)
+    ys = np.asarray(graph.ys)
+
+    def manhattan(a, b):
+        return np.abs(xs[a] - xs[b]) + np.abs(ys[a] - ys[b])
+
+    if evaluate is distance_evaluation:
+        return lambda prey, monster, reward: manhattan(prey, monster) - manhattan(prey, reward)
+    if evaluate is chase_evaluation:
+        return lambda prey, monster, reward: manhattan(prey, monster)
+    return lambda prey, monster, reward: np.fromiter(
+        (evaluate(graph, int(p), int(m), reward) for p, m in zip(prey, monster)),
+        dtype=float, count=len(prey))
+
+
+class ExpectimaxSearch:
+    """Depth-limited expectimax for one side against the softmax model of the other."""
+
+    def __init__(self, graph, reward, evaluate=distance_evaluation, beta=1.0):
+        self.graph = graph
+        self.reward = reward
+        self.beta = beta
+        self.nbr, self.mask, _ = padded_moves(graph)
+        self._evaluate = _vector_evaluation(evaluate, graph)
+        self._monster_table = None
+        self._prey_table = None
+        self.nodes = 0
+
+    def _chance(self, prey_turn, prey, monster):
+        """Opponent move probabilities (B, 4) for a batch of states."""
+        if prey_turn:
+            if self._prey_table is None:
+                self._prey_table = prey_policy_table(self.graph, self.reward, self.beta)
+            return self._prey_table[prey]
+        if self._monster_table is None:
+            self._monster_table = monster_policy_table(self.graph, self.beta)
+        return self._monster_table[monster, prey]
+
+    def best_move(self, prey, monster, depth, prey_turn):
+        """
+        Expectimax from (prey, monster) for the side to move, `depth` plies deep.
+
+        Returns (move, score) like AdversarialSearch.best_move: the first move in
+        Down, Up, Right, Left order with the best expected score (prey side,
+        +/-inf for a certain win or loss), or (None, score) if there is no move.
+        """
+        reward = self.reward
+        if prey == reward:
+            return None, INF
+        if prey == monster:
+            return None, -INF
+        if depth == 0 or not self.graph.moves[prey if prey_turn else monster]:
+            return None, float(self._evaluate(np.array([prey]), np.array([monster]), reward)[0])
+
+        searcher_is_prey = prey_turn
+        nbr, mask = self.nbr, self.mask
+
+        # Expand level by level. Each level keeps the (B, 4) child masks and, at
+        # chance levels, the move probabilities needed to back values up.
+        p = np.array([prey], dtype=np.int64)
+        m = np.array([monster], dtype=np.int64)
+        done = np.zeros(1, dtype=bool)
+        fixed = np.zeros(1)
+        levels = []
+        turn = prey_turn
+        for _ in range(depth):
+            mover = p if turn else m
+            legal = mask[mover] & ~done[:, None]
+            legal[done, 0] = True                         # finished games carry one frozen child
+            chance = None
+            if turn != searcher_is_prey:
+                chance = np.where(done[:, None], np.eye(1, 4, dtype=np.float32), self._chance(turn, p, m))
+            levels.append((turn, legal, chance))
+
+            step = np.where(done[:, None], mover[:, None], nbr[mover]).ravel()
+            p = step if turn else np.repeat(p, 4)
+            m = np.repeat(m, 4) if turn else step
+            done = np.repeat(done, 4)
+            fixed = np.repeat(fixed, 4)
+            won = ~done & (p == reward)
+            lost = ~done & ~won & (p == m)
+            fixed[won] = WIN_SCORE
+            fixed[lost] = -WIN_SCORE
+            done |= won | lost
+            self.nodes += int(legal.sum())
+            turn = not turn
+
+        value = np.where(done, fixed, self._evaluate(p, m, reward)).astype(float)
+
+        # Back up from the leaves to the root's children
+        for turn, legal, chance in reversed(levels[1:]):
+            value = value.reshape(-1, 4)
+            if chance is not None:
+                value = (np.where(legal, value, 0.0) * chance).sum(axis=1)
+            elif turn:
+                value = np.where(legal, value, -np.inf).max(axis=1)
+            else:
+                value = np.where(legal, value, np.inf).min(axis=1)
+
+        _, legal, _ = levels[0]
+        mover = prey if prey_turn else monster
+        best_move, best_score = None, None
+        for k in range(4):
+            if not legal[0, k]:
+                continue
+            score = float(value[k])
+            better = best_score is None or (score > best_score if prey_turn else score < best_score)
+            if better:
+                best_move, best_score = int(nbr[mover, k]), score
+        if abs(best_score) >= WIN_SCORE:
+            best_score = INF if best_score > 0 else -INF
+        return best_move, best_score
+
+
+class ExpectimaxPolicy:
+    """Expectimax for the next move against the softmax opponent, A* for the rest of the path."""
+
+    def __init__(self, depth, evaluate=distance_evaluation, beta=1.0):
+        self.depth = depth
+        self.evaluate = evaluate
+        self.beta = beta
+        self.search = None
+
+    def plan(self, game, agent):
+        graph = game.graph
+        reward = graph.index(game.reward_pos)
+        search = self.search
+        if search is None or search.graph is not graph or search.reward != reward:
+            search = self.search = ExpectimaxSearch(graph, reward, self.evaluate, self.beta)
+
+        start, target = game.endpoints(agent)
+        nodes_before = search.nodes
+        move, score = search.best_move(graph.index(game.prey_pos), graph.index(game.monster_pos),
+                                       self.depth, agent == PREY)
+        if move is not None:
+            next_pos = graph.position(move)
+            tail = get_astar_path(next_pos, target, game.grid)
+            path = [start] + tail if tail else [start, next_pos]
+        else:
+            path = get_astar_path(start, target, game.grid) or [start]
+        return path, {"nodes_expanded": search.nodes - nodes_before, "score": score}
+
+
+# ==============================================================================
+#  COMPARISON
+# ==============================================================================
+MATCHUPS = [
+    # (label, prey algorithm, prey depth, monster algorithm, monster depth)
+    ("minimax prey vs minimax monster", "adversarial", 4, "adversarial", 4),
+    ("expectimax prey vs minimax monster", "expectimax", 4, "adversarial", 4),
+    ("minimax prey vs A* monster", "adversarial", 4, "astar", None),
+    ("expectimax prey vs A* monster", "expectimax", 4, "astar", None),
+    ("A* prey vs minimax monster", "astar", None, "adversarial", 4),
+    ("A* prey vs expectimax monster", "astar", None, "expectimax", 4),
+]
+
+
+def main():
+    from phase2.compare_algorithms import GameSimulator
+
+    print(f"GRID_LARGE, reward {tuple(GOAL_POS_LARGE)}, 300-step limit\n")
+    print(f"{'matchup':<36} | {'result':<8} | {'steps':>5} | {'ms/move':>8} | {'nodes':>8}")
+    print("-" * 78)
+    for label, prey_alg, prey_depth, monster_alg, monster_depth in MATCHUPS:
+        m = GameSimulator(label, prey_alg, monster_alg, prey_depth=prey_depth,
+                          monster_depth=monster_depth, max_steps=300).run()
+        ms_per_move = 1000 * m.computation_time / max(1, m.total_path_calls)
+        result = m.winner.upper() if m.winner else "TIMEOUT"
+        print(f"{label:<36} | {result:<8} | {m.steps_to_end:>5} | {ms_per_move:>8.2f} | "
+              f"{m.prey_nodes_expanded + m.monster_nodes_expanded:>8}")
+
+
+if __name__ == "__main__":
+    profiling.install()
+    main()
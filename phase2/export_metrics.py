@@ -5,15 +5,18 @@ Generate CSV data and simple ASCII dashboard for Phase 2 comparison.
 import sys
 import os
 import csv
+import argparse
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import profiling
 from phase2.compare_algorithms import run_all_scenarios
+from phase2.metrics_sink import output_path
 
 
-def create_csv_export(metrics_list):
-    """Export metrics to CSV file."""
-    csv_path = "/home/lum/AI_Zombie_Project/phase2/metrics.csv"
+def create_csv_export(metrics_list, out_dir=None):
+    """Export metrics to metrics.csv in the output directory."""
+    csv_path = output_path("metrics.csv", out_dir)
     
     with open(csv_path, "w", newline="") as f:
         writer = csv.writer(f)
@@ -28,6 +31,15 @@ def create_csv_export(metrics_list):
             "Monster_Nodes_Expanded",
             "Total_Nodes_Expanded",
             "Total_Pathfinding_Calls",
+            "Replans_Avoided",
+            "Prey_P50_ms",
+            "Prey_P90_ms",
+            "Prey_P99_ms",
+            "Prey_Max_ms",
+            "Monster_P50_ms",
+            "Monster_P90_ms",
+            "Monster_P99_ms",
+            "Monster_Max_ms",
         ])
         
         for m in metrics_list:
@@ -42,6 +54,15 @@ def create_csv_export(metrics_list):
                 m.monster_nodes_expanded,
                 m.prey_nodes_expanded + m.monster_nodes_expanded,
                 m.total_path_calls,
+                m.replans_avoided,
+                f"{m.prey_p50_ms:.4f}",
+                f"{m.prey_p90_ms:.4f}",
+                f"{m.prey_p99_ms:.4f}",
+                f"{m.prey_max_ms:.4f}",
+                f"{m.monster_p50_ms:.4f}",
+                f"{m.monster_p90_ms:.4f}",
+                f"{m.monster_p99_ms:.4f}",
+                f"{m.monster_max_ms:.4f}",
             ])
     
     print(f"✓ CSV exported to: {csv_path}")
@@ -92,14 +113,25 @@ def create_ascii_dashboard(metrics_list):
         dashboard += f"│ {m.scenario_name:<30} {bar} {m.total_nodes_evaluated:<5} │\n"
     dashboard += "└────────────────────────────────────────────────────────────────────────────────────────┘\n\n"
 
+    # Decision latency
+    dashboard += "┌─ DECISION LATENCY (ms per move: p50 / p90 / p99 / max) ────────────────────────────────┐\n"
+    for m in metrics_list:
+        for name, agent, times in (
+            (m.scenario_name, "prey", (m.prey_p50_ms, m.prey_p90_ms, m.prey_p99_ms, m.prey_max_ms)),
+            ("", "monster", (m.monster_p50_ms, m.monster_p90_ms, m.monster_p99_ms, m.monster_max_ms)),
+        ):
+            row = f"{name:<30} {agent:<8}" + "".join(f"{t:>10.3f}" for t in times)
+            dashboard += f"│ {row:<86} │\n"
+    dashboard += "└────────────────────────────────────────────────────────────────────────────────────────┘\n\n"
+
     return dashboard
 
 
-def save_ascii_dashboard(metrics_list):
-    """Save ASCII dashboard to file."""
+def save_ascii_dashboard(metrics_list, out_dir=None):
+    """Save ASCII dashboard to DASHBOARD.txt in the output directory."""
     dashboard = create_ascii_dashboard(metrics_list)
     
-    dashboard_path = "/home/lum/AI_Zombie_Project/phase2/DASHBOARD.txt"
+    dashboard_path = output_path("DASHBOARD.txt", out_dir)
     with open(dashboard_path, "w") as f:
         f.write(dashboard)
     
@@ -108,6 +140,11 @@ def save_ascii_dashboard(metrics_list):
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Export Phase 2 comparison metrics.")
+    parser.add_argument("--output-dir", default=None,
+                        help="where to write metrics.csv / DASHBOARD.txt (default: $PHASE2_OUTPUT_DIR or phase2/)")
+    args = parser.parse_args()
+
     print("\n🔄 Generating comparison metrics...\n")
     metrics_list = run_all_scenarios()
     
@@ -115,11 +152,12 @@ def main():
     print("EXPORTING DATA AND VISUALIZATIONS")
     print("=" * 100 + "\n")
     
-    # Create CSV
-    create_csv_export(metrics_list)
-    
-    # Create ASCII dashboard
-    save_ascii_dashboard(metrics_list)
+    with profiling.phase("export"):
+        # Create CSV
+        create_csv_export(metrics_list, args.output_dir)
+
+        # Create ASCII dashboard
+        save_ascii_dashboard(metrics_list, args.output_dir)
     
     print("\n✅ All exports complete!")
     print("\nGenerated files:")
@@ -131,4 +169,5 @@ def main():
 
 
 if __name__ == "__main__":
+    profiling.install()
     main()
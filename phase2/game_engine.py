@@ -0,0 +1,1079 @@
+"""
+Shared adversarial search engine for the Phase 2 prey/monster games.
+
+Every phase2 scenario (minimax_game, minimax_both_players, minimax_evasive_prey,
+minimax_ambush_monster) and compare_algorithms.GameSimulator is a configuration
+of the pieces in this module:
+
+  - GridGraph:         integer cell indices + precomputed move lists per cell
+  - evaluations:       score a (prey, monster) position from the prey's side
+  - opponent models:   how the side that is NOT searching replies
+  - TranspositionTable: bounded LRU / depth-preferred cache for the search
+  - AdversarialSearch: alpha-beta minimax with a transposition table
+  - policies:          turn a search into the path an agent follows this tick
+  - ChaseGame:         the shared per-tick game loop
+
+Cells are encoded as idx = y * width + x and a whole position as
+state = prey_idx * size + monster_idx, so caches key on plain ints.
+"""
+
+import sys
+import os
+import time
+from array import array
+from collections import OrderedDict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import profiling
+from utils import get_astar_path, get_minimax_path, get_bfs_distance_field, path_from_parents
+from phase2.latency import LatencyHistogram
+
+PREY = "prey"
+MONSTER = "monster"
+
+INF = float('inf')
+
+# Transposition table entry flags
+EXACT = 0
+LOWER = 1   # stored score is a lower bound (search failed high)
+UPPER = 2   # stored score is an upper bound (search failed low)
+
+
+# ==============================================================================
+#  GRID GRAPH
+# ==============================================================================
+class GridGraph:
+    """
+    Integer-indexed view of a grid with the legal moves of every cell precomputed.
+
+    Successors live in one flat array: the moves of cell i are
+    move_targets[move_offsets[i]:move_offsets[i + 1]] (walls have none).
+    `moves[i]` holds the same slice as a tuple so the search loops iterate it
+    without any bounds or wall checks. Build graphs through grid_graph(grid)
+    so each grid is only processed once.
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.width = len(grid[0])
+        self.height = len(grid)
+        self.size = self.width * self.height
+
+        # Coordinates per index so evaluations never divide/modulo in the search
+        self.xs = [idx % self.width for idx in range(self.size)]
+        self.ys = [idx // self.width for idx in range(self.size)]
+
+        # Legal successor indices per cell, in the project's Down, Up, Right, Left order.
+        self.move_offsets = array('i', [0])
+        self.move_targets = array('i')
+        for y in range(self.height):
+            for x in range(self.width):
+                if grid[y][x] != 1:
+                    for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
+                        nx, ny = x + dx, y + dy
+                        if 0 <= nx < self.width and 0 <= ny < self.height and grid[ny][nx] != 1:
+                            self.move_targets.append(ny * self.width + nx)
+                self.move_offsets.append(len(self.move_targets))
+
+        offsets, targets = self.move_offsets, self.move_targets
+        self.moves = [tuple(targets[offsets[i]:offsets[i + 1]]) for i in range(self.size)]
+
+        self._symmetries = {}
+        self._dead_ends = {}
+
+    def index(self, pos):
+        """[x, y] -> cell index."""
+        return pos[1] * self.width + pos[0]
+
+    def position(self, idx):
+        """Cell index -> (x, y)."""
+        return (self.xs[idx], self.ys[idx])
+
+    def encode(self, prey_idx, monster_idx):
+        """Compact integer state for a (prey, monster) position."""
+        return prey_idx * self.size + monster_idx
+
+    def decode(self, state):
+        """Inverse of encode: state -> (prey_idx, monster_idx)."""
+        return divmod(state, self.size)
+
+    def manhattan(self, a, b):
+        """Manhattan distance between two cell indices."""
+        return abs(self.xs[a] - self.xs[b]) + abs(self.ys[a] - self.ys[b])
+
+    def symmetries(self, fixed=None):
+        """
+        (forward, inverse) index maps of every non-identity mirror/rotation of the grid
+        that keeps the walls, and the `fixed` cell if given, in place.
+        """
+        cached = self._symmetries.get(fixed)
+        if cached is not None:
+            return cached
+        w, h = self.width, self.height
+        transforms = [
+            lambda x, y: (w - 1 - x, y),
+            lambda x, y: (x, h - 1 - y),
+            lambda x, y: (w - 1 - x, h - 1 - y),
+        ]
+        if w == h:
+            transforms += [
+                lambda x, y: (y, x),
+                lambda x, y: (h - 1 - y, w - 1 - x),
+                lambda x, y: (h - 1 - y, x),
+                lambda x, y: (y, w - 1 - x),
+            ]
+        found = []
+        for transform in transforms:
+            forward = [0] * self.size
+            for idx in range(self.size):
+                tx, ty = transform(self.xs[idx], self.ys[idx])
+                forward[idx] = ty * w + tx
+            if fixed is not None and forward[fixed] != fixed:
+                continue
+            if any(self.grid[self.ys[i]][self.xs[i]] != self.grid[self.ys[j]][self.xs[j]]
+                   for i, j in enumerate(forward)):
+                continue
+            inverse = [0] * self.size
+            for idx, image in enumerate(forward):
+                inverse[image] = idx
+            found.append((forward, inverse))
+        self._symmetries[fixed] = found
+        return found
+
+    def dead_ends(self, reward=None):
+        """
+        Dead-end pockets: the tree-shaped parts of the grid that hang off its cycles.
+
+        Cells are peeled like leaves of a tree (the reward never is), and each
+        peeled cell points at its neighbour towards the rest of the grid. Returns
+        (peeled, tin, tout): pre/post DFS numbers over that forest, so cell m lies
+        on the way out of pocket cell p exactly when tin[m] <= tin[p] < tout[m].
+        """
+        cached = self._dead_ends.get(reward)
+        if cached is not None:
+            return cached
+        degree = [len(m) for m in self.moves]
+        peeled = [False] * self.size
+        parent = [-1] * self.size
+        stack = [i for i in range(self.size) if degree[i] == 1 and i != reward]
+        while stack:
+            cell = stack.pop()
+            if peeled[cell] or degree[cell] != 1:
+                continue
+            peeled[cell] = True
+            for nbr in self.moves[cell]:
+                if not peeled[nbr]:
+                    parent[cell] = nbr
+                    degree[nbr] -= 1
+                    if degree[nbr] == 1 and nbr != reward:
+                        stack.append(nbr)
+
+        children = [[] for _ in range(self.size)]
+        for cell in range(self.size):
+            if parent[cell] >= 0:
+                children[parent[cell]].append(cell)
+        tin = [0] * self.size
+        tout = [0] * self.size
+        clock = 0
+        for root in range(self.size):
+            if parent[root] >= 0:
+                continue
+            tin[root] = clock
+            clock += 1
+            stack = [(root, iter(children[root]))]
+            while stack:
+                cell, it = stack[-1]
+                child = next(it, None)
+                if child is None:
+                    tout[cell] = clock
+                    stack.pop()
+                else:
+                    tin[child] = clock
+                    clock += 1
+                    stack.append((child, iter(children[child])))
+        result = self._dead_ends[reward] = (peeled, tin, tout)
+        return result
+
+
+_GRAPHS = {}
+
+
+def grid_graph(grid):
+    """
+    Shared GridGraph for `grid`, built on first use.
+
+    Graphs are cached by grid identity, so a grid must not be edited after
+    its graph has been built.
+    """
+    entry = _GRAPHS.get(id(grid))
+    if entry is None or entry.grid is not grid:
+        entry = _GRAPHS[id(grid)] = GridGraph(grid)
+    return entry
+
+
+# ==============================================================================
+#  EVALUATIONS  (higher = better for the prey; the monster minimizes)
+# ==============================================================================
+def distance_evaluation(graph, prey, monster, reward):
+    """
+    (Distance from Prey to Monster) - (Distance from Prey to Reward).
+
+    Used by minimax_both_players and minimax_evasive_prey.
+    """
+    return graph.manhattan(prey, monster) - graph.manhattan(prey, reward)
+
+
+def chase_evaluation(graph, prey, monster, reward):
+    """
+    Distance from monster to prey. The monster minimizes it.
+
+    Used by minimax_ambush_monster.
+    """
+    return graph.manhattan(prey, monster)
+
+
+# ==============================================================================
+#  OPPONENT MODELS
+# ==============================================================================
+class AStarChaseOpponent:
+    """
+    The monster answers every prey move with one A* step toward the prey's new cell.
+
+    Used by minimax_evasive_prey. Next hops are memoized per (monster, prey) pair.
+    """
+
+    side = MONSTER
+
+    def __init__(self):
+        self._graph = None
+        self._next_hop = {}
+
+    def reply(self, graph, prey, monster, depth):
+        if graph is not self._graph:
+            self._graph = graph
+            self._next_hop = {}
+        key = monster * graph.size + prey
+        hop = self._next_hop.get(key)
+        if hop is None:
+            path = get_astar_path(graph.position(monster), graph.position(prey), graph.grid)
+            hop = graph.index(path[1]) if len(path) > 1 else monster
+            self._next_hop[key] = hop
+        return hop
+
+
+class PathFollowerOpponent:
+    """
+    The prey walks its predicted path; the monster looks `lookahead` cells into it.
+
+    Used by minimax_ambush_monster.
+    """
+
+    side = PREY
+
+    def __init__(self, path, lookahead):
+        self.path = path          # list of cell indices, path[0] = prey's cell
+        self.lookahead = lookahead
+
+    def reply(self, graph, prey, monster, depth):
+        ahead = min(depth, self.lookahead)
+        if len(self.path) > ahead:
+            return self.path[ahead]
+        if len(self.path) > 1:
+            return self.path[-1]
+        return prey
+
+
+# ==============================================================================
+#  TRANSPOSITION TABLE
+# ==============================================================================
+# Rough CPython 3.11 footprint of one entry (int key, (flag, score, move) tuple,
+# OrderedDict slot), measured with tracemalloc. Used to turn max_bytes into entries.
+TT_ENTRY_BYTES = 250
+
+
+def key_depth(key):
+    """Remaining depth stored in an AdversarialSearch cache key."""
+    return (key >> 1) & 0xFF
+
+
+class TranspositionTable:
+    """
+    Size-capped cache for AdversarialSearch (a drop-in for its plain dict).
+
+    Capacity is `max_entries`, or `max_bytes` // TT_ENTRY_BYTES. When full:
+      policy="lru"    evict the least recently used entry
+      policy="depth"  evict the oldest entry of the shallowest stored depth
+                      (deep results cost the most to recompute)
+
+    `hits`, `misses` and `evictions` count lookups and evictions since the
+    last reset_stats(). Keys hold only the position, depth and side to move,
+    so a table is bound to one search context (grid, reward, evaluation,
+    opponent model, pruning): AdversarialSearch calls bind() and the table
+    empties itself when the context differs from the one it was filled for.
+    It can therefore be kept across turns and games.
+    """
+
+    def __init__(self, max_entries=None, max_bytes=None, policy="lru"):
+        if max_entries is None:
+            if max_bytes is None:
+                raise ValueError("TranspositionTable needs max_entries or max_bytes")
+            max_entries = max_bytes // TT_ENTRY_BYTES
+        if policy not in ("lru", "depth"):
+            raise ValueError(f"Unknown eviction policy: {policy}")
+        self.max_entries = max(1, max_entries)
+        self.policy = policy
+        self._entries = OrderedDict()   # lru
+        self._by_depth = {}             # depth -> OrderedDict, for policy="depth"
+        self._size = 0
+        self.context = None
+        self.reset_stats()
+
+    def bind(self, context):
+        """Clear the table if `context` is not the one its entries were computed for."""
+        if context != self.context:
+            self.clear()
+            self.context = context
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _bucket(self, key):
+        if self.policy == "lru":
+            return self._entries
+        depth = key_depth(key)
+        bucket = self._by_depth.get(depth)
+        if bucket is None:
+            bucket = self._by_depth[depth] = OrderedDict()
+        return bucket
+
+    def get(self, key, default=None):
+        bucket = self._bucket(key)
+        entry = bucket.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        if self.policy == "lru":
+            bucket.move_to_end(key)
+        return entry
+
+    def __setitem__(self, key, entry):
+        bucket = self._bucket(key)
+        if key in bucket:
+            bucket[key] = entry
+            bucket.move_to_end(key)
+            return
+        bucket[key] = entry
+        self._size += 1
+        if self._size > self.max_entries:
+            self._evict()
+
+    def _evict(self):
+        if self.policy == "lru":
+            self._entries.popitem(last=False)
+        else:
+            shallowest = min(d for d, bucket in self._by_depth.items() if bucket)
+            self._by_depth[shallowest].popitem(last=False)
+        self._size -= 1
+        self.evictions += 1
+
+    def __contains__(self, key):
+        return key in self._bucket(key)
+
+    def __len__(self):
+        return self._size
+
+    def clear(self):
+        self._entries.clear()
+        self._by_depth.clear()
+        self._size = 0
+
+    @property
+    def approx_bytes(self):
+        return self._size * TT_ENTRY_BYTES
+
+    def stats(self):
+        """Counters as a dict (for info / metrics output)."""
+        return {"entries": self._size, "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions}
+
+
+# ==============================================================================
+#  ALPHA-BETA SEARCH
+# ==============================================================================
+class AdversarialSearch:
+    """
+    Depth-limited alpha-beta minimax over (prey, monster) positions.
+
+    The prey is the maximizer and the monster the minimizer. With opponent=None
+    both sides are searched and turns alternate. With an opponent model only the
+    other side is searched; after each of its moves the opponent replies with
+    opponent.reply(...).
+
+    Results are stored in `cache` (a dict by default, or a TranspositionTable)
+    keyed by the compact state, remaining depth and side to move. Root move choice is identical to plain
+    minimax: the first move in Down, Up, Right, Left order with the best score.
+    A TranspositionTable is bound to this search's context (see
+    TranspositionTable.bind); a plain dict must not be shared between
+    searches with different grids, rewards, evaluations or opponents.
+
+    Pruning when both sides are searched (opponent=None):
+      symmetry     positions that are mirror images (grid symmetries that keep
+                   the walls and the reward, see GridGraph.symmetries) share one
+                   cache entry; only for the built-in evaluations, which are
+                   symmetric
+      dead_ends    a prey inside a dead-end pocket with the monster on its way
+                   out is lost and scores -inf at once (GridGraph.dead_ends);
+                   a trapped root is still searched, so the mover gets a
+                   legal move (the first of the equally lost ones)
+      repetitions  a position already on the current line is scored by the
+                   evaluation instead of searched again; such path-dependent
+                   results are never cached. Off by default: unlike the other
+                   two it can change the chosen move
+    """
+
+    def __init__(self, graph, reward, evaluate=distance_evaluation, opponent=None, cache=None,
+                 symmetry=True, dead_ends=True, repetitions=False):
+        self.graph = graph
+        self.reward = reward          # reward cell index, or None for no reward terminal
+        self.evaluate = evaluate
+        self.opponent = opponent
+        self.cache = {} if cache is None else cache
+        self.nodes = 0
+        self.cache_hits = 0
+        self.pruned = 0               # subtrees cut by dead_ends / repetitions
+        self._moves = graph.moves
+        self._size = graph.size
+        self._root_depth = None
+
+        adversarial = opponent is None
+        symmetric = evaluate in (distance_evaluation, chase_evaluation)
+        self._symmetries = graph.symmetries(reward) if symmetry and adversarial and symmetric else ()
+        peeled, self._tin, self._tout = graph.dead_ends(reward)
+        self._peeled = peeled if dead_ends and adversarial and any(peeled) else None
+        self._line = set() if repetitions and adversarial else None
+        self._path_dependent = 0
+        bind = getattr(self.cache, "bind", None)
+        if bind is not None:
+            bind((graph, reward, evaluate, opponent, bool(self._symmetries), self._peeled is not None,
+                  self._line is not None))
+
+    def best_move(self, prey, monster, depth, prey_turn):
+        """
+        Search from (prey, monster) with `depth` plies left.
+
+        Returns (move, score) where move is the mover's next cell index,
+        or None if the position is terminal or the mover is stuck.
+        """
+        if self.opponent is not None:
+            prey_turn = self.opponent.side == MONSTER
+        self._root_depth = depth
+        return self._search(prey, monster, depth, int(prey_turn), -INF, INF)
+
+    def search(self, prey, monster, depth, prey_turn, alpha=-INF, beta=INF, root=False):
+        """
+        Fail-soft alpha-beta value of a position inside the (alpha, beta) window.
+
+        Returns (move, score); a score <= alpha is an upper bound, >= beta a lower bound.
+        The position is searched as an inner node (the child of a split root,
+        trapped-prey cutoff included) unless root=True, which treats it like
+        best_move's root.
+        """
+        self._root_depth = depth if root else None
+        return self._search(prey, monster, depth, int(prey_turn), alpha, beta)
+
+    def _key(self, prey, monster, depth, prey_turn):
+        """(cache key, symmetry maps or None) for a position in its canonical orientation."""
+        size = self._size
+        state = prey * size + monster
+        maps = None
+        for forward, inverse in self._symmetries:
+            image = forward[prey] * size + forward[monster]
+            if image < state:
+                state, maps = image, (forward, inverse)
+        return (state << 9) | (depth << 1) | prey_turn, maps
+
+    def principal_variation(self, prey, monster, depth, prey_turn):
+        """
+        Positions along the principal line of the last search from this root.
+
+        Returns [(prey, monster), ...] after each searched move (with an opponent
+        model, after the move and its reply), read back from the cache. Stops
+        at the first position without an EXACT entry.
+        """
+        if self.opponent is not None:
+            prey_turn = self.opponent.side == MONSTER
+        line = []
+        prey_turn = int(prey_turn)
+        while depth > 0:
+            key, maps = self._key(prey, monster, depth, prey_turn)
+            entry = self.cache.get(key)
+            if entry is None or entry[0] != EXACT or entry[2] is None:
+                break
+            move = entry[2] if maps is None else maps[1][entry[2]]
+            if self.opponent is None:
+                if prey_turn:
+                    prey = move
+                else:
+                    monster = move
+                prey_turn ^= 1
+            elif prey_turn:
+                prey, monster = move, self.opponent.reply(self.graph, move, monster, depth)
+            else:
+                prey, monster = self.opponent.reply(self.graph, prey, move, depth), move
+            depth -= 1
+            line.append((prey, monster))
+        return line
+
+    def _search(self, prey, monster, depth, prey_turn, alpha, beta):
+        self.nodes += 1
+        graph = self.graph
+        size = self._size
+        # Canonical orientation, as in _key (inlined: this runs for every node)
+        state = prey * size + monster
+        maps = None
+        for forward, inverse in self._symmetries:
+            image = forward[prey] * size + forward[monster]
+            if image < state:
+                state, maps = image, (forward, inverse)
+        key = (state << 9) | (depth << 1) | prey_turn
+        root = depth == self._root_depth
+
+        entry = self.cache.get(key)
+        # The root never uses a mirrored entry (its move may break ties differently)
+        # or a moveless one (a trapped position pruned below a root must still pick a move)
+        if entry is not None and not (root and (maps is not None or entry[2] is None)):
+            flag, score, move = entry
+            if flag == EXACT or (flag == LOWER and score >= beta) or (flag == UPPER and score <= alpha):
+                self.cache_hits += 1
+                if maps is not None and move is not None:
+                    move = maps[1][move]
+                return move, score
+
+        # Terminal conditions
+        if depth == 0:
+            score = self.evaluate(graph, prey, monster, self.reward)
+            self.cache[key] = (EXACT, score, None)
+            return None, score
+        if prey == self.reward:
+            self.cache[key] = (EXACT, INF, None)
+            return None, INF
+        if prey == monster:
+            self.cache[key] = (EXACT, -INF, None)
+            return None, -INF
+
+        peeled = self._peeled
+        if peeled is not None and peeled[prey] and not root:
+            tin = self._tin
+            if monster != self.reward and tin[monster] <= tin[prey] < self._tout[monster]:
+                # Trapped: the only way out of the pocket runs through the monster
+                self.pruned += 1
+                self.cache[key] = (EXACT, -INF, None)
+                return None, -INF
+
+        line = self._line
+        if line is not None:
+            here = key >> 9 << 1 | prey_turn
+            if here in line:
+                self.pruned += 1
+                self._path_dependent += 1
+                return None, self.evaluate(graph, prey, monster, self.reward)
+            line.add(here)
+            path_dependent = self._path_dependent
+
+        moves = self._moves[prey if prey_turn else monster]
+        if not moves:
+            score = self.evaluate(graph, prey, monster, self.reward)
+            if line is not None:
+                line.discard(here)
+            self.cache[key] = (EXACT, score, None)
+            return None, score
+
+        opponent = self.opponent
+        best_move = None
+        a, b = alpha, beta
+
+        if prey_turn:
+            # PREY IS MAXIMIZER
+            best_score = -INF
+            for move in moves:
+                if opponent is None:
+                    _, score = self._search(move, monster, depth - 1, 0, a, b)
+                else:
+                    reply = opponent.reply(graph, move, monster, depth)
+                    _, score = self._search(move, reply, depth - 1, 1, a, b)
+                if score > best_score:
+                    best_score = score
+                    best_move = move
+                    if score > a:
+                        a = score
+                        if a >= b:
+                            break
+        else:
+            # MONSTER IS MINIMIZER
+            best_score = INF
+            for move in moves:
+                if opponent is None:
+                    _, score = self._search(prey, move, depth - 1, 1, a, b)
+                else:
+                    reply = opponent.reply(graph, prey, move, depth)
+                    _, score = self._search(reply, move, depth - 1, 0, a, b)
+                if score < best_score:
+                    best_score = score
+                    best_move = move
+                    if score < b:
+                        b = score
+                        if a >= b:
+                            break
+
+        if best_move is None:
+            best_move = moves[0]
+
+        if line is not None:
+            line.discard(here)
+            if self._path_dependent != path_dependent:
+                return best_move, best_score   # depends on the line above: do not cache
+
+        if best_score <= alpha:
+            flag = UPPER
+        elif best_score >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.cache[key] = (flag, best_score, best_move if maps is None else maps[0][best_move])
+        return best_move, best_score
+
+
+class PrincipalVariation:
+    """
+    A minimax plan kept between ticks by minimax_path.
+
+    After each search it stores the positions the principal line expects at
+    the start of the agent's coming ticks, with the agent's planned move
+    from each. While the game follows the line (the opponent played the
+    expected reply) the next move is read off the plan with no search; the
+    first deviation drops the plan. `searches` and `reused` count the ticks
+    of each kind. Moves taken from the plan were searched with fewer plies
+    left than a fresh search would use. A plan is only followed in the
+    context it was searched in (see bind).
+    """
+
+    def __init__(self):
+        self.ahead = []     # [((prey, monster), own next move), ...] for the coming ticks
+        self.path = []
+        self.score = None
+        self.context = None
+        self.searches = 0
+        self.reused = 0
+
+    def clear(self):
+        self.ahead = []
+        self.path = []
+
+    def bind(self, context):
+        """Drop the plan if it was searched for a different grid, reward, evaluation or opponent."""
+        if context != self.context:
+            self.clear()
+            self.context = context
+
+    def record(self, line, root, own_turn_every, agent, path, score):
+        """Store a fresh search: `line` from principal_variation, one own move per `own_turn_every` plies."""
+        states = [root] + line
+        mover = 0 if agent == PREY else 1
+        self.ahead = [
+            (states[i], states[i + 1][mover])
+            for i in range(own_turn_every, len(states) - 1, own_turn_every)
+        ]
+        self.path = path
+        self.score = score
+        self.searches += 1
+
+    def follow(self, state):
+        """The planned move if the game is at the expected position, else None (plan dropped)."""
+        if self.ahead and self.ahead[0][0] == state:
+            self.reused += 1
+            return self.ahead.pop(0)[1]
+        self.ahead = []
+        return None
+
+
+def minimax_path(graph, agent, prey_pos, monster_pos, reward_pos, depth,
+                 evaluate=distance_evaluation, opponent=None, cache=None, return_info=False,
+                 pv=None, book=None):
+    """
+    Pick `agent`'s next move with alpha-beta minimax, then extend it with A*.
+
+    The prey's path continues to the reward, the monster's to the prey's
+    current cell. Falls back to plain A* if the search yields no move.
+
+    With a PrincipalVariation as `pv`, ticks that follow the previous
+    search's principal line reuse its move (and A* tail) without searching.
+    With an OpeningBook (phase2/opening_book.py) as `book`, positions it
+    covers take the stored move instead of a live search.
+
+    Returns a list of (x, y) tuples starting at the agent's cell,
+    or (path, info) if return_info is True.
+    """
+    prey_pos = tuple(prey_pos)
+    monster_pos = tuple(monster_pos)
+    reward_pos = tuple(reward_pos)
+    if agent == PREY:
+        start, target = prey_pos, reward_pos
+    else:
+        start, target = monster_pos, prey_pos
+
+    root = (graph.index(prey_pos), graph.index(monster_pos))
+    if pv is not None:
+        pv.bind((graph, graph.index(reward_pos), evaluate, opponent, depth))
+        move = pv.follow(root)
+        if move is not None:
+            next_pos = graph.position(move)
+            old = pv.path
+            if len(old) > 2 and old[1] == start and old[2] == next_pos and old[-1] == target:
+                path = old[1:]
+            else:
+                tail = get_astar_path(next_pos, target, graph.grid)
+                path = [start] + tail if tail else [start, next_pos]
+            pv.path = path
+            if return_info:
+                return path, {"nodes_expanded": 0, "cache_hits": 0, "score": pv.score, "pv_reused": True}
+            return path
+
+    if book is not None:
+        hit = book.lookup(root[0], root[1], agent == PREY)
+        if hit is not None:
+            move, score = hit
+            next_pos = graph.position(move)
+            tail = get_astar_path(next_pos, target, graph.grid)
+            path = [start] + tail if tail else [start, next_pos]
+            if pv is not None:
+                pv.clear()
+            if return_info:
+                return path, {"nodes_expanded": 0, "cache_hits": 0, "score": score, "book_hit": True}
+            return path
+
+    search = AdversarialSearch(graph, graph.index(reward_pos), evaluate, opponent, cache)
+    move, score = search.best_move(root[0], root[1], depth, agent == PREY)
+
+    if move is not None:
+        next_pos = graph.position(move)
+        tail = get_astar_path(next_pos, target, graph.grid)
+        path = [start] + tail if tail else [start, next_pos]
+    else:
+        path = get_astar_path(start, target, graph.grid) or [start]
+
+    if pv is not None:
+        line = search.principal_variation(root[0], root[1], depth, agent == PREY) if move is not None else []
+        pv.record(line, root, 1 if opponent is not None else 2, agent, path, score)
+
+    if return_info:
+        return path, {"nodes_expanded": search.nodes, "cache_hits": search.cache_hits, "score": score}
+    return path
+
+
+def intercept_path(graph, monster_pos, prey_pos, prey_predicted_path, lookahead=None, return_info=False):
+    """
+    Path to the cell of the prey's predicted path where the monster collides EARLIEST.
+
+    One BFS from the monster scores every cell on the prey path (optionally only
+    the first `lookahead` cells); the path is rebuilt from the BFS parent field.
+    Falls back to a direct A* chase when there is no prediction.
+    """
+    if not prey_predicted_path or len(prey_predicted_path) < 2:
+        # Fallback to direct A* chase if no path data
+        return get_astar_path(tuple(monster_pos), tuple(prey_pos), graph.grid, return_info=return_info)
+
+    dist, parent = get_bfs_distance_field(monster_pos, graph.grid)
+    info = {"nodes_expanded": graph.size - dist.count(-1)}
+    candidates = prey_predicted_path if lookahead is None else prey_predicted_path[:lookahead + 1]
+
+    best_intercept = None
+    best_collision_step = INF
+    for step_idx, candidate_pos in enumerate(candidates):
+        # Prey needs step_idx steps to get here; monster needs its BFS distance
+        monster_steps_to_here = dist[graph.index(candidate_pos)]
+        if monster_steps_to_here == -1:
+            continue  # monster can never reach this cell
+
+        # Collision happens at: max(monster_steps, prey_steps)
+        # If monster arrives first, it waits. If prey arrives first, they pass through.
+        collision_step = max(monster_steps_to_here, step_idx)
+        if collision_step < best_collision_step:
+            best_collision_step = collision_step
+            best_intercept = candidate_pos
+
+    if best_intercept is None:
+        path = [tuple(monster_pos)]
+    else:
+        path = path_from_parents(parent, best_intercept, graph.width)
+    return (path, info) if return_info else path
+
+
+# ==============================================================================
+#  POLICIES  (plan(game, agent) -> (path, info); the agent steps to path[1])
+# ==============================================================================
+class _StoredPlans:
+    """
+    Plan-validity tracking for shortest-path policies.
+
+    Walls never move, so when the target is where it was last tick and the
+    agent took the first step of its last path, the rest of that path is
+    still a shortest path: it is advanced by one cell instead of replanned.
+    """
+
+    def __init__(self):
+        self._plans = {}    # agent -> (game, step_count, path)
+
+    def advance(self, game, agent, start, target):
+        """The stored path minus its first cell if it is still valid, else None."""
+        plan = self._plans.get(agent)
+        if plan is None:
+            return None
+        plan_game, step, path = plan
+        if (plan_game is game and step + 1 == game.step_count and len(path) > 2
+                and path[1] == start and path[-1] == target):
+            return path[1:]
+        return None
+
+    def store(self, game, agent, path):
+        self._plans[agent] = (game, game.step_count, path)
+
+
+class AStarPolicy(_StoredPlans):
+    """
+    Plain A* to the agent's target: the reward for the prey, the prey for the monster.
+
+    With reuse_plans (default) a path whose target has not moved is advanced
+    instead of recomputed (info["plan_reused"]).
+    """
+
+    def __init__(self, reuse_plans=True):
+        super().__init__()
+        self.reuse_plans = reuse_plans
+
+    def plan(self, game, agent):
+        start, target = game.endpoints(agent)
+        if self.reuse_plans:
+            path = self.advance(game, agent, start, target)
+            if path is not None:
+                self.store(game, agent, path)
+                return path, {"nodes_expanded": 0, "plan_reused": True}
+        path, info = get_astar_path(start, target, game.grid, return_info=True)
+        self.store(game, agent, path)
+        return path, info
+
+
+class BoundedAStarPolicy(_StoredPlans):
+    """Depth-bounded A* (utils.get_minimax_path) to the agent's target, reusing plans like AStarPolicy."""
+
+    def __init__(self, depth, reuse_plans=True):
+        super().__init__()
+        self.depth = depth
+        self.reuse_plans = reuse_plans
+
+    def plan(self, game, agent):
+        start, target = game.endpoints(agent)
+        if self.reuse_plans:
+            path = self.advance(game, agent, start, target)
+            if path is not None:
+                self.store(game, agent, path)
+                return path, {"nodes_expanded": 0, "plan_reused": True}
+        path, info = get_minimax_path(start, target, game.grid, depth=self.depth, return_info=True)
+        self.store(game, agent, path)
+        return path, info
+
+
+class MinimaxPolicy:
+    """
+    Alpha-beta minimax for the next move, A* for the rest of the path.
+
+    Without `cache` a fresh table is used every turn. A TranspositionTable
+    passed as `cache` is kept across turns (its size cap bounds memory).
+    With reuse_pv, ticks that follow the last principal variation skip the
+    search (see PrincipalVariation). An OpeningBook built for the same
+    search answers the opening positions it covers.
+    """
+
+    def __init__(self, depth, evaluate=distance_evaluation, opponent=None, cache=None, reuse_pv=False,
+                 book=None):
+        self.depth = depth
+        self.evaluate = evaluate
+        self.opponent = opponent
+        self.keep_cache = cache is not None
+        self.cache = {} if cache is None else cache
+        self.pv = PrincipalVariation() if reuse_pv else None
+        self.book = book
+
+    def plan(self, game, agent):
+        if not self.keep_cache:
+            self.cache.clear()  # Clear cache each turn to stay responsive
+        return minimax_path(game.graph, agent, game.prey_pos, game.monster_pos, game.reward_pos,
+                            self.depth, self.evaluate, self.opponent, self.cache, return_info=True,
+                            pv=self.pv, book=self.book)
+
+
+class InterceptPolicy:
+    """Monster ambush: run to the earliest collision point on the prey's current path."""
+
+    def __init__(self, lookahead=None):
+        self.lookahead = lookahead
+
+    def plan(self, game, agent):
+        return intercept_path(game.graph, game.monster_pos, game.prey_pos, game.prey_path,
+                              self.lookahead, return_info=True)
+
+
+def make_policy(name, depth=None, lookahead=None, time_budget=None):
+    """
+    Build a policy from its GameSimulator name.
+
+      "astar"       - plain A*
+      "minimax"     - depth-bounded A* (get_minimax_path)
+      "adversarial" - alpha-beta minimax against a minimax opponent
+      "evasive"     - alpha-beta minimax against an A*-chasing monster (prey only)
+      "ambush"      - earliest-interception on the prey's path (monster only)
+      "tablebase"   - perfect play from the retrograde tablebase (phase2/retrograde.py)
+      "mcts"        - UCT with batched NumPy playouts, `time_budget` ms per move (phase2/mcts.py)
+      "expectimax"  - expectimax against a softmax opponent model (phase2/expectimax.py)
+    """
+    if name == "astar":
+        return AStarPolicy()
+    if name == "minimax":
+        return BoundedAStarPolicy(depth)
+    if name == "adversarial":
+        return MinimaxPolicy(depth)
+    if name == "evasive":
+        return MinimaxPolicy(depth, opponent=AStarChaseOpponent())
+    if name == "ambush":
+        return InterceptPolicy(lookahead)
+    if name == "tablebase":
+        from phase2.retrograde import TablebasePolicy  # needs NumPy
+        return TablebasePolicy()
+    if name == "mcts":
+        from phase2.mcts import MCTSPolicy, DEFAULT_TIME_BUDGET_MS  # needs NumPy
+        return MCTSPolicy(DEFAULT_TIME_BUDGET_MS if time_budget is None else time_budget)
+    if name == "expectimax":
+        from phase2.expectimax import ExpectimaxPolicy  # needs NumPy
+        return ExpectimaxPolicy(depth)
+    raise ValueError(f"Unknown algorithm: {name}")
+
+
+# ==============================================================================
+#  GAME LOOP
+# ==============================================================================
+class ChaseGame:
+    """
+    Prey runs for the reward, monster chases the prey. Both move once per tick.
+
+    Scenario games subclass this with their policies; compare_algorithms drives
+    it headlessly. Each planning call's nodes_expanded and path length are kept
+    per agent in `nodes_expanded` and `path_lengths`; `replans_avoided` counts
+    the calls that advanced a still-valid path instead of searching, and
+    `latency` holds a histogram of each agent's decision times. With a `recorder`
+    (replay.ReplayRecorder) every tick is also written to a replay file.
+    """
+
+    def __init__(self, grid, prey_start, monster_start, reward_pos, prey_policy, monster_policy,
+                 max_steps=None, recorder=None):
+        self.grid = grid
+        self.graph = grid_graph(grid)
+        self.prey_start = prey_start
+        self.monster_start = monster_start
+        self.reward_pos = list(reward_pos)
+        self.prey_policy = prey_policy
+        self.monster_policy = monster_policy
+        self.max_steps = max_steps       # None = play until someone wins
+        self.recorder = recorder         # replay.ReplayRecorder, or None
+        self.reset()
+
+    def reset(self):
+        self.prey_pos    = list(self.prey_start)
+        self.monster_pos = list(self.monster_start)
+        self.step_count  = 0
+        self.result      = None          # None | "prey" | "monster"
+        self.paused      = False
+        self.nodes_expanded = {PREY: [], MONSTER: []}
+        self.path_lengths   = {PREY: [], MONSTER: []}
+        self.replans_avoided = {PREY: 0, MONSTER: 0}
+        self.latency = {PREY: LatencyHistogram(), MONSTER: LatencyHistogram()}
+
+        # Compute initial paths
+        self.prey_path    = []
+        self.monster_path = []
+        self._update_paths()
+        if self.recorder is not None:
+            self.recorder.start(self)
+
+    def endpoints(self, agent):
+        """(start, target) cells for an agent's path this tick."""
+        if agent == PREY:
+            return tuple(self.prey_pos), tuple(self.reward_pos)
+        return tuple(self.monster_pos), tuple(self.prey_pos)
+
+    def _plan(self, agent):
+        policy = self.prey_policy if agent == PREY else self.monster_policy
+        t0 = time.perf_counter_ns()
+        path, info = policy.plan(self, agent)
+        ns = time.perf_counter_ns() - t0
+        self.latency[agent].record(ns)
+        profiling.add_phase_time("search", ns)
+        self.nodes_expanded[agent].append(info.get("nodes_expanded", 0))
+        if info.get("plan_reused"):
+            self.replans_avoided[agent] += 1
+        if path:
+            self.path_lengths[agent].append(len(path))
+        return path
+
+    def _update_paths(self):
+        """Re-plan both agents. The prey plans first so the monster can read its path."""
+        self.prey_path = self._plan(PREY)
+        self.monster_path = self._plan(MONSTER)
+
+    def tick(self):
+        """Advance the game by one step (both agents move once)."""
+        if self.result or self.paused:
+            return
+        self._advance()
+        if self.recorder is not None:
+            self.recorder.record(self)
+
+    def _advance(self):
+        # [0] is the current position
+        next_prey = list(self.prey_path[1]) if len(self.prey_path) > 1 else self.prey_pos
+        next_monster = list(self.monster_path[1]) if len(self.monster_path) > 1 else self.monster_pos
+
+        # Apply moves
+        self.prey_pos    = next_prey
+        self.monster_pos = next_monster
+        self.step_count += 1
+
+        # Check win / lose conditions
+        if self.prey_pos == self.reward_pos:
+            self.result = PREY
+            return
+
+        if self.monster_pos == self.prey_pos:
+            self.result = MONSTER
+            return
+
+        if self.max_steps is not None and self.step_count >= self.max_steps:
+            return  # timed out, no point planning another move
+
+        # Recalculate paths for next step
+        self._update_paths()
+
+    # -- properties for the UI --
+    @property
+    def timed_out(self):
+        return self.result is None and self.max_steps is not None and self.step_count >= self.max_steps
+
+    @property
+    def prey_dist(self):
+        return max(0, len(self.prey_path) - 1)
+
+    @property
+    def monster_dist(self):
+        return max(0, len(self.monster_path) - 1)
@@ -0,0 +1,88 @@
+"""
+NumPy views of a GridGraph for the vectorized solvers and simulators.
+
+    padded_moves(graph)     (N, 4) successor table + legality mask
+    distance_matrix(graph)  (N, N) maze distance between every pair of cells
+
+Both are built once per graph and cached (the graph itself is cached per grid
+by game_engine.grid_graph), so treat the returned arrays as read-only.
+"""
+
+import sys
+import os
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_PADDED = {}
+_DISTANCES = {}
+
+
+def _cached(cache, graph, build):
+    entry = cache.get(id(graph))
+    if entry is None or entry[0] is not graph:
+        entry = cache[id(graph)] = (graph, build(graph))
+    return entry[1]
+
+
+def _build_padded_moves(graph):
+    n = graph.size
+    offsets = np.asarray(graph.move_offsets, dtype=np.int64)
+    targets = np.asarray(graph.move_targets, dtype=np.int64)
+    degree = np.diff(offsets)
+
+    nbr = np.repeat(np.arange(n, dtype=np.int64)[:, None], 4, axis=1)
+    mask = np.zeros((n, 4), dtype=bool)
+    for k in range(4):
+        has = degree > k
+        nbr[has, k] = targets[offsets[:-1][has] + k]
+        mask[has, k] = True
+
+    open_cells = np.array([cell != 1 for row in graph.grid for cell in row])
+    mask[open_cells & (degree == 0), 0] = True
+    for array in (nbr, mask, open_cells):
+        array.flags.writeable = False
+    return nbr, mask, open_cells
+
+
+def padded_moves(graph):
+    """
+    (nbr, mask, open_cells): successor cells of shape (N, 4) padded with the cell itself.
+
+    Moves keep the Down, Up, Right, Left order of GridGraph.moves. A cell with no
+    legal move gets a single self-loop so a stuck agent passes.
+    """
+    return _cached(_PADDED, graph, _build_padded_moves)
+
+
+def _build_distance_matrix(graph):
+    # Breadth-first search from every cell at once. Moves are symmetric, so
+    # frontier[c, s] (cell c reached from source s) doubles as the result.
+    nbr, mask, open_cells = padded_moves(graph)
+    n = graph.size
+    dist = np.full((n, n), -1, dtype=np.int32)
+    cells = np.flatnonzero(open_cells)
+    frontier = np.zeros((n, n), dtype=bool)
+    frontier[cells, cells] = True
+    unseen = ~frontier
+    dist[cells, cells] = 0
+
+    step = 0
+    while True:
+        step += 1
+        reached = np.zeros((n, n), dtype=bool)
+        for k in range(4):
+            reached |= frontier[nbr[:, k]] & mask[:, k, None]
+        frontier = reached & unseen
+        if not frontier.any():
+            break
+        unseen &= ~frontier
+        dist[frontier] = step
+    dist.flags.writeable = False
+    return dist
+
+
+def distance_matrix(graph):
+    """Maze distance between every pair of cells (int32, -1 if unreachable or a wall)."""
+    return _cached(_DISTANCES, graph, _build_distance_matrix)
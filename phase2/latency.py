@@ -0,0 +1,82 @@
+"""
+Streaming latency histogram with HDR-style log buckets.
+
+Samples (integer nanoseconds, from time.perf_counter_ns) are counted in
+buckets instead of stored: values below 2**SUB_BITS get a bucket each, and
+every power-of-two range above is split into 2**SUB_BITS linear
+sub-buckets. A bucket is therefore within 1 / 2**SUB_BITS (about 3%) of
+every value it holds, memory stays a few hundred counters however many
+samples arrive, and recording is a couple of integer operations. The
+maximum is also tracked exactly.
+"""
+
+import math
+
+SUB_BITS = 5
+SUB = 1 << SUB_BITS
+
+
+def _bucket(value):
+    """Bucket index of a non-negative integer sample."""
+    if value < SUB:
+        return value
+    shift = value.bit_length() - SUB_BITS - 1
+    return ((shift + 1) << SUB_BITS) + (value >> shift) - SUB
+
+
+def _bucket_high(index):
+    """Largest value that falls in a bucket."""
+    if index < SUB:
+        return index
+    shift = (index >> SUB_BITS) - 1
+    low = (SUB + (index & (SUB - 1))) << shift
+    return low + (1 << shift) - 1
+
+
+class LatencyHistogram:
+    """Counts of nanosecond samples in log buckets; percentiles on demand."""
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, ns):
+        b = _bucket(ns)
+        self.counts[b] = self.counts.get(b, 0) + 1
+        self.count += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+
+    def merge(self, other):
+        """Add another histogram's samples to this one."""
+        for b, c in other.counts.items():
+            self.counts[b] = self.counts.get(b, 0) + c
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, q):
+        """Value (ns) at or below which q percent of the samples fall (0 if empty)."""
+        if not self.count:
+            return 0
+        rank = max(1, math.ceil(q / 100 * self.count))
+        seen = 0
+        for b in sorted(self.counts):
+            seen += self.counts[b]
+            if seen >= rank:
+                return min(_bucket_high(b), self.max)
+        return self.max
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def summary_ms(self):
+        """{"mean", "p50", "p90", "p99", "max"} in milliseconds."""
+        summary = {"mean": self.mean / 1e6}
+        summary.update({f"p{q}": self.percentile(q) / 1e6 for q in (50, 90, 99)})
+        summary["max"] = self.max / 1e6
+        return summary
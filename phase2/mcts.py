@@ -0,0 +1,268 @@
+"""
+Monte Carlo Tree Search (UCT) agent for the prey/monster chase.
+
+Same alternating-turn rules as the alpha-beta search in game_engine: prey
+moves, then monster; the prey wins on reaching the reward (checked first),
+the monster wins when both share a cell.
+
+Each iteration walks the tree with UCB1, expands one move and scores the new
+node with a batch of playouts run together in NumPy. Playouts pick, per
+playout and per ply, either a random legal move or the greedy one:
+  prey     maximize (maze distance to monster) - (maze distance to reward)
+  monster  minimize maze distance to prey
+Playouts still running after `rollout_plies` are scored by
+dm / (dm + dr) (dm = monster to prey, dr = prey to reward).
+
+Values are stored from the prey's point of view in [0, 1]; the monster
+picks moves by 1 - value. The move played is the root child with most visits.
+
+Usage: python3 phase2/mcts.py   (MCTS vs alpha-beta at equal time per move)
+"""
+
+import sys
+import os
+import math
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import profiling
+from config import GRID_LARGE, GOAL_POS_LARGE
+from utils import get_astar_path
+from phase2.game_engine import PREY, grid_graph
+from phase2.grid_arrays import padded_moves, distance_matrix
+
+DEFAULT_TIME_BUDGET_MS = 50
+
+
+class _Node:
+    __slots__ = ("prey", "monster", "prey_turn", "terminal", "untried", "children", "visits", "total")
+
+    def __init__(self, prey, monster, prey_turn, terminal, moves):
+        self.prey = prey
+        self.monster = monster
+        self.prey_turn = prey_turn
+        self.terminal = terminal          # None, or the fixed value of a finished game
+        self.untried = list(moves)        # expanded front to back (Down, Up, Right, Left)
+        self.children = []                # [(move, _Node)]
+        self.visits = 0
+        self.total = 0.0                  # sum of prey-side values
+
+
+class MCTS:
+    """UCT search over one grid and reward cell."""
+
+    def __init__(self, graph, reward, batch=64, greedy=0.8, rollout_plies=12,
+                 exploration=1.4, seed=None):
+        self.graph = graph
+        self.reward = reward
+        self.batch = batch
+        self.greedy = greedy
+        self.rollout_plies = rollout_plies
+        self.exploration = exploration
+        self.rng = np.random.default_rng(seed)
+        self.nbr, self.mask, _ = padded_moves(graph)
+        self.dist = distance_matrix(graph)
+        self.far = graph.size          # stands in for unreachable distances
+        self.nodes = 0
+        self.playouts = 0
+
+    # -- tree --------------------------------------------------------------
+    def _node(self, prey, monster, prey_turn):
+        self.nodes += 1
+        if prey == self.reward:
+            return _Node(prey, monster, prey_turn, 1.0, ())
+        if prey == monster:
+            return _Node(prey, monster, prey_turn, 0.0, ())
+        mover = prey if prey_turn else monster
+        moves = self.graph.moves[mover] or (mover,)     # a stuck agent passes
+        return _Node(prey, monster, prey_turn, None, moves)
+
+    def _select(self, node):
+        log_n = math.log(node.visits)
+        best, best_ucb = None, -math.inf
+        for _, child in node.children:
+            mean = child.total / child.visits
+            q = mean if node.prey_turn else 1.0 - mean
+            ucb = q + self.exploration * math.sqrt(log_n / child.visits)
+            if ucb > best_ucb:
+                best, best_ucb = child, ucb
+        return best
+
+    def best_move(self, prey, monster, prey_turn, time_budget_ms=DEFAULT_TIME_BUDGET_MS,
+                  iterations=None):
+        """
+        Search from a position (cell indices) until the time budget or iteration cap runs out.
+
+        Returns (move, value): the most visited root move (None if the game is
+        over) and its mean prey-side value.
+        """
+        root = self._node(prey, monster, prey_turn)
+        if root.terminal is not None:
+            return None, root.terminal
+
+        deadline = None if time_budget_ms is None else time.perf_counter() + time_budget_ms / 1000
+        done = 0
+        while True:
+            self._iterate(root)
+            done += 1
+            if iterations is not None and done >= iterations:
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+
+        move, child = max(root.children, key=lambda mc: mc[1].visits)
+        return move, child.total / child.visits
+
+    def _iterate(self, root):
+        node, path = root, [root]
+        while node.terminal is None and not node.untried:
+            node = self._select(node)
+            path.append(node)
+
+        if node.terminal is None:
+            move = node.untried.pop(0)
+            if node.prey_turn:
+                child = self._node(move, node.monster, False)
+            else:
+                child = self._node(node.prey, move, True)
+            node.children.append((move, child))
+            node = child
+            path.append(node)
+
+        value = node.terminal if node.terminal is not None else self._rollout(node)
+        for n in path:
+            n.visits += 1
+            n.total += value
+
+    # -- playouts ----------------------------------------------------------
+    def _rollout(self, node):
+        """Mean prey-side value of `batch` simultaneous playouts from a node."""
+        b = self.batch
+        nbr, mask, dist, far, rng = self.nbr, self.mask, self.dist, self.far, self.rng
+        prey = np.full(b, node.prey, dtype=np.int64)
+        monster = np.full(b, node.monster, dtype=np.int64)
+        value = np.full(b, np.nan)
+        live = np.arange(b)
+        prey_turn = node.prey_turn
+
+        for _ in range(self.rollout_plies):
+            p, m = prey[live], monster[live]
+            mover = p if prey_turn else m
+            cand = nbr[mover]                                   # (L, 4)
+            legal = mask[mover]
+
+            # Greedy: distance-based one-ply choice, first best in move order
+            if prey_turn:
+                d_monster = dist[cand, m[:, None]]
+                d_reward = dist[self.reward][cand]
+                score = np.where(d_monster < 0, far, d_monster) - np.where(d_reward < 0, far, d_reward)
+            else:
+                d_prey = dist[cand, p[:, None]]
+                score = -np.where(d_prey < 0, far, d_prey)
+            score = np.where(legal, score, -4 * far)
+            greedy_pick = score.argmax(axis=1)
+
+            # Random: uniform over legal moves
+            noise = np.where(legal, rng.random(legal.shape), -1.0)
+            random_pick = noise.argmax(axis=1)
+
+            pick = np.where(rng.random(len(live)) < self.greedy, greedy_pick, random_pick)
+            step = cand[np.arange(len(live)), pick]
+            if prey_turn:
+                p = prey[live] = step
+            else:
+                m = monster[live] = step
+
+            won = p == self.reward
+            caught = (p == m) & ~won
+            value[live[won]] = 1.0
+            value[live[caught]] = 0.0
+            live = live[~(won | caught)]
+            if live.size == 0:
+                break
+            prey_turn = not prey_turn
+
+        if live.size:
+            p, m = prey[live], monster[live]
+            dm = dist[m, p].astype(float)
+            dr = dist[p, self.reward].astype(float)
+            dm[dm < 0] = far
+            dr[dr < 0] = far
+            value[live] = dm / (dm + dr)
+
+        self.playouts += b
+        return float(value.mean())
+
+
+class MCTSPolicy:
+    """MCTS for the next move under a per-move time budget, A* for the rest of the path."""
+
+    def __init__(self, time_budget_ms=DEFAULT_TIME_BUDGET_MS, iterations=None, batch=64,
+                 greedy=0.8, seed=0):
+        self.time_budget_ms = time_budget_ms
+        self.iterations = iterations
+        self.batch = batch
+        self.greedy = greedy
+        self.seed = seed
+        self.search = None
+
+    def plan(self, game, agent):
+        graph = game.graph
+        reward = graph.index(game.reward_pos)
+        search = self.search
+        if search is None or search.graph is not graph or search.reward != reward:
+            search = self.search = MCTS(graph, reward, self.batch, self.greedy, seed=self.seed)
+
+        start, target = game.endpoints(agent)
+        nodes_before = search.nodes
+        move, value = search.best_move(graph.index(game.prey_pos), graph.index(game.monster_pos),
+                                       agent == PREY, self.time_budget_ms, self.iterations)
+        if move is not None:
+            next_pos = graph.position(move)
+            tail = get_astar_path(next_pos, target, game.grid)
+            path = [start] + tail if tail else [start, next_pos]
+        else:
+            path = get_astar_path(start, target, game.grid) or [start]
+        return path, {"nodes_expanded": search.nodes - nodes_before, "score": value}
+
+
+# ==============================================================================
+#  STRENGTH PER CPU-MILLISECOND
+# ==============================================================================
+MATCHUPS = [
+    # (label, algorithm, depth, time budget ms)
+    ("minimax d=3", "adversarial", 3, None),
+    ("minimax d=6", "adversarial", 6, None),
+    ("MCTS 10ms", "mcts", None, 10),
+    ("MCTS 50ms", "mcts", None, 50),
+]
+OPPONENTS = [("A*", "astar", None), ("minimax d=3", "adversarial", 3)]
+
+
+def main():
+    from phase2.compare_algorithms import GameSimulator
+
+    grid_graph(GRID_LARGE)
+    print(f"Prey agents on GRID_LARGE, reward {tuple(GOAL_POS_LARGE)}, 300-step limit\n")
+    print(f"{'prey':<12} | {'monster':<12} | {'result':<8} | {'steps':>5} | {'ms/move':>8} | {'prey nodes':>10}")
+    print("-" * 70)
+    for label, algorithm, depth, budget in MATCHUPS:
+        for opp_label, opp_algorithm, opp_depth in OPPONENTS:
+            sim = GameSimulator(
+                f"{label} vs {opp_label}", algorithm, opp_algorithm,
+                prey_depth=depth, monster_depth=opp_depth,
+                prey_time_budget=budget, max_steps=300,
+            )
+            m = sim.run()
+            ms_per_move = 1000 * m.computation_time / max(1, m.total_path_calls)
+            result = m.winner.upper() if m.winner else "TIMEOUT"
+            print(f"{label:<12} | {opp_label:<12} | {result:<8} | {m.steps_to_end:>5} | "
+                  f"{ms_per_move:>8.2f} | {m.prey_nodes_expanded:>10}")
+
+
+if __name__ == "__main__":
+    profiling.install()
+    main()
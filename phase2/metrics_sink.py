@@ -0,0 +1,136 @@
+"""
+Streaming GameMetrics export for long experiment runs.
+
+MetricsSink appends one record per finished game to a JSONL or CSV file
+(chosen by the file suffix) and writes them out in batches, so memory stays
+flat however many games run. Records carry the game's seed; reopening a
+file reads back the (scenario, seed) keys already in it, so an interrupted
+run can resume by skipping them. A half-written last line from a crash is
+cut off before appending. A CSV is only resumed with records of the same
+columns: ValueError otherwise, since its header cannot change mid-file.
+
+Output files of the phase2 scripts go to output_dir(): the --output-dir
+option where a script has one, else $PHASE2_OUTPUT_DIR, else phase2/.
+"""
+
+import os
+import csv
+import json
+from dataclasses import asdict
+
+OUTPUT_DIR_ENV = "PHASE2_OUTPUT_DIR"
+DEFAULT_OUTPUT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def output_dir(override=None):
+    """Directory for generated files (created if missing)."""
+    path = override or os.environ.get(OUTPUT_DIR_ENV) or DEFAULT_OUTPUT_DIR
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def output_path(name, override=None):
+    """`name` inside output_dir(override); absolute names are returned as given."""
+    return name if os.path.isabs(name) else os.path.join(output_dir(override), name)
+
+
+def _drop_partial_line(path):
+    """Cut a file back to its last complete line."""
+    with open(path, "rb+") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        if size == 0:
+            return
+        f.seek(size - 1)
+        if f.read(1) == b"\n":
+            return
+        chunk = min(size, 1 << 16)
+        while True:
+            f.seek(size - chunk)
+            cut = f.read(chunk).rfind(b"\n")
+            if cut >= 0 or chunk == size:
+                break
+            chunk = min(size, chunk * 2)
+        f.truncate(size - chunk + cut + 1 if cut >= 0 else 0)
+
+
+class MetricsSink:
+    """Append-only JSONL/CSV writer for GameMetrics with batched flushes and resume keys."""
+
+    def __init__(self, path, flush_every=100):
+        self.path = path
+        self.format = "csv" if path.endswith(".csv") else "jsonl"
+        self.flush_every = flush_every
+        self.written = 0
+        self._buffer = []
+
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        if exists:
+            _drop_partial_line(path)
+        self.completed = self._read_keys() if exists else set()
+        self._file = open(path, "a", newline="")
+        self._writer = None
+        self._header = None
+        if self.format == "csv" and exists:
+            with open(path, newline="") as f:
+                self._header = next(csv.reader(f), None)
+            if self._header:
+                self._writer = csv.DictWriter(self._file, fieldnames=self._header)
+
+    def _read_keys(self):
+        keys = set()
+        with open(self.path, newline="") as f:
+            if self.format == "csv":
+                rows = csv.DictReader(f)
+            else:
+                rows = (json.loads(line) for line in f if line.strip())
+            for row in rows:
+                seed = row.get("seed")
+                keys.add((row["scenario_name"], int(seed) if seed not in (None, "") else None))
+        return keys
+
+    def done(self, scenario_name, seed):
+        """True if the file held this (scenario, seed) game when it was opened."""
+        return (scenario_name, seed) in self.completed
+
+    def write(self, metrics, seed=None):
+        """Queue one game's metrics; the batch is written every `flush_every` records."""
+        row = dict(seed=seed, **asdict(metrics))
+        if self._header and set(row) != set(self._header):
+            missing = sorted(set(self._header) - set(row))
+            extra = sorted(set(row) - set(self._header))
+            raise ValueError(
+                f"Cannot resume {self.path}: its header does not match these records "
+                f"(new columns: {', '.join(extra) or 'none'}; missing: {', '.join(missing) or 'none'}). "
+                f"Write to a new file or move the old one aside."
+            )
+        self._buffer.append(row)
+        if len(self._buffer) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+        if self.format == "csv":
+            if self._writer is None:        # new file: the header comes from the first record
+                self._writer = csv.DictWriter(self._file, fieldnames=list(self._buffer[0]))
+                self._writer.writeheader()
+            self._writer.writerows(self._buffer)
+        else:
+            self._file.writelines(json.dumps(row) + "\n" for row in self._buffer)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.written += len(self._buffer)
+        self._buffer = []
+
+    def close(self):
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -6,6 +6,7 @@ import time
 # -- resolve parent directory so we can import config & utils --
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import profiling
 from config import (
     TILE_SIZE_LARGE,        # pixel size of each tile  (e.g. 20)
     GRID_WIDTH_LARGE,       # number of columns        (e.g. 30)
@@ -18,7 +19,11 @@ from config import (
     PLAYER_START_POS_LARGE, # [col, row] start for the prey
     GOAL_POS_LARGE,         # [col, row] for the reward
 )
-from utils import get_astar_path
+from phase2.game_engine import (
+    grid_graph, AdversarialSearch, PathFollowerOpponent, ChaseGame, AStarPolicy, InterceptPolicy,
+    chase_evaluation, intercept_path,
+)
+from phase2.replay import scenario_game
 
 # ==============================================================================
 #  GAME-SPECIFIC COLOURS
@@ -43,6 +48,7 @@ reward_pos   = list(GOAL_POS_LARGE)
 # ==============================================================================
 MONSTER_MINIMAX_DEPTH = 8  # How many moves ahead monster looks (increased for better strategy)
 PREY_LOOKAHEAD = 8  # How far the monster looks into the prey's predicted path
+EXPECTIMAX_MONSTER = False  # True: expectimax against a softmax prey model instead of the ambush
 
 # ==============================================================================
 #  SPEED CONTROLS
@@ -155,191 +161,57 @@ def draw_panel(surface, width, step, prey_dist, monster_dist, result=None, strat
 
 
 # ==============================================================================
-#  MINIMAX EVALUATION FUNCTION FOR MONSTER
+#  MINIMAX SEARCH FOR AMBUSH MONSTER
 # ==============================================================================
-def evaluate_board_for_monster(monster_pos, prey_pos, reward_pos):
-    """
-    Simple evaluation: distance from monster to prey.
-    Monster MINIMIZES this - gets close to prey.
-    """
-    dist_monster_to_prey = abs(monster_pos[0] - prey_pos[0]) + abs(monster_pos[1] - prey_pos[1])
-    return dist_monster_to_prey
+# The monster minimizes game_engine.chase_evaluation (distance from monster to
+# prey) while the prey is modeled as walking its predicted A* path.
 
 
-# ==============================================================================
-#  MINIMAX SEARCH FOR AMBUSH MONSTER
-# ==============================================================================
 def minimax_ambush_monster(monster_pos, prey_pos, reward_pos, depth, grid, prey_path_lookahead):
     """
     Minimax search for predatory monster.
-    Monster minimizes: (distance of prey to reward) - (distance of monster to prey)
+    Monster minimizes the distance to the prey.
     Prey modeled as following A* to reward
     """
-    if depth == 0:
-        score = evaluate_board_for_monster(monster_pos, prey_pos, reward_pos)
-        return [], score
-    
-    # Check if monster caught prey
-    if monster_pos == prey_pos:
-        return [monster_pos], float('-inf')
-    
-    # Generate valid moves for monster
-    valid_moves = []
-    for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-        nx, ny = monster_pos[0] + dx, monster_pos[1] + dy
-        if 0 <= nx < GRID_WIDTH_LARGE and 0 <= ny < GRID_HEIGHT_LARGE:
-            if grid[ny][nx] != 1:
-                valid_moves.append((nx, ny))
-    
-    if not valid_moves:
-        score = evaluate_board_for_monster(monster_pos, prey_pos, reward_pos)
-        return [monster_pos], score
-    
-    best_move = None
-    best_score = float('inf')
-    
-    for move in valid_moves:
-        # Simulate prey continuing toward reward
-        # Look ahead in the prey's predicted path
-        simulated_prey = prey_pos
-        if len(prey_path_lookahead) > min(depth, PREY_LOOKAHEAD):
-            simulated_prey = prey_path_lookahead[min(depth, PREY_LOOKAHEAD)]
-        elif len(prey_path_lookahead) > 1:
-            simulated_prey = prey_path_lookahead[-1]
-        
-        # Recursive call
-        _, score = minimax_ambush_monster(move, simulated_prey, reward_pos, depth - 1, grid, 
-                                         prey_path_lookahead)
-        
-        if score < best_score:  # Monster MINIMIZES
-            best_score = score
-            best_move = move
-    
-    if best_move is None:
-        best_move = valid_moves[0]
-    
-    return [best_move], best_score
+    graph = grid_graph(grid)
+    opponent = PathFollowerOpponent([graph.index(p) for p in prey_path_lookahead], PREY_LOOKAHEAD)
+    search = AdversarialSearch(graph, None, chase_evaluation, opponent=opponent)
+    move, score = search.best_move(graph.index(prey_pos), graph.index(monster_pos), depth, False)
+    if move is None:
+        return [tuple(monster_pos)], score
+    return [graph.position(move)], score
 
 
 def find_ambush_monster_path(monster_pos, prey_pos, reward_pos, grid, prey_predicted_path):
     """
-    Monster uses TRUE predictive interception with actual A* calculation.
-    
-    Instead of just estimating, the monster actually calculates A* distances
-    to candidate points on the prey's path and finds the EARLIEST collision point.
-    This is a true tactical advantage - the monster beats the prey to a point
-    on the prey's own path, achieving an "ambush" interception.
+    Monster uses TRUE predictive interception with exact shortest-path distances.
+
+    A single BFS from the monster gives its distance to every cell, so every
+    point on the prey's predicted path is scored and the EARLIEST collision
+    point wins. This is a true tactical advantage - the monster beats the prey
+    to a point on the prey's own path, achieving an "ambush" interception.
     """
-    
-    if not prey_predicted_path or len(prey_predicted_path) < 2:
-        # Fallback to direct A* chase if no path data
-        return get_astar_path(tuple(monster_pos), tuple(prey_pos), grid)
-    
-    # Find the point on prey's path where monster can intercept EARLIEST
-    best_intercept = tuple(prey_predicted_path[-1])  # fallback to reward
-    best_collision_step = float('inf')
-    
-    # Sample prey's path at regular intervals (every 3 steps for efficiency)
-    sample_step = 3
-    
-    for step_idx in range(0, min(30, len(prey_predicted_path)), sample_step):
-        candidate_pos = prey_predicted_path[step_idx]
-        
-        # How many steps until prey reaches this point?
-        prey_steps_to_here = step_idx
-        
-        # How many steps for monster to reach this point? (actual A* distance)
-        monster_path = get_astar_path(
-            tuple(monster_pos), tuple(candidate_pos), grid
-        )
-        monster_steps_to_here = len(monster_path) - 1
-        
-        # Collision happens at: max(monster_steps, prey_steps)
-        # If monster arrives first, it waits. If prey arrives first, they pass through.
-        collision_step = max(monster_steps_to_here, prey_steps_to_here)
-        
-        # Pick the interception point with EARLIEST collision
-        if collision_step < best_collision_step:
-            best_collision_step = collision_step
-            best_intercept = tuple(candidate_pos)
-    
-    # Calculate path to the optimal interception point
-    path = get_astar_path(tuple(monster_pos), best_intercept, grid)
-    return path if path else [tuple(monster_pos)]
+    return intercept_path(grid_graph(grid), monster_pos, prey_pos, prey_predicted_path)
 
 
 # ==============================================================================
 #  GAME STATE
 # ==============================================================================
-class AmbushMonsterGame:
+class AmbushMonsterGame(ChaseGame):
     """Game with A* prey and minimax ambush monster."""
 
     def __init__(self):
-        self.reset()
-
-    def reset(self):
-        self.prey_pos    = list(prey_start)
-        self.monster_pos = list(monster_start)
-        self.step_count  = 0
-        self.result      = None
-        self.paused      = False
-        self.prey_path   = []
-        self.monster_path = []
-        self._update_paths()
-
-    def _update_paths(self):
-        """Update both agents' paths."""
-        # Prey using simple A*
-        self.prey_path = get_astar_path(
-            tuple(self.prey_pos), tuple(reward_pos), GRID_LARGE
-        )
-
-        # Monster using minimax with knowledge of prey's likely path
-        monster_next = find_ambush_monster_path(
-            self.monster_pos, self.prey_pos, reward_pos, GRID_LARGE, self.prey_path
-        )
-        self.monster_path = monster_next if monster_next else [self.monster_pos]
-
-    def tick(self):
-        """Advance the game by one step."""
-        if self.result or self.paused:
-            return
-
-        # Prey moves
-        if len(self.prey_path) > 1:
-            next_prey = list(self.prey_path[1])
-        else:
-            next_prey = self.prey_pos
-
-        # Monster moves
-        if len(self.monster_path) > 1:
-            next_monster = list(self.monster_path[1])
+        if EXPECTIMAX_MONSTER:
+            from phase2.expectimax import ExpectimaxPolicy
+            monster_policy = ExpectimaxPolicy(MONSTER_MINIMAX_DEPTH, chase_evaluation)
         else:
-            next_monster = self.monster_pos
-
-        self.prey_pos    = next_prey
-        self.monster_pos = next_monster
-        self.step_count += 1
-
-        # Check win conditions
-        if self.prey_pos == reward_pos:
-            self.result = "prey"
-            return
-
-        if self.monster_pos == self.prey_pos:
-            self.result = "monster"
-            return
-
-        # Recalculate paths
-        self._update_paths()
-
-    @property
-    def prey_dist(self):
-        return max(0, len(self.prey_path) - 1)
-
-    @property
-    def monster_dist(self):
-        return max(0, len(self.monster_path) - 1)
+            # Monster uses knowledge of prey's likely path
+            monster_policy = InterceptPolicy()
+        super().__init__(
+            GRID_LARGE, prey_start, monster_start, reward_pos,
+            prey_policy=AStarPolicy(),
+            monster_policy=monster_policy,
+        )
 
 
 # ==============================================================================
@@ -353,7 +225,7 @@ def main():
     pygame.display.set_caption("Freeze Tag  |  Prey (A*) vs Monster (MINIMAX - Ambush)")
     clock  = pygame.time.Clock()
 
-    game         = AmbushMonsterGame()
+    game         = scenario_game(AmbushMonsterGame, GRID_LARGE)   # --replay FILE / --record FILE
     frame_count  = 0
     end_display  = None
 
@@ -384,24 +256,26 @@ def main():
                 pygame.quit(); sys.exit()
 
         # Drawing
-        screen.fill(BG_COLOR)
-        draw_grid(screen, GRID_LARGE)
+        with profiling.phase("render"):
+            screen.fill(BG_COLOR)
+            draw_grid(screen, GRID_LARGE)
 
-        draw_path(screen, game.prey_path,    PREY_COLOR,    width=2)
-        draw_path(screen, game.monster_path, MONSTER_COLOR, width=2)
+            draw_path(screen, game.prey_path,    PREY_COLOR,    width=2)
+            draw_path(screen, game.monster_path, MONSTER_COLOR, width=2)
 
-        draw_reward(screen, reward_pos)
+            draw_reward(screen, game.reward_pos)
 
-        draw_agent(screen, game.prey_pos,    PREY_COLOR,    "P")
-        draw_agent(screen, game.monster_pos, MONSTER_COLOR, "M")
+            draw_agent(screen, game.prey_pos,    PREY_COLOR,    "P")
+            draw_agent(screen, game.monster_pos, MONSTER_COLOR, "M")
 
-        draw_panel(screen, W, game.step_count,
-                   game.prey_dist, game.monster_dist,
-                   result=game.result)
+            draw_panel(screen, W, game.step_count,
+                       game.prey_dist, game.monster_dist,
+                       result=game.result)
 
-        pygame.display.flip()
+            pygame.display.flip()
         clock.tick(FPS)
 
 
 if __name__ == "__main__":
+    profiling.install()
     main()
@@ -6,6 +6,7 @@ import time
 # -- resolve parent directory so we can import config & utils --
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import profiling
 from config import (
     TILE_SIZE_LARGE,        # pixel size of each tile  (e.g. 20)
     GRID_WIDTH_LARGE,       # number of columns        (e.g. 30)
@@ -18,7 +19,11 @@ from config import (
     PLAYER_START_POS_LARGE, # [col, row] start for the prey
     GOAL_POS_LARGE,         # [col, row] for the reward
 )
-from utils import get_astar_path
+from phase2.game_engine import (
+    PREY, MONSTER, grid_graph, AdversarialSearch, ChaseGame, MinimaxPolicy,
+    distance_evaluation, minimax_path, TranspositionTable, PrincipalVariation,
+)
+from phase2.replay import scenario_game
 
 # ==============================================================================
 #  GAME-SPECIFIC COLOURS
@@ -43,6 +48,11 @@ reward_pos   = list(GOAL_POS_LARGE)
 # ==============================================================================
 PREY_MINIMAX_DEPTH = 3      # Prey looks 3 moves ahead (maximizer)
 MONSTER_MINIMAX_DEPTH = 3   # Monster looks 3 moves ahead (minimizer)
+PARALLEL_WORKERS = 0        # > 0 splits each root search across this many processes
+REUSE_PRINCIPAL_VARIATION = False  # True: skip the search on ticks that follow the last plan
+MINIMAX_CACHE_ENTRIES = 200_000  # transposition table cap per search (~50 MB)
+EXPECTIMAX_MODE = False     # True: each side plans against a softmax model of the other
+OPENING_BOOK = False        # True: the first ticks come from a precomputed book (phase2/opening_book.py)
 
 # ==============================================================================
 #  SPEED CONTROLS
@@ -158,231 +168,81 @@ def draw_panel(surface, width, step, prey_dist, monster_dist, result=None):
     surface.blit(ctrl, ctrl.get_rect(center=(width // 2, 72)))
 
 
-# ==============================================================================
-#  EVALUATION FUNCTION (SHARED BY BOTH PLAYERS)
-# ==============================================================================
-def evaluate_board(prey_pos, monster_pos, reward_pos):
-    """
-    Evaluation function for adversarial minimax.
-    
-    Score = (Distance from Prey to Monster) - (Distance from Prey to Reward)
-    
-    Prey (maximizer) wants HIGH score: far from monster, close to reward
-    Monster (minimizer) wants LOW score: close to prey, prey far from reward
-    """
-    dist_to_monster = abs(prey_pos[0] - monster_pos[0]) + abs(prey_pos[1] - monster_pos[1])
-    dist_to_reward = abs(prey_pos[0] - reward_pos[0]) + abs(prey_pos[1] - reward_pos[1])
-    
-    score = dist_to_monster - dist_to_reward
-    return score
-
-
 # ==============================================================================
 #  MINIMAX ALGORITHM (TRUE ADVERSARIAL)
 # ==============================================================================
-_minimax_cache = {}
+# Both players share game_engine.distance_evaluation:
+#   Score = (Distance from Prey to Monster) - (Distance from Prey to Reward)
+# Prey (maximizer) wants HIGH score, Monster (minimizer) wants LOW score.
+# Kept across turns (it empties itself when the grid or reward changes);
+# the entry cap keeps memory flat over long games
+_minimax_cache = TranspositionTable(MINIMAX_CACHE_ENTRIES)
+_prey_pv = PrincipalVariation()
+_monster_pv = PrincipalVariation()
+
 
 def minimax_both_players(prey_pos, monster_pos, reward_pos, depth, is_prey_turn, grid):
     """
-    True adversarial minimax with alternating turns.
-    
+    True adversarial minimax with alternating turns (alpha-beta, see game_engine).
+
     Prey (maximizer):   Picks move that maximizes score
     Monster (minimizer): Picks move that minimizes score
     """
-    cache_key = (prey_pos, monster_pos, reward_pos, depth, is_prey_turn)
-    if cache_key in _minimax_cache:
-        return _minimax_cache[cache_key]
-    
-    # Terminal conditions
-    if depth == 0:
-        score = evaluate_board(prey_pos, monster_pos, reward_pos)
-        result = ([], score)
-        _minimax_cache[cache_key] = result
-        return result
-    
-    if prey_pos == tuple(reward_pos):
-        result = ([prey_pos], float('inf'))
-        _minimax_cache[cache_key] = result
-        return result
-    
-    if prey_pos == monster_pos:
-        result = ([prey_pos], float('-inf'))
-        _minimax_cache[cache_key] = result
-        return result
-    
-    # Generate valid moves
-    if is_prey_turn:
-        valid_moves = []
-        for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-            nx, ny = prey_pos[0] + dx, prey_pos[1] + dy
-            if 0 <= nx < GRID_WIDTH_LARGE and 0 <= ny < GRID_HEIGHT_LARGE:
-                if grid[ny][nx] != 1:
-                    valid_moves.append((nx, ny))
-        
-        if not valid_moves:
-            score = evaluate_board(prey_pos, monster_pos, reward_pos)
-            result = ([prey_pos], score)
-            _minimax_cache[cache_key] = result
-            return result
-        
-        # PREY IS MAXIMIZER
-        best_move = None
-        best_score = float('-inf')
-        
-        for move in valid_moves:
-            # Prey moves, then monster responds
-            _, score = minimax_both_players(move, monster_pos, reward_pos, depth - 1, False, grid)
-            
-            if score > best_score:
-                best_score = score
-                best_move = move
-        
-        if best_move is None:
-            best_move = valid_moves[0]
-        
-        result = ([best_move], best_score)
-        _minimax_cache[cache_key] = result
-        return result
-    
-    else:
-        # MONSTER'S TURN
-        valid_moves = []
-        for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-            nx, ny = monster_pos[0] + dx, monster_pos[1] + dy
-            if 0 <= nx < GRID_WIDTH_LARGE and 0 <= ny < GRID_HEIGHT_LARGE:
-                if grid[ny][nx] != 1:
-                    valid_moves.append((nx, ny))
-        
-        if not valid_moves:
-            score = evaluate_board(prey_pos, monster_pos, reward_pos)
-            result = ([monster_pos], score)
-            _minimax_cache[cache_key] = result
-            return result
-        
-        # MONSTER IS MINIMIZER
-        best_move = None
-        best_score = float('inf')
-        
-        for move in valid_moves:
-            # Monster moves, then prey responds
-            _, score = minimax_both_players(prey_pos, move, reward_pos, depth - 1, True, grid)
-            
-            if score < best_score:
-                best_score = score
-                best_move = move
-        
-        if best_move is None:
-            best_move = valid_moves[0]
-        
-        result = ([best_move], best_score)
-        _minimax_cache[cache_key] = result
-        return result
+    graph = grid_graph(grid)
+    search = AdversarialSearch(graph, graph.index(reward_pos), distance_evaluation, cache=_minimax_cache)
+    move, score = search.best_move(graph.index(prey_pos), graph.index(monster_pos), depth, is_prey_turn)
+    if move is None:
+        return [tuple(prey_pos) if is_prey_turn else tuple(monster_pos)], score
+    return [graph.position(move)], score
 
 
 def find_prey_minimax_move(prey_pos, monster_pos, reward_pos, grid):
     """Find next move for prey using minimax."""
-    _minimax_cache.clear()
-    path, _ = minimax_both_players(tuple(prey_pos), tuple(monster_pos), tuple(reward_pos),
-                                   PREY_MINIMAX_DEPTH, True, grid)
-    
-    if path and len(path) > 0:
-        next_pos = path[0]
-        full_path = get_astar_path(tuple(next_pos), tuple(reward_pos), grid)
-        if full_path:
-            return [tuple(prey_pos)] + full_path
-        else:
-            return [tuple(prey_pos), next_pos]
-    
-    return get_astar_path(tuple(prey_pos), tuple(reward_pos), grid)
+    return minimax_path(grid_graph(grid), PREY, prey_pos, monster_pos, reward_pos,
+                        PREY_MINIMAX_DEPTH, cache=_minimax_cache,
+                        pv=_prey_pv if REUSE_PRINCIPAL_VARIATION else None)
 
 
 def find_monster_minimax_move(prey_pos, monster_pos, reward_pos, grid):
     """Find next move for monster using minimax."""
-    _minimax_cache.clear()
-    path, _ = minimax_both_players(tuple(prey_pos), tuple(monster_pos), tuple(reward_pos),
-                                   MONSTER_MINIMAX_DEPTH, False, grid)
-    
-    if path and len(path) > 0:
-        next_pos = path[0]
-        # Monster will chase towards prey
-        full_path = get_astar_path(tuple(next_pos), tuple(prey_pos), grid)
-        if full_path:
-            return [tuple(monster_pos)] + full_path
-        else:
-            return [tuple(monster_pos), next_pos]
-    
-    return get_astar_path(tuple(monster_pos), tuple(prey_pos), grid)
+    return minimax_path(grid_graph(grid), MONSTER, prey_pos, monster_pos, reward_pos,
+                        MONSTER_MINIMAX_DEPTH, cache=_minimax_cache,
+                        pv=_monster_pv if REUSE_PRINCIPAL_VARIATION else None)
 
 
 # ==============================================================================
 #  GAME STATE
 # ==============================================================================
-class BothPlayersMinimaxGame:
+class BothPlayersMinimaxGame(ChaseGame):
     """Game with both prey and monster using adversarial minimax."""
 
     def __init__(self):
-        self.reset()
-
-    def reset(self):
-        self.prey_pos    = list(prey_start)
-        self.monster_pos = list(monster_start)
-        self.step_count  = 0
-        self.result      = None
-        self.paused      = False
-        self.prey_path   = []
-        self.monster_path = []
-        self._update_paths()
-
-    def _update_paths(self):
-        """Update both agents' paths using minimax."""
-        # Prey using minimax (maximizer)
-        prey_next = find_prey_minimax_move(self.prey_pos, self.monster_pos, reward_pos, GRID_LARGE)
-        self.prey_path = prey_next if prey_next else [self.prey_pos]
-
-        # Monster using minimax (minimizer)
-        monster_next = find_monster_minimax_move(self.prey_pos, self.monster_pos, reward_pos, GRID_LARGE)
-        self.monster_path = monster_next if monster_next else [self.monster_pos]
-
-    def tick(self):
-        """Advance the game by one step."""
-        if self.result or self.paused:
-            return
-
-        # Prey moves
-        if len(self.prey_path) > 1:
-            next_prey = list(self.prey_path[1])
-        else:
-            next_prey = self.prey_pos
-
-        # Monster moves
-        if len(self.monster_path) > 1:
-            next_monster = list(self.monster_path[1])
+        if EXPECTIMAX_MODE:
+            from phase2.expectimax import ExpectimaxPolicy
+            prey_policy = ExpectimaxPolicy(PREY_MINIMAX_DEPTH)
+            monster_policy = ExpectimaxPolicy(MONSTER_MINIMAX_DEPTH)
+        elif PARALLEL_WORKERS > 0:
+            from phase2.parallel_search import ParallelMinimaxPolicy
+            prey_policy = ParallelMinimaxPolicy(PREY_MINIMAX_DEPTH, PARALLEL_WORKERS)
+            monster_policy = ParallelMinimaxPolicy(MONSTER_MINIMAX_DEPTH, PARALLEL_WORKERS)
         else:
-            next_monster = self.monster_pos
-
-        self.prey_pos    = next_prey
-        self.monster_pos = next_monster
-        self.step_count += 1
-
-        # Check win conditions
-        if self.prey_pos == reward_pos:
-            self.result = "prey"
-            return
-
-        if self.monster_pos == self.prey_pos:
-            self.result = "monster"
-            return
-
-        # Recalculate paths
-        self._update_paths()
-
-    @property
-    def prey_dist(self):
-        return max(0, len(self.prey_path) - 1)
-
-    @property
-    def monster_dist(self):
-        return max(0, len(self.monster_path) - 1)
+            prey_book = monster_book = None
+            if OPENING_BOOK:
+                from phase2.opening_book import load_or_build
+                prey_book = load_or_build(GRID_LARGE, reward_pos, prey_start, monster_start, PREY_MINIMAX_DEPTH)
+                monster_book = load_or_build(GRID_LARGE, reward_pos, prey_start, monster_start,
+                                             MONSTER_MINIMAX_DEPTH)
+            prey_policy = MinimaxPolicy(PREY_MINIMAX_DEPTH,          # maximizer
+                                        cache=TranspositionTable(MINIMAX_CACHE_ENTRIES),
+                                        reuse_pv=REUSE_PRINCIPAL_VARIATION, book=prey_book)
+            monster_policy = MinimaxPolicy(MONSTER_MINIMAX_DEPTH,    # minimizer
+                                           cache=TranspositionTable(MINIMAX_CACHE_ENTRIES),
+                                           reuse_pv=REUSE_PRINCIPAL_VARIATION, book=monster_book)
+        super().__init__(
+            GRID_LARGE, prey_start, monster_start, reward_pos,
+            prey_policy=prey_policy,
+            monster_policy=monster_policy,
+        )
 
 
 # ==============================================================================
@@ -396,7 +256,7 @@ def main():
     pygame.display.set_caption("Freeze Tag  |  Both Players (MINIMAX - Adversarial)")
     clock  = pygame.time.Clock()
 
-    game         = BothPlayersMinimaxGame()
+    game         = scenario_game(BothPlayersMinimaxGame, GRID_LARGE)   # --replay FILE / --record FILE
     frame_count  = 0
     end_display  = None
 
@@ -427,24 +287,26 @@ def main():
                 pygame.quit(); sys.exit()
 
         # Drawing
-        screen.fill(BG_COLOR)
-        draw_grid(screen, GRID_LARGE)
+        with profiling.phase("render"):
+            screen.fill(BG_COLOR)
+            draw_grid(screen, GRID_LARGE)
 
-        draw_path(screen, game.prey_path,    PREY_COLOR,    width=2)
-        draw_path(screen, game.monster_path, MONSTER_COLOR, width=2)
+            draw_path(screen, game.prey_path,    PREY_COLOR,    width=2)
+            draw_path(screen, game.monster_path, MONSTER_COLOR, width=2)
 
-        draw_reward(screen, reward_pos)
+            draw_reward(screen, game.reward_pos)
 
-        draw_agent(screen, game.prey_pos,    PREY_COLOR,    "P")
-        draw_agent(screen, game.monster_pos, MONSTER_COLOR, "M")
+            draw_agent(screen, game.prey_pos,    PREY_COLOR,    "P")
+            draw_agent(screen, game.monster_pos, MONSTER_COLOR, "M")
 
-        draw_panel(screen, W, game.step_count,
-                   game.prey_dist, game.monster_dist,
-                   result=game.result)
+            draw_panel(screen, W, game.step_count,
+                       game.prey_dist, game.monster_dist,
+                       result=game.result)
 
-        pygame.display.flip()
+            pygame.display.flip()
         clock.tick(FPS)
 
 
 if __name__ == "__main__":
+    profiling.install()
     main()
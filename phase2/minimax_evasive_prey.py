@@ -6,6 +6,7 @@ import time
 # -- resolve parent directory so we can import config & utils --
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import profiling
 from config import (
     TILE_SIZE_LARGE,        # pixel size of each tile  (e.g. 20)
     GRID_WIDTH_LARGE,       # number of columns        (e.g. 30)
@@ -18,7 +19,11 @@ from config import (
     PLAYER_START_POS_LARGE, # [col, row] start for the prey
     GOAL_POS_LARGE,         # [col, row] for the reward
 )
-from utils import get_astar_path
+from phase2.game_engine import (
+    PREY, grid_graph, AdversarialSearch, AStarChaseOpponent, ChaseGame, MinimaxPolicy, AStarPolicy,
+    distance_evaluation, minimax_path, TranspositionTable, PrincipalVariation,
+)
+from phase2.replay import scenario_game
 
 # ==============================================================================
 #  GAME-SPECIFIC COLOURS
@@ -43,6 +48,8 @@ reward_pos   = list(GOAL_POS_LARGE)
 # ==============================================================================
 PREY_MINIMAX_DEPTH = 2  # How many moves ahead prey looks (deeper = smarter but slower)
 PREY_LOOKAHEAD_MOVES = 3  # Monster looks 3 moves ahead in prey's simulation
+REUSE_PRINCIPAL_VARIATION = False  # True: skip the search on ticks that follow the last plan
+MINIMAX_CACHE_ENTRIES = 200_000  # transposition table cap (~50 MB)
 
 # ==============================================================================
 #  SPEED CONTROLS
@@ -154,29 +161,18 @@ def draw_panel(surface, width, step, prey_dist, monster_dist, result=None, strat
     surface.blit(ctrl, ctrl.get_rect(center=(width // 2, 72)))
 
 
-# ==============================================================================
-#  MINIMAX EVALUATION FUNCTION
-# ==============================================================================
-def evaluate_board(prey_pos, monster_pos, reward_pos):
-    """
-    Evaluation function for the prey's minimax search.
-    
-    Score = (Distance from Prey to Monster) - (Distance from Prey to Reward)
-    
-    HIGH score = good for prey (far from monster, moving toward reward)
-    LOW score = bad for prey (close to monster)
-    """
-    dist_to_monster = abs(prey_pos[0] - monster_pos[0]) + abs(prey_pos[1] - monster_pos[1])
-    dist_to_reward = abs(prey_pos[0] - reward_pos[0]) + abs(prey_pos[1] - reward_pos[1])
-    
-    score = dist_to_monster - dist_to_reward
-    return score
-
-
 # ==============================================================================
 #  MINIMAX SEARCH WITH EVALUATION
 # ==============================================================================
-_minimax_cache = {}
+# The prey maximizes game_engine.distance_evaluation:
+#   Score = (Distance from Prey to Monster) - (Distance from Prey to Reward)
+# and the monster is simulated as an A* chaser (AStarChaseOpponent).
+_OPPONENT = AStarChaseOpponent()
+# Kept across turns (it empties itself when the grid or reward changes);
+# the entry cap keeps memory flat over long games
+_minimax_cache = TranspositionTable(MINIMAX_CACHE_ENTRIES)
+_prey_pv = PrincipalVariation()
+
 
 def minimax_evasive_prey(prey_pos, monster_pos, reward_pos, depth, grid):
     """
@@ -184,66 +180,13 @@ def minimax_evasive_prey(prey_pos, monster_pos, reward_pos, depth, grid):
     Prey maximizes: (distance to monster) - (distance to reward)
     Monster minimizes (simulated as A* chase)
     """
-    # Cache key
-    cache_key = (prey_pos, monster_pos, reward_pos, depth)
-    if cache_key in _minimax_cache:
-        return _minimax_cache[cache_key]
-    
-    if depth == 0:
-        score = evaluate_board(prey_pos, monster_pos, reward_pos)
-        result = ([], score)
-        _minimax_cache[cache_key] = result
-        return result
-    
-    # Check if prey reached reward
-    if prey_pos == tuple(reward_pos):
-        result = ([prey_pos], float('inf'))
-        _minimax_cache[cache_key] = result
-        return result
-    
-    # Check if caught
-    if prey_pos == monster_pos:
-        result = ([prey_pos], float('-inf'))
-        _minimax_cache[cache_key] = result
-        return result
-    
-    # Generate valid moves for prey
-    valid_moves = []
-    for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-        nx, ny = prey_pos[0] + dx, prey_pos[1] + dy
-        if 0 <= nx < GRID_WIDTH_LARGE and 0 <= ny < GRID_HEIGHT_LARGE:
-            if grid[ny][nx] != 1:
-                valid_moves.append((nx, ny))
-    
-    if not valid_moves:
-        score = evaluate_board(prey_pos, monster_pos, reward_pos)
-        result = ([prey_pos], score)
-        _minimax_cache[cache_key] = result
-        return result
-    
-    best_move = None
-    best_score = float('-inf')
-    
-    for move in valid_moves:
-        # Simulate monster chasing this move
-        simulated_monster = list(monster_pos)
-        monster_path = get_astar_path(tuple(monster_pos), tuple(move), grid)
-        if len(monster_path) > 1:
-            simulated_monster = list(monster_path[1])
-        
-        # Recursive call
-        _, score = minimax_evasive_prey(move, tuple(simulated_monster), reward_pos, depth - 1, grid)
-        
-        if score > best_score:
-            best_score = score
-            best_move = move
-    
-    if best_move is None:
-        best_move = valid_moves[0]
-    
-    result = ([best_move], best_score)
-    _minimax_cache[cache_key] = result
-    return result
+    graph = grid_graph(grid)
+    search = AdversarialSearch(graph, graph.index(reward_pos), distance_evaluation,
+                               opponent=_OPPONENT, cache=_minimax_cache)
+    move, score = search.best_move(graph.index(prey_pos), graph.index(monster_pos), depth, True)
+    if move is None:
+        return [tuple(prey_pos)], score
+    return [graph.position(move)], score
 
 
 def find_evasive_prey_path(prey_pos, monster_pos, reward_pos, grid):
@@ -255,98 +198,26 @@ def find_evasive_prey_path(prey_pos, monster_pos, reward_pos, grid):
     2. Extend from there using A* to reward
     3. This balances safety (minimax) with efficiency (A*)
     """
-    _minimax_cache.clear()  # Clear cache each turn to stay responsive
-    
-    # Use minimax to pick the safest NEXT MOVE
-    path, score = minimax_evasive_prey(tuple(prey_pos), tuple(monster_pos), tuple(reward_pos), 
-                                       PREY_MINIMAX_DEPTH, grid)
-    
-    # If minimax found a move, use it
-    if path and len(path) > 0:
-        next_pos = path[0]
-        # Continue from there to reward using A*
-        full_path = get_astar_path(tuple(next_pos), tuple(reward_pos), grid)
-        if full_path:
-            return [tuple(prey_pos)] + full_path
-        else:
-            return [tuple(prey_pos), next_pos]
-    
-    # Fallback: use pure A* if minimax fails
-    astar_path = get_astar_path(tuple(prey_pos), tuple(reward_pos), grid)
-    return astar_path if astar_path else [tuple(prey_pos)]
+    return minimax_path(grid_graph(grid), PREY, prey_pos, monster_pos, reward_pos,
+                        PREY_MINIMAX_DEPTH, opponent=_OPPONENT, cache=_minimax_cache,
+                        pv=_prey_pv if REUSE_PRINCIPAL_VARIATION else None)
 
 
 # ==============================================================================
 #  GAME STATE
 # ==============================================================================
-class EvativePreyGame:
+class EvativePreyGame(ChaseGame):
     """Game with evasive minimax prey and chasing A* monster."""
 
     def __init__(self):
-        self.reset()
-
-    def reset(self):
-        self.prey_pos    = list(prey_start)
-        self.monster_pos = list(monster_start)
-        self.step_count  = 0
-        self.result      = None
-        self.paused      = False
-        self.prey_path   = []
-        self.monster_path = []
-        self._update_paths()
-
-    def _update_paths(self):
-        """Update both agents' paths."""
-        # Evasive prey using minimax
-        prey_next = find_evasive_prey_path(self.prey_pos, self.monster_pos, reward_pos, GRID_LARGE)
-        self.prey_path = prey_next if prey_next else [self.prey_pos]
-
-        # Monster using A*
-        self.monster_path = get_astar_path(
-            tuple(self.monster_pos), tuple(self.prey_pos), GRID_LARGE
+        super().__init__(
+            GRID_LARGE, prey_start, monster_start, reward_pos,
+            prey_policy=MinimaxPolicy(PREY_MINIMAX_DEPTH, opponent=AStarChaseOpponent(),
+                                      cache=TranspositionTable(MINIMAX_CACHE_ENTRIES),
+                                      reuse_pv=REUSE_PRINCIPAL_VARIATION),
+            monster_policy=AStarPolicy(),
         )
 
-    def tick(self):
-        """Advance the game by one step."""
-        if self.result or self.paused:
-            return
-
-        # Prey moves
-        if len(self.prey_path) > 1:
-            next_prey = list(self.prey_path[1])
-        else:
-            next_prey = self.prey_pos
-
-        # Monster moves
-        if len(self.monster_path) > 1:
-            next_monster = list(self.monster_path[1])
-        else:
-            next_monster = self.monster_pos
-
-        self.prey_pos    = next_prey
-        self.monster_pos = next_monster
-        self.step_count += 1
-
-        # Check win conditions
-        if self.prey_pos == reward_pos:
-            self.result = "prey"
-            return
-
-        if self.monster_pos == self.prey_pos:
-            self.result = "monster"
-            return
-
-        # Recalculate paths
-        self._update_paths()
-
-    @property
-    def prey_dist(self):
-        return max(0, len(self.prey_path) - 1)
-
-    @property
-    def monster_dist(self):
-        return max(0, len(self.monster_path) - 1)
-
 
 # ==============================================================================
 #  MAIN
@@ -359,7 +230,7 @@ def main():
     pygame.display.set_caption("Freeze Tag  |  Prey (MINIMAX - Evasive) vs Monster (A*)")
     clock  = pygame.time.Clock()
 
-    game         = EvativePreyGame()
+    game         = scenario_game(EvativePreyGame, GRID_LARGE)   # --replay FILE / --record FILE
     frame_count  = 0
     end_display  = None
 
@@ -390,24 +261,26 @@ def main():
                 pygame.quit(); sys.exit()
 
         # Drawing
-        screen.fill(BG_COLOR)
-        draw_grid(screen, GRID_LARGE)
+        with profiling.phase("render"):
+            screen.fill(BG_COLOR)
+            draw_grid(screen, GRID_LARGE)
 
-        draw_path(screen, game.prey_path,    PREY_COLOR,    width=2)
-        draw_path(screen, game.monster_path, MONSTER_COLOR, width=2)
+            draw_path(screen, game.prey_path,    PREY_COLOR,    width=2)
+            draw_path(screen, game.monster_path, MONSTER_COLOR, width=2)
 
-        draw_reward(screen, reward_pos)
+            draw_reward(screen, game.reward_pos)
 
-        draw_agent(screen, game.prey_pos,    PREY_COLOR,    "P")
-        draw_agent(screen, game.monster_pos, MONSTER_COLOR, "M")
+            draw_agent(screen, game.prey_pos,    PREY_COLOR,    "P")
+            draw_agent(screen, game.monster_pos, MONSTER_COLOR, "M")
 
-        draw_panel(screen, W, game.step_count,
-                   game.prey_dist, game.monster_dist,
-                   result=game.result)
+            draw_panel(screen, W, game.step_count,
+                       game.prey_dist, game.monster_dist,
+                       result=game.result)
 
-        pygame.display.flip()
+            pygame.display.flip()
         clock.tick(FPS)
 
 
 if __name__ == "__main__":
+    profiling.install()
     main()
@@ -6,6 +6,7 @@ import time
 # -- resolve parent directory so we can import config & utils --
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import profiling
 from config import (
     TILE_SIZE_LARGE,        # pixel size of each tile  (e.g. 20)
     GRID_WIDTH_LARGE,       # number of columns        (e.g. 30)
@@ -18,7 +19,8 @@ from config import (
     PLAYER_START_POS_LARGE, # [col, row] start for the prey
     GOAL_POS_LARGE,         # [col, row] for the reward
 )
-from utils import get_minimax_path
+from phase2.game_engine import ChaseGame, BoundedAStarPolicy
+from phase2.replay import scenario_game
 
 
 PREY_COLOR     = (30,  144, 255)   # dodger-blue
@@ -168,83 +170,18 @@ def draw_panel(surface, width, step, prey_dist, monster_dist, result=None):
 # ==============================================================================
 #  GAME STATE
 # ==============================================================================
-class MiniMaxGame:
+class MiniMaxGame(ChaseGame):
     """Encapsulates all mutable state so we can easily restart (R key)."""
 
     def __init__(self):
-        self.reset()
-
-    def reset(self):
-        self.prey_pos    = list(prey_start)
-        self.monster_pos = list(monster_start)
-        self.step_count  = 0
-        self.result      = None          # None | "prey" | "monster"
-        self.paused      = False
-
-        # Compute initial paths
-        self.prey_path    = []
-        self.monster_path = []
-        self._update_paths()
-
-    # -- path planning --
-    def _update_paths(self):
-        """Re-run MINIMAX for both agents."""
-        # Prey heads for the reward (fixed goal)
-        self.prey_path = get_minimax_path(
-            tuple(self.prey_pos), tuple(reward_pos), GRID_LARGE,
-            depth=PREY_DEPTH
+        # Both agents re-run depth-bounded A* (MINIMAX) every tick:
+        # prey heads for the reward, monster for the prey's CURRENT position.
+        super().__init__(
+            GRID_LARGE, prey_start, monster_start, reward_pos,
+            prey_policy=BoundedAStarPolicy(PREY_DEPTH),
+            monster_policy=BoundedAStarPolicy(MONSTER_DEPTH),
         )
 
-        # Monster heads for prey's CURRENT position (dynamic goal)
-        self.monster_path = get_minimax_path(
-            tuple(self.monster_pos), tuple(self.prey_pos), GRID_LARGE,
-            depth=MONSTER_DEPTH
-        )
-
-    # -- one simulation step --
-    def tick(self):
-        """Advance the game by one step (both agents move once)."""
-        if self.result or self.paused:
-            return
-
-        # -- PREY moves one step toward reward --
-        if len(self.prey_path) > 1:
-            next_prey = list(self.prey_path[1])   # [0] is current pos
-        else:
-            next_prey = self.prey_pos              # already at goal
-
-        # -- MONSTER moves one step toward prey --
-        if len(self.monster_path) > 1:
-            next_monster = list(self.monster_path[1])
-        else:
-            next_monster = self.monster_pos
-
-        # Apply moves
-        self.prey_pos    = next_prey
-        self.monster_pos = next_monster
-        self.step_count += 1
-
-        # -- Check win / lose conditions --
-        if self.prey_pos == reward_pos:
-            self.result = "prey"
-            return
-
-        if self.monster_pos == self.prey_pos:
-            self.result = "monster"
-            return
-
-        # -- Recalculate paths for next step --
-        self._update_paths()
-
-    # -- properties for the UI --
-    @property
-    def prey_dist(self):
-        return max(0, len(self.prey_path) - 1)
-
-    @property
-    def monster_dist(self):
-        return max(0, len(self.monster_path) - 1)
-
 
 # ==============================================================================
 #  MAIN
@@ -257,7 +194,7 @@ def main():
     pygame.display.set_caption("Freeze Tag  |  Prey (MINIMAX) vs Monster (MINIMAX)")
     clock  = pygame.time.Clock()
 
-    game         = MiniMaxGame()
+    game         = scenario_game(MiniMaxGame, GRID_LARGE)   # --replay FILE / --record FILE
     frame_count  = 0
     end_display  = None    # timestamp when game ended (for auto-close)
 
@@ -289,28 +226,30 @@ def main():
                 pygame.quit(); sys.exit()
 
         # -- Drawing --
-        screen.fill(BG_COLOR)
-        draw_grid(screen, GRID_LARGE)
+        with profiling.phase("render"):
+            screen.fill(BG_COLOR)
+            draw_grid(screen, GRID_LARGE)
 
-        # Path lines (behind agents)
-        draw_path(screen, game.prey_path,    PREY_COLOR,    width=2)
-        draw_path(screen, game.monster_path, MONSTER_COLOR, width=2)
+            # Path lines (behind agents)
+            draw_path(screen, game.prey_path,    PREY_COLOR,    width=2)
+            draw_path(screen, game.monster_path, MONSTER_COLOR, width=2)
 
-        # Reward
-        draw_reward(screen, reward_pos)
+            # Reward
+            draw_reward(screen, game.reward_pos)
 
-        # Agents
-        draw_agent(screen, game.prey_pos,    PREY_COLOR,    "P")
-        draw_agent(screen, game.monster_pos, MONSTER_COLOR, "M")
+            # Agents
+            draw_agent(screen, game.prey_pos,    PREY_COLOR,    "P")
+            draw_agent(screen, game.monster_pos, MONSTER_COLOR, "M")
 
-        # Panel
-        draw_panel(screen, W, game.step_count,
-                   game.prey_dist, game.monster_dist,
-                   result=game.result)
+            # Panel
+            draw_panel(screen, W, game.step_count,
+                       game.prey_dist, game.monster_dist,
+                       result=game.result)
 
-        pygame.display.flip()
+            pygame.display.flip()
         clock.tick(FPS)
 
 
 if __name__ == "__main__":
+    profiling.install()
     main()
@@ -0,0 +1,153 @@
+"""
+N-monster chase: one prey against any number of monsters.
+
+Monster positions live in one NumPy array of cell indices. Every tick the
+monsters all chase the prey along shortest paths in a single vectorized
+step: one BFS distance field is computed from the prey, each monster looks
+up the field at its (padded) neighbours and steps to the closest one
+(first in Down, Up, Right, Left order on ties). Captures are checked for
+every monster at once. Per-tick cost is one BFS plus O(monsters) array work.
+
+The prey keeps using the single-monster policies from game_engine: for them
+`monster_pos` is the monster nearest to the prey by maze distance.
+"""
+
+import sys
+import os
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import profiling
+from utils import get_bfs_distance_field
+from phase2.game_engine import PREY, MONSTER, ChaseGame, grid_graph
+from phase2.latency import LatencyHistogram
+from phase2.grid_arrays import padded_moves
+
+
+def spread_positions(grid, count, avoid=(), min_distance=5, seed=0):
+    """
+    `count` random open cells (as [x, y]) at least `min_distance` steps (Manhattan)
+    from every cell in `avoid`. Cells may repeat once the free ones run out.
+    """
+    rng = np.random.default_rng(seed)
+    cells = [
+        (x, y) for y, row in enumerate(grid) for x, cell in enumerate(row)
+        if cell != 1 and all(abs(x - ax) + abs(y - ay) >= min_distance for ax, ay in avoid)
+    ]
+    picks = rng.choice(len(cells), size=count, replace=count > len(cells))
+    return [list(cells[i]) for i in picks]
+
+
+class MultiMonsterGame(ChaseGame):
+    """
+    ChaseGame with an array of monsters that all chase the prey.
+
+    `monster_starts` is a list of [x, y] positions; `caught_by` records which
+    monster ended the game.
+    """
+
+    def __init__(self, grid, prey_start, monster_starts, reward_pos, prey_policy, max_steps=None):
+        self.nbr, self.mask, _ = padded_moves(grid_graph(grid))
+        super().__init__(grid, prey_start, monster_starts, reward_pos, prey_policy,
+                         monster_policy=None, max_steps=max_steps)
+
+    def reset(self):
+        graph = self.graph
+        self.prey_pos    = list(self.prey_start)
+        self.monsters    = np.array([graph.index(p) for p in self.monster_start], dtype=np.int64)
+        self.step_count  = 0
+        self.result      = None          # None | "prey" | "monster"
+        self.caught_by   = None          # index into monsters
+        self.paused      = False
+        self.nodes_expanded = {PREY: [], MONSTER: []}
+        self.path_lengths   = {PREY: [], MONSTER: []}
+        self.replans_avoided = {PREY: 0, MONSTER: 0}
+        self.latency = {PREY: LatencyHistogram(), MONSTER: LatencyHistogram()}
+
+        self.prey_path    = []
+        self.monster_path = []
+        self._update_paths()
+
+    # -- monsters --------------------------------------------------------------
+    @property
+    def monster_positions(self):
+        """All monster positions as [x, y] lists."""
+        graph = self.graph
+        return [[graph.xs[i], graph.ys[i]] for i in self.monsters.tolist()]
+
+    def _nearest(self):
+        """Index into `monsters` of the monster closest to the prey (by maze distance)."""
+        d = self.prey_field[self.monsters]
+        return int(np.where(d < 0, self.graph.size, d).argmin())
+
+    @property
+    def monster_pos(self):
+        """The nearest monster, so single-monster prey policies can play this game."""
+        i = int(self.monsters[self._nearest()])
+        return [self.graph.xs[i], self.graph.ys[i]]
+
+    def _chase_moves(self):
+        """Next cell of every monster: the neighbour closest to the prey, or stay if unreachable."""
+        field = self.prey_field
+        far = self.graph.size
+        cand = self.nbr[self.monsters]                              # (M, 4)
+        d = field[cand]
+        d = np.where(self.mask[self.monsters] & (d >= 0), d, far)
+        pick = d.argmin(axis=1)
+        rows = np.arange(len(self.monsters))
+        return np.where(d[rows, pick] < far, cand[rows, pick], self.monsters)
+
+    # -- game loop -------------------------------------------------------------
+    def _update_paths(self):
+        """Prey plans first (against the nearest monster), then every monster takes one hop."""
+        t0 = time.perf_counter_ns()
+        dist, _ = get_bfs_distance_field(self.prey_pos, self.grid)
+        self.prey_field = np.array(dist, dtype=np.int64)
+        field_ns = time.perf_counter_ns() - t0            # the monsters' share of this tick
+
+        self.prey_path = self._plan(PREY)
+
+        t0 = time.perf_counter_ns()
+        self.monster_next = self._chase_moves()
+        monster_ns = field_ns + time.perf_counter_ns() - t0
+        self.latency[MONSTER].record(monster_ns)
+        profiling.add_phase_time("search", monster_ns)
+        self.nodes_expanded[MONSTER].append(self.graph.size - dist.count(-1))
+        self.path_lengths[MONSTER].append(self.monster_dist + 1)   # nearest monster's path
+        nearest = self._nearest()
+        self.monster_path = [self.graph.position(int(self.monsters[nearest])),
+                             self.graph.position(int(self.monster_next[nearest]))]
+
+    def tick(self):
+        """Advance the game by one step (the prey and every monster move once)."""
+        if self.result or self.paused:
+            return
+
+        if len(self.prey_path) > 1:
+            self.prey_pos = list(self.prey_path[1])
+        self.monsters = self.monster_next
+        self.step_count += 1
+
+        if self.prey_pos == self.reward_pos:
+            self.result = PREY
+            return
+
+        caught = np.flatnonzero(self.monsters == self.graph.index(self.prey_pos))
+        if caught.size:
+            self.result = MONSTER
+            self.caught_by = int(caught[0])
+            return
+
+        if self.max_steps is not None and self.step_count >= self.max_steps:
+            return
+
+        self._update_paths()
+
+    @property
+    def monster_dist(self):
+        d = int(self.prey_field[self.monsters[self._nearest()]])
+        return max(0, d)
+
@@ -0,0 +1,221 @@
+"""
+Opening book: precomputed minimax moves for the first ticks of a game.
+
+Every scenario and GameSimulator run starts from the same prey and monster
+cells, so the searches for the opening moves are the same every time. The
+builder walks every position the game can reach in the first `ticks` ticks
+(both agents step once per tick, any legal move), runs the alpha-beta
+search offline for each side to move, and stores the chosen moves.
+
+The book is a structured .npy file sorted by state key and opened with mmap;
+a lookup is one binary search:
+
+    key    int64    ((prey * N + monster) << 1) | prey_turn
+    move   int32    cell index the side to move steps to
+    score  float32  the search score (prey side)
+
+A book only answers for the search it was built with (depth, evaluation,
+opponent model); load_or_build keys the file name on all of them. Passed
+to MinimaxPolicy / minimax_path as `book`, it is consulted before the live
+search.
+
+Usage: python3 phase2/opening_book.py   (build for GRID_LARGE, time games with and without)
+"""
+
+import sys
+import os
+import json
+import time
+import hashlib
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import profiling
+from config import GRID_LARGE, GRID_WIDTH_LARGE, GRID_HEIGHT_LARGE, PLAYER_START_POS_LARGE, GOAL_POS_LARGE
+from phase2.game_engine import grid_graph, AdversarialSearch, AStarChaseOpponent, distance_evaluation
+from phase2.retrograde import TABLEBASE_DIR, grid_signature
+
+BOOK_DTYPE = np.dtype([("key", "i8"), ("move", "i4"), ("score", "f4")])
+
+DEFAULT_BOOK_TICKS = 8
+
+
+def book_key(size, prey, monster, prey_turn):
+    """Sort key of a position in the book (cell indices, `size` cells in the grid)."""
+    return ((prey * size + monster) << 1) | int(prey_turn)
+
+
+def opening_positions(graph, prey, monster, reward, ticks):
+    """
+    Every (prey, monster) cell pair the game can be in during its first `ticks` ticks.
+
+    Both agents make one legal step per tick (a stuck agent stays); positions
+    where the game is over (prey on the reward, or caught) are left out.
+    """
+    positions = {(prey, monster)}
+    frontier = set(positions)
+    for _ in range(ticks):
+        nxt = set()
+        for p, m in frontier:
+            for p2 in graph.moves[p] or (p,):
+                if p2 == reward:
+                    continue
+                for m2 in graph.moves[m] or (m,):
+                    if m2 != p2:
+                        nxt.add((p2, m2))
+        frontier = nxt - positions
+        positions |= frontier
+    return sorted(positions)
+
+
+class OpeningBook:
+    """Precomputed best moves for one grid, reward cell and search configuration."""
+
+    def __init__(self, grid, reward_pos, table, meta=None):
+        self.grid = grid
+        self.graph = grid_graph(grid)
+        self.reward_pos = tuple(reward_pos)
+        self.table = table          # BOOK_DTYPE array sorted by key
+        self.meta = meta or {}
+        self._keys = table["key"]
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def build(cls, grid, reward_pos, prey_start, monster_start, depth, ticks=DEFAULT_BOOK_TICKS,
+              evaluate=distance_evaluation, opponent=None):
+        """
+        Search every opening position offline.
+
+        With an opponent model (e.g. AStarChaseOpponent) only the prey is
+        searched, so only prey-to-move entries are stored.
+        """
+        graph = grid_graph(grid)
+        reward = graph.index(reward_pos)
+        positions = opening_positions(graph, graph.index(prey_start), graph.index(monster_start),
+                                      reward, ticks)
+        sides = (True,) if opponent is not None else (True, False)
+
+        rows = []
+        for prey, monster in positions:
+            for prey_turn in sides:
+                search = AdversarialSearch(graph, reward, evaluate, opponent)
+                move, score = search.best_move(prey, monster, depth, prey_turn)
+                if move is not None:
+                    rows.append((book_key(graph.size, prey, monster, prey_turn), move, score))
+
+        table = np.array(rows, dtype=BOOK_DTYPE)
+        table.sort(order="key")
+        meta = {"depth": depth, "ticks": ticks, "evaluate": evaluate.__name__,
+                "opponent": type(opponent).__name__ if opponent is not None else None,
+                "prey_start": list(prey_start), "monster_start": list(monster_start)}
+        return cls(grid, reward_pos, table, meta)
+
+    def save(self, path):
+        """Write the table as a .npy file (plus a .json sidecar describing grid and search)."""
+        np.save(path, self.table)
+        with open(path + ".json", "w") as f:
+            json.dump(dict(self.meta, reward=list(self.reward_pos), entries=len(self.table),
+                           grid_sha1=grid_signature(self.grid)), f)
+
+    @classmethod
+    def load(cls, path, grid):
+        """Memory-map a saved book. Raises ValueError if it was built for another grid."""
+        with open(path + ".json") as f:
+            meta = json.load(f)
+        if meta["grid_sha1"] != grid_signature(grid):
+            raise ValueError(f"Opening book {path} was built for a different grid")
+        table = np.load(path, mmap_mode="r")
+        return cls(grid, meta["reward"], table, meta)
+
+    def __len__(self):
+        return len(self.table)
+
+    def lookup(self, prey, monster, prey_turn):
+        """(move, score) for a position given as cell indices, or None if it is not in the book."""
+        key = book_key(self.graph.size, prey, monster, prey_turn)
+        i = int(np.searchsorted(self._keys, key))
+        if i < len(self._keys) and self._keys[i] == key:
+            self.hits += 1
+            rec = self.table[i]
+            return int(rec["move"]), float(rec["score"])
+        self.misses += 1
+        return None
+
+
+def default_path(grid, reward_pos, prey_start, monster_start, depth, ticks, evaluate, opponent):
+    """Book file location under phase2/tablebases/, unique per grid, starts and search settings."""
+    settings = json.dumps([list(prey_start), list(monster_start), depth, ticks, evaluate.__name__,
+                           type(opponent).__name__ if opponent is not None else None])
+    tag = hashlib.sha1(settings.encode()).hexdigest()[:8]
+    return os.path.join(TABLEBASE_DIR,
+                        f"book_{grid_signature(grid)[:12]}_{reward_pos[0]}_{reward_pos[1]}_{tag}.npy")
+
+
+def load_or_build(grid, reward_pos, prey_start, monster_start, depth, ticks=DEFAULT_BOOK_TICKS,
+                  evaluate=distance_evaluation, opponent=None, path=None):
+    """Open the cached book for this configuration, building and saving it on first use."""
+    if opponent is not None and not isinstance(opponent, AStarChaseOpponent):
+        raise ValueError(f"{type(opponent).__name__} depends on the game so far; it cannot be booked")
+    path = path or default_path(grid, reward_pos, prey_start, monster_start, depth, ticks,
+                                evaluate, opponent)
+    if os.path.exists(path) and os.path.exists(path + ".json"):
+        return OpeningBook.load(path, grid)
+    book = OpeningBook.build(grid, reward_pos, prey_start, monster_start, depth, ticks,
+                             evaluate, opponent)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    book.save(path)
+    return OpeningBook.load(path, grid)
+
+
+# ==============================================================================
+#  BUILD + TIMING
+# ==============================================================================
+MATCHUPS = [
+    # (label, prey algorithm, monster algorithm, depth)
+    ("adversarial d=3", "adversarial", "adversarial", 3),
+    ("adversarial d=6", "adversarial", "adversarial", 6),
+    ("evasive d=6", "evasive", "astar", 6),
+]
+
+
+def main():
+    from phase2.compare_algorithms import GameSimulator
+
+    monster_start = [GRID_WIDTH_LARGE - 2, GRID_HEIGHT_LARGE - 2]
+    print(f"GRID_LARGE, prey {tuple(PLAYER_START_POS_LARGE)}, monster {tuple(monster_start)}, "
+          f"book covers the first {DEFAULT_BOOK_TICKS} ticks\n")
+    print(f"{'search':<16} | {'entries':>7} | {'build s':>7} | {'game s':>7} | {'booked s':>8} | "
+          f"{'hits':>5} | same game")
+    print("-" * 80)
+    for label, prey_alg, monster_alg, depth in MATCHUPS:
+        opponent = AStarChaseOpponent() if prey_alg == "evasive" else None
+        path = default_path(GRID_LARGE, GOAL_POS_LARGE, PLAYER_START_POS_LARGE, monster_start,
+                            depth, DEFAULT_BOOK_TICKS, distance_evaluation, opponent)
+        for stale in (path, path + ".json"):
+            if os.path.exists(stale):
+                os.remove(stale)
+        t0 = time.perf_counter()
+        book = load_or_build(GRID_LARGE, GOAL_POS_LARGE, PLAYER_START_POS_LARGE, monster_start,
+                             depth, DEFAULT_BOOK_TICKS, distance_evaluation, opponent)
+        build = time.perf_counter() - t0
+
+        results = []
+        for opening_book in (False, True):
+            sim = GameSimulator(label, prey_alg, monster_alg, prey_depth=depth, monster_depth=depth,
+                                max_steps=300, opening_book=opening_book)
+            t0 = time.perf_counter()
+            m = sim.run()
+            results.append((time.perf_counter() - t0, m.winner, m.steps_to_end))
+        hits = sum(policy.book.hits for policy in (sim.game.prey_policy, sim.game.monster_policy)
+                   if getattr(policy, "book", None) is not None)
+        same = results[0][1:] == results[1][1:]
+        print(f"{label:<16} | {len(book):>7} | {build:>7.2f} | {results[0][0]:>7.2f} | "
+              f"{results[1][0]:>8.2f} | {hits:>5} | {'yes' if same else 'no'}")
+
+
+if __name__ == "__main__":
+    profiling.install()
+    main()
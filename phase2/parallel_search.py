@@ -0,0 +1,276 @@
+"""
+Parallel root-split minimax for the adversarial (both players search) game.
+
+The root's moves are searched in separate worker processes of a
+concurrent.futures.ProcessPoolExecutor ("Young Brothers Wait": the first,
+eldest move is searched in the parent first, so its score bounds every
+sibling search).
+
+- Workers receive the grid once, at start-up, through a SharedMemory
+  block, never by pickling it per call. Each worker builds its own
+  grid_graph and keeps a transposition table for the current decision.
+- The best root score found so far lives in a shared multiprocessing.Value.
+  Each sibling search uses it as the near bound of its window, and workers
+  raise it as they find better moves. A sibling that fails low comes back
+  as a bound only; if that bound could tie the final best score from an
+  earlier move, the sibling is re-searched with a full window. Nothing
+  assumes integer scores, so any evaluation works.
+
+Root move choice matches AdversarialSearch.best_move exactly: the first
+move in Down, Up, Right, Left order with the best score.
+
+Usage: python3 phase2/parallel_search.py   (prints speedup vs worker count)
+"""
+
+import sys
+import os
+import time
+import itertools
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import Value
+from multiprocessing.shared_memory import SharedMemory
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import profiling
+from config import GRID_LARGE, GOAL_POS_LARGE
+from phase2.game_engine import (
+    PREY, INF, grid_graph, AdversarialSearch, distance_evaluation,
+)
+
+# Per-process state set up by _init_worker
+_WORKER = None
+
+
+def _init_worker(shm_name, width, height, shared_best):
+    """Rebuild the grid from shared memory once per worker process."""
+    global _WORKER
+    shm = SharedMemory(name=shm_name)
+    cells = bytes(shm.buf[:width * height])
+    shm.close()
+    grid = [list(cells[row * width:(row + 1) * width]) for row in range(height)]
+    _WORKER = {
+        "graph": grid_graph(grid),
+        "best": shared_best,
+        "cache": {},
+        "decision": None,
+    }
+
+
+def _search_root_move(decision, prey, monster, depth, prey_turn, reward, evaluate):
+    """
+    Score one root move (the child position after it) in a worker.
+
+    `shared best` is the root mover's best score so far, stored negated for the
+    monster so larger is always better. The window starts at it: a score that
+    beats it comes back exact, anything else as a fail-soft bound.
+
+    Returns (score, exact, nodes, cache_hits).
+    """
+    worker = _WORKER
+    if worker["decision"] != decision:
+        worker["cache"].clear()
+        worker["decision"] = decision
+
+    search = AdversarialSearch(worker["graph"], reward, evaluate, cache=worker["cache"])
+    shared_best = worker["best"]
+    best = shared_best.value
+
+    if prey_turn:
+        _, score = search.search(prey, monster, depth, False, best, INF)
+        exact, gain = best == -INF or score > best, score
+    else:
+        _, score = search.search(prey, monster, depth, True, -INF, -best)
+        exact, gain = best == -INF or score < -best, -score
+
+    if exact and gain > best:
+        with shared_best.get_lock():
+            if gain > shared_best.value:
+                shared_best.value = gain
+
+    return score, exact, search.nodes, search.cache_hits
+
+
+def _release(pool, shm):
+    """Stop the pool and free the shared grid block (runs once, at close or exit)."""
+    pool.shutdown()
+    shm.close()
+    shm.unlink()
+
+
+class ParallelSearch:
+    """
+    Alpha-beta minimax whose root moves run on a process pool.
+
+    Use as a context manager (or call close()) to release the pool and the
+    shared grid block early; otherwise they are released at interpreter exit.
+    """
+
+    def __init__(self, grid, workers=None, evaluate=distance_evaluation, ybw=True):
+        self.grid = grid
+        self.graph = grid_graph(grid)
+        self.evaluate = evaluate
+        self.ybw = ybw
+        self.nodes = 0
+        self.cache_hits = 0
+        self._decisions = itertools.count()
+
+        width, height = self.graph.width, self.graph.height
+        self._shm = SharedMemory(create=True, size=width * height)
+        self._shm.buf[:width * height] = bytes(cell for row in grid for cell in row)
+        self._best = Value("d", -INF)
+        self._pool = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self._shm.name, width, height, self._best),
+        )
+        self._finalizer = weakref.finalize(self, _release, self._pool, self._shm)
+
+    def best_move(self, prey, monster, reward, depth, prey_turn):
+        """
+        AdversarialSearch(graph, reward).best_move(prey, monster, depth, prey_turn), with the root split.
+
+        All arguments are cell indices; the reward is given per call, so one
+        pool serves any reward on its grid. Returns the same (move, score),
+        trapped roots included; move is None for terminal positions.
+        """
+        graph = self.graph
+        moves = graph.moves[prey if prey_turn else monster]
+        if depth == 0 or prey == reward or prey == monster or not moves:
+            search = AdversarialSearch(graph, reward, self.evaluate)
+            return search.best_move(prey, monster, depth, prey_turn)
+
+        decision = next(self._decisions)
+        self._best.value = -INF
+        children = [(move, monster) if prey_turn else (prey, move) for move in moves]
+        scores = [None] * len(moves)
+        exact = [True] * len(moves)
+
+        first = 0
+        if self.ybw and len(moves) > 1:
+            # Eldest brother: search the first move here with a full window
+            search = AdversarialSearch(graph, reward, self.evaluate)
+            child_prey, child_monster = children[0]
+            _, scores[0] = search.search(child_prey, child_monster, depth - 1, not prey_turn)
+            self._best.value = scores[0] if prey_turn else -scores[0]
+            self.nodes += search.nodes
+            self.cache_hits += search.cache_hits
+            first = 1
+
+        futures = [
+            self._pool.submit(_search_root_move, decision, child_prey, child_monster,
+                              depth - 1, prey_turn, reward, self.evaluate)
+            for child_prey, child_monster in children[first:]
+        ]
+        for i, future in enumerate(futures, start=first):
+            scores[i], exact[i], nodes, hits = future.result()
+            self.nodes += nodes
+            self.cache_hits += hits
+
+        # First move with the best score, as in the serial search. Bounds never
+        # beat an exact score, but one from an earlier move may tie it.
+        better = (lambda a, b: a > b) if prey_turn else (lambda a, b: a < b)
+        best_i = None
+        for i in range(len(moves)):
+            if exact[i] and (best_i is None or better(scores[i], scores[best_i])):
+                best_i = i
+        for i in range(best_i):
+            if exact[i] or better(scores[best_i], scores[i]):
+                continue
+            search = AdversarialSearch(graph, reward, self.evaluate)
+            child_prey, child_monster = children[i]
+            _, scores[i] = search.search(child_prey, child_monster, depth - 1, not prey_turn)
+            self.nodes += search.nodes
+            self.cache_hits += search.cache_hits
+            if scores[i] == scores[best_i]:
+                best_i = i
+                break
+        return moves[best_i], scores[best_i]
+
+    def close(self):
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ParallelMinimaxPolicy:
+    """MinimaxPolicy with the root split across a ParallelSearch pool (started on first use)."""
+
+    def __init__(self, depth, workers=None):
+        self.depth = depth
+        self.workers = workers
+        self.search = None
+
+    def plan(self, game, agent):
+        from utils import get_astar_path
+
+        if self.search is None or self.search.grid is not game.grid:
+            if self.search is not None:
+                self.search.close()
+            self.search = ParallelSearch(game.grid, self.workers)
+        graph = self.search.graph
+        start, target = game.endpoints(agent)
+        nodes_before = self.search.nodes
+
+        move, _ = self.search.best_move(graph.index(game.prey_pos), graph.index(game.monster_pos),
+                                        graph.index(game.reward_pos), self.depth, agent == PREY)
+        if move is not None:
+            next_pos = graph.position(move)
+            tail = get_astar_path(next_pos, target, game.grid)
+            path = [start] + tail if tail else [start, next_pos]
+        else:
+            path = get_astar_path(start, target, game.grid) or [start]
+        return path, {"nodes_expanded": self.search.nodes - nodes_before}
+
+
+# ==============================================================================
+#  SPEEDUP REPORT
+# ==============================================================================
+BENCH_DEPTH = 28
+BENCH_POSITIONS = [
+    # (prey, monster, prey_turn)
+    ((1, 1), (28, 28), True),
+    ((5, 6), (12, 14), True),
+    ((3, 25), (25, 3), True),
+    ((14, 2), (2, 14), False),
+    ((21, 17), (8, 26), False),
+    ((26, 4), (16, 19), True),
+]
+
+
+def main():
+    graph = grid_graph(GRID_LARGE)
+    reward = graph.index(GOAL_POS_LARGE)
+    positions = [(graph.index(p), graph.index(m), turn) for p, m, turn in BENCH_POSITIONS]
+
+    print(f"Serial alpha-beta, depth {BENCH_DEPTH}, {len(positions)} positions...")
+    t0 = time.perf_counter()
+    serial = []
+    for prey, monster, turn in positions:
+        search = AdversarialSearch(graph, reward, distance_evaluation)
+        serial.append(search.best_move(prey, monster, BENCH_DEPTH, turn))
+    serial_time = time.perf_counter() - t0
+    print(f"  serial: {serial_time:.3f}s")
+
+    print(f"\n{'workers':>7} | {'time (s)':>9} | {'speedup':>7} | {'nodes':>9} | same moves")
+    print("-" * 52)
+    for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+        with ParallelSearch(GRID_LARGE, workers) as search:
+            search.best_move(*positions[0][:2], reward, 1, True)   # start the workers
+            search.nodes = 0
+            t0 = time.perf_counter()
+            results = [search.best_move(prey, monster, reward, BENCH_DEPTH, turn)
+                       for prey, monster, turn in positions]
+            elapsed = time.perf_counter() - t0
+        same = [r[0] for r in results] == [s[0] for s in serial]
+        print(f"{workers:>7} | {elapsed:>9.3f} | {serial_time / elapsed:>6.2f}x | {search.nodes:>9} | {same}")
+
+
+if __name__ == "__main__":
+    profiling.install()
+    main()
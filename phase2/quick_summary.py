@@ -9,6 +9,8 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import profiling
+
 
 def print_header():
     print("\n" + "╔" + "═" * 98 + "╗")
@@ -21,7 +23,8 @@ def display_results():
     try:
         import csv
         
-        csv_path = "/home/lum/AI_Zombie_Project/phase2/metrics.csv"
+        from phase2.metrics_sink import output_path
+        csv_path = output_path("metrics.csv")
         
         with open(csv_path, 'r') as f:
             reader = csv.DictReader(f)
@@ -120,4 +123,5 @@ def main():
 
 
 if __name__ == "__main__":
+    profiling.install()
     main()
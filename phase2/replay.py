@@ -0,0 +1,299 @@
+"""
+Binary replay log: every tick of a ChaseGame, seekable without re-running it.
+
+File layout (little-endian):
+
+    header    HEADER struct: magic, version, grid size and SHA-1, start and
+              reward cells, bytes per path cell, tick count, offset of the
+              tick index (0 until the file is closed)
+    ticks     per tick (tick 0 = the state after reset): one fixed-width
+              RECORD (positions, nodes expanded by each agent's planning call
+              on that tick, path lengths, result so far) followed by both
+              agents' planned paths as cell indices (idx = y * width + x),
+              uint16 on grids of up to 65,536 cells and uint32 above
+    index     one uint64 file offset per tick record, written on close()
+
+Each tick is written and flushed as the game runs, and the header's tick
+count is updated with it, so a recording that crashes is still readable up
+to its last tick. A closed file has the index: reading any tick is one
+lookup and one seek (the file is memory-mapped). An unclosed one is indexed
+by walking its records once when it is opened.
+
+ChaseGame(recorder=ReplayRecorder(path)) records a live game,
+GameSimulator(replay_path=...) a headless one. ReplayGame plays a file back
+with the attributes the pygame scenes draw, and scenario_game() gives every
+scene --record FILE / --replay FILE options.
+
+Usage: python3 phase2/replay.py FILE [TICK]   (summary of a replay, or one tick)
+"""
+
+import sys
+import os
+import mmap
+import struct
+import json
+import hashlib
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import profiling
+from phase2.game_engine import PREY, MONSTER
+
+MAGIC = b"CHRP"
+VERSION = 2
+
+# magic, version, width, height, prey start x/y, monster start x/y, reward x/y,
+# grid SHA-1, bytes per path cell, tick count, tick index offset
+HEADER = struct.Struct("<4sHHHhhhhhh20sBIQ")
+_TICKS_FIELD = HEADER.size - 12          # offset of the tick count inside HEADER
+# tick, prey x/y, monster x/y, prey nodes, monster nodes,
+# prey path length, monster path length, result
+RECORD = struct.Struct("<IhhhhIIIIb")
+INDEX_ENTRY = struct.Struct("<Q")
+
+MAX_SIDE = 0x7FFF                        # coordinates are stored as int16
+_CELL_TYPES = {2: "H", 4: "I"}
+
+_RESULT_CODES = {None: 0, PREY: 1, MONSTER: 2}
+_RESULTS = {code: result for result, code in _RESULT_CODES.items()}
+
+
+def grid_digest(grid):
+    """SHA-1 of a grid's layout (same hash as retrograde.grid_signature, as raw bytes)."""
+    return hashlib.sha1(json.dumps(grid).encode()).digest()
+
+
+def cell_bytes(width, height):
+    """Bytes per stored path cell for a width x height grid; ValueError if it cannot be recorded."""
+    if not (0 < width <= MAX_SIDE and 0 < height <= MAX_SIDE):
+        raise ValueError(f"Cannot record a {width}x{height} grid: sides must be 1..{MAX_SIDE}")
+    return 2 if width * height <= 0x10000 else 4
+
+
+class ReplayRecorder:
+    """Writes one game to a replay file; ChaseGame calls start() on reset and record() per tick."""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+
+    def start(self, game):
+        """(Re)start the file at the game's initial state."""
+        if self.file is not None:
+            self.file.close()
+        width, height = len(game.grid[0]), len(game.grid)
+        self.cell_type = _CELL_TYPES[cell_bytes(width, height)]
+        self.width = width
+        self.game_header = (
+            width, height, *game.prey_start, *game.monster_start, *game.reward_pos,
+            grid_digest(game.grid), cell_bytes(width, height),
+        )
+        self.file = open(self.path, "w+b")
+        self.file.write(HEADER.pack(MAGIC, VERSION, *self.game_header, 0, 0))
+        self.offsets = array("Q")
+        self.ticks = 0
+        self._seen = {PREY: 0, MONSTER: 0}
+        self.record(game)
+
+    def _cells(self, path):
+        width = self.width
+        return array(self.cell_type, (y * width + x for x, y in path))
+
+    def record(self, game):
+        """Append the game's current tick and flush it, tick count included."""
+        nodes = {}
+        for agent in (PREY, MONSTER):
+            new = game.nodes_expanded[agent][self._seen[agent]:]
+            self._seen[agent] += len(new)
+            nodes[agent] = sum(new)
+        prey_cells = self._cells(game.prey_path)
+        monster_cells = self._cells(game.monster_path)
+        f = self.file
+        self.offsets.append(f.tell())
+        f.write(RECORD.pack(
+            game.step_count, *game.prey_pos, *game.monster_pos, nodes[PREY], nodes[MONSTER],
+            len(prey_cells), len(monster_cells), _RESULT_CODES[game.result],
+        ))
+        f.write(prey_cells.tobytes())
+        f.write(monster_cells.tobytes())
+        self.ticks += 1
+        end = f.tell()
+        f.seek(_TICKS_FIELD)
+        f.write(struct.pack("<I", self.ticks))
+        f.seek(end)
+        f.flush()
+
+    def close(self):
+        """Write the tick index and the final header."""
+        if self.file is None:
+            return
+        index_offset = self.file.tell()
+        self.file.write(self.offsets.tobytes())
+        self.file.seek(0)
+        self.file.write(HEADER.pack(MAGIC, VERSION, *self.game_header, self.ticks, index_offset))
+        self.file.close()
+        self.file = None
+
+
+class Replay:
+    """Random-access reader for a replay file (closed, or cut short by a crash)."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self.width, self.height, px, py, mx, my, rx, ry,
+         self.grid_sha1, cell_size, self.ticks, self._index) = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} replay file")
+        if self.ticks == 0:
+            raise ValueError(f"{path} has no ticks")
+        self._cell_size = cell_size
+        self._cell_type = _CELL_TYPES[cell_size]
+        self.closed = self._index != 0
+        self._offsets = None if self.closed else self._walk_records()
+        self.prey_start = [px, py]
+        self.monster_start = [mx, my]
+        self.reward_pos = [rx, ry]
+
+    def _walk_records(self):
+        """Offsets of the first `ticks` records of an unclosed file."""
+        offsets = []
+        offset = HEADER.size
+        for _ in range(self.ticks):
+            offsets.append(offset)
+            fields = RECORD.unpack_from(self._map, offset)
+            offset += RECORD.size + self._cell_size * (fields[7] + fields[8])
+        return offsets
+
+    def __len__(self):
+        return self.ticks
+
+    def _path(self, start, length):
+        cells = array(self._cell_type)
+        cells.frombytes(self._map[start:start + self._cell_size * length])
+        return [(c % self.width, c // self.width) for c in cells]
+
+    def __getitem__(self, tick):
+        """Everything recorded for one tick, as a dict."""
+        if not 0 <= tick < self.ticks:
+            raise IndexError(tick)
+        if self._offsets is None:
+            offset, = INDEX_ENTRY.unpack_from(self._map, self._index + tick * INDEX_ENTRY.size)
+        else:
+            offset = self._offsets[tick]
+        (step, px, py, mx, my, prey_nodes, monster_nodes, prey_len, monster_len,
+         result) = RECORD.unpack_from(self._map, offset)
+        prey_start = offset + RECORD.size
+        monster_start = prey_start + self._cell_size * prey_len
+        return {
+            "step": step,
+            "prey_pos": [px, py],
+            "monster_pos": [mx, my],
+            "prey_nodes": prey_nodes,
+            "monster_nodes": monster_nodes,
+            "prey_path": self._path(prey_start, prey_len),
+            "monster_path": self._path(monster_start, monster_len),
+            "result": _RESULTS[result],
+        }
+
+    def check_grid(self, grid):
+        """Raise ValueError unless the replay was recorded on `grid`."""
+        if grid_digest(grid) != self.grid_sha1:
+            raise ValueError("Replay was recorded on a different grid")
+
+    def close(self):
+        self._map.close()
+
+
+class ReplayGame:
+    """Plays a replay back with the ChaseGame attributes the pygame scenes draw."""
+
+    def __init__(self, path, grid=None):
+        self.replay = Replay(path)
+        if grid is not None:
+            self.replay.check_grid(grid)
+        self.reward_pos = self.replay.reward_pos
+        self.max_steps = None
+        self.reset()
+
+    def reset(self):
+        self.paused = False
+        self.seek(0)
+
+    def seek(self, tick):
+        """Jump to any recorded tick."""
+        self.tick_index = tick
+        rec = self.replay[tick]
+        self.step_count = rec["step"]
+        self.prey_pos = rec["prey_pos"]
+        self.monster_pos = rec["monster_pos"]
+        self.prey_path = rec["prey_path"]
+        self.monster_path = rec["monster_path"]
+        self.result = rec["result"]
+
+    def tick(self):
+        if self.paused or self.tick_index + 1 >= len(self.replay):
+            return
+        self.seek(self.tick_index + 1)
+
+    @property
+    def timed_out(self):
+        return self.result is None and self.tick_index + 1 >= len(self.replay)
+
+    @property
+    def prey_dist(self):
+        return max(0, len(self.prey_path) - 1)
+
+    @property
+    def monster_dist(self):
+        return max(0, len(self.monster_path) - 1)
+
+
+def scenario_game(make_game, grid, argv=None):
+    """
+    The game a pygame scenario plays, from its command line.
+
+      --replay FILE   play FILE back (no pathfinding)
+      --record FILE   play live and write every tick to FILE
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--replay", metavar="FILE", help="play a recorded game back")
+    group.add_argument("--record", metavar="FILE", help="record the game to a replay file")
+    args = parser.parse_args(argv)
+
+    if args.replay:
+        return ReplayGame(args.replay, grid)
+    game = make_game()
+    if args.record:
+        import atexit
+        game.recorder = ReplayRecorder(args.record)
+        game.recorder.start(game)
+        atexit.register(game.recorder.close)
+    return game
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python3 phase2/replay.py FILE [TICK]")
+        sys.exit(1)
+    replay = Replay(sys.argv[1])
+    if len(sys.argv) > 2:
+        for key, value in replay[int(sys.argv[2])].items():
+            print(f"{key:<14} {value}")
+        return
+    last = replay[len(replay) - 1]
+    print(f"{replay.width}x{replay.height} grid, {len(replay)} ticks, result: {last['result'] or 'none'}"
+          + ("" if replay.closed else " (recording was not closed)"))
+    print(f"prey {replay.prey_start} -> reward {replay.reward_pos}, monster {replay.monster_start}")
+    prey_nodes = sum(replay[i]["prey_nodes"] for i in range(len(replay)))
+    monster_nodes = sum(replay[i]["monster_nodes"] for i in range(len(replay)))
+    print(f"nodes expanded: prey {prey_nodes}, monster {monster_nodes}")
+
+
+if __name__ == "__main__":
+    profiling.install()
+    main()
@@ -0,0 +1,307 @@
+"""
+Retrograde solver: exact tablebase for the single-prey / single-monster chase.
+
+Solves the alternating-turn game searched by minimax_both_players on a whole
+grid: prey moves, then monster, and so on. Prey wins on reaching the reward
+(checked first); the monster wins when both share a cell. States are
+(side to move, prey cell, monster cell). On GRID_LARGE that is 2 * 900 * 900
+= 1.62M states.
+
+Backward induction runs layer by layer over the whole state space in NumPy.
+A state first decided in layer k is won or lost in exactly k plies:
+  - the side to move WINS if any successor is already won for it
+  - the side to move LOSES if every successor is already lost for it
+States never decided are draws (neither side can force a result).
+
+The result is a structured .npy file opened with mmap, so agents pay one
+lookup per move:
+
+    outcome    int8   +1 prey wins, -1 monster wins, 0 draw
+    distance   int16  plies to the end under perfect play (-1 for draws)
+    best_move  int32  cell index the side to move should step to (-1 if none)
+
+Usage: python3 phase2/retrograde.py
+"""
+
+import sys
+import os
+import json
+import time
+import random
+import hashlib
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import profiling
+from config import GRID_LARGE, GOAL_POS_LARGE
+from phase2.game_engine import (
+    PREY, INF, grid_graph, AdversarialSearch, distance_evaluation,
+)
+from phase2.grid_arrays import padded_moves
+
+PREY_TO_MOVE = 0
+MONSTER_TO_MOVE = 1
+
+PREY_WINS = 1
+DRAW = 0
+MONSTER_WINS = -1
+
+TABLE_DTYPE = np.dtype([("outcome", "i1"), ("distance", "i2"), ("best_move", "i4")])
+
+TABLEBASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tablebases")
+
+
+def grid_signature(grid):
+    """Stable hash of a grid's layout, stored with a tablebase to catch stale files."""
+    return hashlib.sha1(json.dumps(grid).encode()).hexdigest()
+
+
+def _solve_arrays(graph, reward):
+    """Backward induction. Returns (outcome, distance, best_move) arrays of shape (2, N, N)."""
+    n = graph.size
+    nbr, mask, open_cells = padded_moves(graph)
+    valid = open_cells[:, None] & open_cells[None, :]
+
+    outcome = np.zeros((2, n, n), dtype=np.int8)
+    distance = np.full((2, n, n), -1, dtype=np.int16)
+
+    # Terminal states: capture, then reward (reward is checked first so it wins ties)
+    cells = np.flatnonzero(open_cells)
+    outcome[:, cells, cells] = MONSTER_WINS
+    outcome[:, reward, :] = np.where(open_cells, PREY_WINS, DRAW)
+    outcome[:, ~valid] = DRAW
+    distance[outcome != DRAW] = 0
+
+    prey_mask = mask[:, :, None]       # broadcast over monster cells  (N, 4, 1)
+    monster_mask = mask[None, :, :]    # broadcast over prey cells     (1, N, 4)
+
+    ply = 0
+    while True:
+        ply += 1
+        prey_side = outcome[PREY_TO_MOVE]
+        monster_side = outcome[MONSTER_TO_MOVE]
+
+        # Prey to move: successors are (nbr[p], m) with the monster to move
+        succ = monster_side[nbr]                                   # (N, 4, N)
+        prey_wins = ((succ == PREY_WINS) & prey_mask).any(axis=1)
+        prey_loses = ((succ == MONSTER_WINS) | ~prey_mask).all(axis=1)
+        open_prey = valid & (prey_side == DRAW)
+        new_prey_win = open_prey & prey_wins
+        new_prey_loss = open_prey & prey_loses & ~prey_wins
+
+        # Monster to move: successors are (p, nbr[m]) with the prey to move
+        succ = prey_side[:, nbr]                                   # (N, N, 4)
+        monster_wins = ((succ == MONSTER_WINS) & monster_mask).any(axis=2)
+        monster_loses = ((succ == PREY_WINS) | ~monster_mask).all(axis=2)
+        open_monster = valid & (monster_side == DRAW)
+        new_monster_win = open_monster & monster_wins
+        new_monster_loss = open_monster & monster_loses & ~monster_wins
+
+        if not (new_prey_win.any() or new_prey_loss.any()
+                or new_monster_win.any() or new_monster_loss.any()):
+            break
+
+        prey_side[new_prey_win] = PREY_WINS
+        prey_side[new_prey_loss] = MONSTER_WINS
+        distance[PREY_TO_MOVE][new_prey_win | new_prey_loss] = ply
+        monster_side[new_monster_win] = MONSTER_WINS
+        monster_side[new_monster_loss] = PREY_WINS
+        distance[MONSTER_TO_MOVE][new_monster_win | new_monster_loss] = ply
+
+    best_move = _best_moves(outcome, distance, nbr, mask)
+    terminal = distance == 0
+    best_move[terminal | ~valid[None]] = -1
+    return outcome, distance, best_move
+
+
+def _best_moves(outcome, distance, nbr, mask):
+    """
+    Perfect-play move for every state: the fastest win, else a draw, else the slowest loss.
+    Ties go to the first move in Down, Up, Right, Left order.
+    """
+    n = nbr.shape[0]
+    big = np.int32(1 << 16)
+    best_move = np.empty(outcome.shape, dtype=np.int32)
+
+    # Score of a successor for the side to move: win > draw (0) > loss
+    o = outcome[MONSTER_TO_MOVE][nbr].astype(np.int32)             # (N, 4, N)
+    d = distance[MONSTER_TO_MOVE][nbr].astype(np.int32)
+    score = np.where(mask[:, :, None], o * (big - d), -2 * big)
+    choice = score.argmax(axis=1)                                  # (N, N)
+    best_move[PREY_TO_MOVE] = nbr[np.arange(n)[:, None], choice]
+
+    o = outcome[PREY_TO_MOVE][:, nbr].astype(np.int32)              # (N, N, 4)
+    d = distance[PREY_TO_MOVE][:, nbr].astype(np.int32)
+    score = np.where(mask[None, :, :], -o * (big - d), -2 * big)
+    choice = score.argmax(axis=2)                                  # (N, N)
+    best_move[MONSTER_TO_MOVE] = nbr[np.arange(n)[None, :], choice]
+    return best_move
+
+
+class Tablebase:
+    """Solved chase game for one grid and reward cell, backed by a (memory-mapped) table."""
+
+    def __init__(self, grid, reward_pos, table):
+        self.grid = grid
+        self.graph = grid_graph(grid)
+        self.reward_pos = tuple(reward_pos)
+        self.table = table      # TABLE_DTYPE array of shape (2, N, N)
+
+    @classmethod
+    def solve(cls, grid, reward_pos):
+        """Run the retrograde analysis in memory."""
+        graph = grid_graph(grid)
+        outcome, distance, best_move = _solve_arrays(graph, graph.index(reward_pos))
+        table = np.empty(outcome.shape, dtype=TABLE_DTYPE)
+        table["outcome"] = outcome
+        table["distance"] = distance
+        table["best_move"] = best_move
+        return cls(grid, reward_pos, table)
+
+    def save(self, path):
+        """Write the table as a .npy file (plus a .json sidecar describing the grid)."""
+        out = np.lib.format.open_memmap(path, mode="w+", dtype=TABLE_DTYPE, shape=self.table.shape)
+        out[...] = self.table
+        out.flush()
+        del out
+        with open(path + ".json", "w") as f:
+            json.dump({
+                "width": self.graph.width,
+                "height": self.graph.height,
+                "reward": list(self.reward_pos),
+                "grid_sha1": grid_signature(self.grid),
+            }, f)
+
+    @classmethod
+    def load(cls, path, grid):
+        """Memory-map a saved tablebase. Raises ValueError if it was built for another grid."""
+        with open(path + ".json") as f:
+            meta = json.load(f)
+        if meta["grid_sha1"] != grid_signature(grid):
+            raise ValueError(f"Tablebase {path} was built for a different grid")
+        table = np.load(path, mmap_mode="r")
+        return cls(grid, meta["reward"], table)
+
+    def lookup(self, prey_pos, monster_pos, prey_turn):
+        """(outcome, distance, best_move_pos or None) for a position."""
+        graph = self.graph
+        rec = self.table[PREY_TO_MOVE if prey_turn else MONSTER_TO_MOVE,
+                         graph.index(prey_pos), graph.index(monster_pos)]
+        best = int(rec["best_move"])
+        return int(rec["outcome"]), int(rec["distance"]), graph.position(best) if best >= 0 else None
+
+    def best_move(self, prey_pos, monster_pos, prey_turn):
+        """Perfect-play next cell for the side to move, or None if the game is over."""
+        graph = self.graph
+        best = int(self.table["best_move"][PREY_TO_MOVE if prey_turn else MONSTER_TO_MOVE,
+                                           graph.index(prey_pos), graph.index(monster_pos)])
+        return graph.position(best) if best >= 0 else None
+
+
+def default_path(grid, reward_pos):
+    """Cache file location for a grid/reward pair under phase2/tablebases/."""
+    return os.path.join(TABLEBASE_DIR, f"{grid_signature(grid)[:12]}_{reward_pos[0]}_{reward_pos[1]}.npy")
+
+
+def load_or_solve(grid, reward_pos, path=None):
+    """Open the cached tablebase for this grid/reward, solving and saving it on first use."""
+    path = path or default_path(grid, reward_pos)
+    if os.path.exists(path) and os.path.exists(path + ".json"):
+        return Tablebase.load(path, grid)
+    tablebase = Tablebase.solve(grid, reward_pos)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tablebase.save(path)
+    return Tablebase.load(path, grid)
+
+
+class TablebasePolicy:
+    """Perfect play from the tablebase: one lookup per move."""
+
+    def __init__(self, tablebase=None):
+        self.tablebase = tablebase
+
+    def plan(self, game, agent):
+        tb = self.tablebase
+        if tb is None or tb.grid is not game.grid or tb.reward_pos != tuple(game.reward_pos):
+            tb = self.tablebase = load_or_solve(game.grid, game.reward_pos)
+        start = tuple(game.prey_pos if agent == PREY else game.monster_pos)
+        move = tb.best_move(game.prey_pos, game.monster_pos, agent == PREY)
+        return ([start, move] if move is not None else [start]), {"nodes_expanded": 1}
+
+
+def compare_with_minimax(tablebase, depth, samples=500, seed=0):
+    """
+    Check depth-limited minimax (AdversarialSearch + distance_evaluation) against ground truth.
+
+    Returns counts over `samples` random non-terminal positions:
+      forced           - minimax reported a forced result (score +/-inf)
+      forced_correct   - ...and the tablebase agrees within `depth` plies
+      optimal_moves    - minimax's move keeps the position's true outcome
+    """
+    graph = tablebase.graph
+    reward = graph.index(tablebase.reward_pos)
+    cells = [i for i in range(graph.size) if graph.moves[i]]
+    rng = random.Random(seed)
+    stats = {"positions": 0, "forced": 0, "forced_correct": 0, "optimal_moves": 0}
+
+    while stats["positions"] < samples:
+        prey, monster = rng.sample(cells, 2)
+        if prey == reward:
+            continue
+        prey_turn = rng.random() < 0.5
+        side = PREY_TO_MOVE if prey_turn else MONSTER_TO_MOVE
+        rec = tablebase.table[side, prey, monster]
+        stats["positions"] += 1
+
+        search = AdversarialSearch(graph, reward, distance_evaluation)
+        move, score = search.best_move(prey, monster, depth, prey_turn)
+
+        if score in (INF, -INF):
+            stats["forced"] += 1
+            expected = PREY_WINS if score == INF else MONSTER_WINS
+            if rec["outcome"] == expected and rec["distance"] <= depth:
+                stats["forced_correct"] += 1
+
+        if move is not None:
+            nxt = (move, monster) if prey_turn else (prey, move)
+            child = tablebase.table[1 - side, nxt[0], nxt[1]]
+            if child["outcome"] == rec["outcome"]:
+                stats["optimal_moves"] += 1
+
+    return stats
+
+
+def main():
+    print(f"Solving GRID_LARGE chase with reward at {GOAL_POS_LARGE}...")
+    t0 = time.time()
+    tablebase = Tablebase.solve(GRID_LARGE, GOAL_POS_LARGE)
+    print(f"Solved in {time.time() - t0:.2f}s")
+
+    path = default_path(GRID_LARGE, GOAL_POS_LARGE)
+    os.makedirs(TABLEBASE_DIR, exist_ok=True)
+    tablebase.save(path)
+    print(f"Wrote tablebase to {path}")
+
+    tablebase = Tablebase.load(path, GRID_LARGE)
+    outcome = tablebase.table["outcome"]
+    decided = tablebase.table["distance"] >= 0
+    print(f"Prey wins: {int((outcome == PREY_WINS).sum())}  "
+          f"Monster wins: {int((outcome == MONSTER_WINS).sum())}  "
+          f"Undecided/draw or invalid: {int((~decided).sum())}")
+
+    from config import PLAYER_START_POS_LARGE, GRID_WIDTH_LARGE, GRID_HEIGHT_LARGE
+    monster_start = [GRID_WIDTH_LARGE - 2, GRID_HEIGHT_LARGE - 2]
+    result, dist, move = tablebase.lookup(PLAYER_START_POS_LARGE, monster_start, True)
+    label = {PREY_WINS: "prey wins", MONSTER_WINS: "monster wins", DRAW: "draw"}[result]
+    print(f"Standard start: {label} (distance {dist}), prey's best move {move}")
+
+    for depth in (2, 3, 4):
+        stats = compare_with_minimax(tablebase, depth)
+        print(f"Minimax depth {depth}: {stats}")
+
+
+if __name__ == "__main__":
+    profiling.install()
+    main()
@@ -7,7 +7,9 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import profiling
 from phase2.compare_algorithms import run_all_scenarios, print_comparison_table
+from phase2.metrics_sink import output_path
 
 
 def create_summary_report(metrics_list):
@@ -75,11 +77,11 @@ def create_summary_report(metrics_list):
     return report
 
 
-def save_summary(metrics_list):
-    """Save summary to file."""
+def save_summary(metrics_list, out_dir=None):
+    """Save summary to COMPARISON_RESULTS.txt in the output directory."""
     report = create_summary_report(metrics_list)
     
-    report_path = "/home/lum/AI_Zombie_Project/phase2/COMPARISON_RESULTS.txt"
+    report_path = output_path("COMPARISON_RESULTS.txt", out_dir)
     with open(report_path, "w") as f:
         f.write(report)
     
@@ -88,6 +90,7 @@ def save_summary(metrics_list):
 
 
 if __name__ == "__main__":
+    profiling.install()
     print("Gathering metrics...\n")
     metrics = run_all_scenarios()
     print_comparison_table(metrics)
@@ -0,0 +1,314 @@
+"""
+Round-robin tournament: every prey agent against every monster agent.
+
+Each pairing plays the same seeded placements on GRID_LARGE (see
+batch_runner.random_placement), so every agent faces an identical set of
+positions. Games run on a process pool in chunks (batch_runner.run_chunks).
+
+Ratings are Bradley-Terry strengths fitted by minorization-maximization
+(Hunter 2004) over all agents of both roles at once, with a timeout counted
+as half a win for each side, and reported on the Elo scale (400 * log10,
+mean 1500). Every pairing also gets one virtual drawn game so that an agent
+that never wins still has a finite rating. The 95% intervals come from a
+bootstrap: games are resampled with replacement within each pairing and the
+ratings refitted.
+
+Alongside each rating is the agent's decision cost: mean and p99 ms per
+move from the latency histograms of all its games merged, and nodes
+expanded per move. The report
+ends with the strongest agent of each role under a range of per-move CPU
+budgets.
+
+Usage:
+    python3 phase2/tournament.py                   # 20 placements per pairing
+    python3 phase2/tournament.py --games 200 --workers 8
+    python3 phase2/tournament.py --mcts            # add the time-budgeted MCTS prey
+"""
+
+import sys
+import os
+import math
+import time
+import random
+import argparse
+import csv
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import profiling
+from config import GRID_LARGE
+from phase2.compare_algorithms import GameSimulator
+from phase2.batch_runner import random_placement, run_chunks, DEFAULT_MAX_STEPS
+from phase2.metrics_sink import output_path
+from phase2.game_engine import PREY, MONSTER
+from phase2.latency import LatencyHistogram
+
+DEFAULT_GAMES = 20
+DEFAULT_BOOTSTRAP = 200
+BASE_RATING = 1500
+BUDGETS_MS = (0.05, 0.2, 1.0, 5.0, 20.0)
+
+# (label, GameSimulator algorithm, depth, time budget in ms)
+PREY_AGENTS = [
+    ("A*", "astar", None, None),
+    ("bounded A* d=60", "minimax", 60, None),   # depth >= GRID_LARGE's diameter (58): always reaches the target
+    ("evasive d=2", "evasive", 2, None),
+    ("evasive d=4", "evasive", 4, None),
+    ("minimax d=2", "adversarial", 2, None),
+    ("minimax d=4", "adversarial", 4, None),
+    ("expectimax d=3", "expectimax", 3, None),
+]
+MCTS_PREY = ("MCTS 10ms", "mcts", None, 10)
+
+MONSTER_AGENTS = [
+    ("A*", "astar", None, None),
+    ("ambush", "ambush", None, None),
+    ("minimax d=2", "adversarial", 2, None),
+    ("minimax d=4", "adversarial", 4, None),
+    ("expectimax d=3", "expectimax", 3, None),
+]
+
+# Score of a game from the prey's side
+_SCORES = {"prey": 1.0, "monster": 0.0, None: 0.5}
+
+
+def _play_chunk(jobs, prey_agents, monster_agents, max_steps):
+    """
+    Worker: play (prey index, monster index, seed) jobs.
+
+    Returns (i, j, seed, GameMetrics, {agent: LatencyHistogram}) per game;
+    the histograms let the parent pool decision times across games.
+    """
+    rows = []
+    for i, j, seed in jobs:
+        prey_label, prey_alg, prey_depth, prey_budget = prey_agents[i]
+        monster_label, monster_alg, monster_depth, monster_budget = monster_agents[j]
+        prey, monster, reward = random_placement(GRID_LARGE, seed)
+        sim = GameSimulator(
+            f"{prey_label} vs {monster_label}", prey_alg, monster_alg,
+            prey_depth=prey_depth, monster_depth=monster_depth,
+            prey_time_budget=prey_budget, monster_time_budget=monster_budget,
+            max_steps=max_steps, prey_start=prey, monster_start=monster, reward_pos=reward,
+        )
+        m = sim.run()
+        game = getattr(sim, "game", None)
+        latency = game.latency if game is not None else {PREY: LatencyHistogram(), MONSTER: LatencyHistogram()}
+        rows.append((i, j, seed, m, latency))
+    return rows
+
+
+def fit_bradley_terry(players, results, iterations=1000, tol=1e-9):
+    """
+    Bradley-Terry strengths by minorization-maximization.
+
+    results: {(a, b): [score of a per game]} with scores in {0, 0.5, 1}.
+    Returns {player: Elo-scale rating}, centred on BASE_RATING.
+    """
+    wins = {p: 0.0 for p in players}
+    games = {}
+    for (a, b), scores in results.items():
+        total = sum(scores) + 0.5          # plus one virtual draw per pairing
+        n = len(scores) + 1
+        wins[a] += total
+        wins[b] += n - total
+        games[a, b] = games[b, a] = games.get((a, b), 0) + n
+    opponents = {p: [] for p in players}
+    for (a, b), n in games.items():
+        opponents[a].append((b, n))
+
+    strength = {p: 1.0 for p in players}
+    for _ in range(iterations):
+        new = {}
+        for p in players:
+            denom = sum(n / (strength[p] + strength[q]) for q, n in opponents[p])
+            new[p] = wins[p] / denom if denom else strength[p]
+        scale = math.exp(sum(math.log(s) for s in new.values()) / len(new))
+        new = {p: s / scale for p, s in new.items()}
+        change = max(abs(math.log(new[p] / strength[p])) for p in players)
+        strength = new
+        if change < tol:
+            break
+    return {p: BASE_RATING + 400 * math.log10(s) for p, s in strength.items()}
+
+
+def bootstrap_intervals(players, results, samples=DEFAULT_BOOTSTRAP, seed=0):
+    """95% intervals {player: (low, high)} from refits on games resampled within each pairing."""
+    rng = random.Random(seed)
+    draws = {p: [] for p in players}
+    for _ in range(samples):
+        resampled = {pair: rng.choices(scores, k=len(scores)) for pair, scores in results.items()}
+        for p, r in fit_bradley_terry(players, resampled).items():
+            draws[p].append(r)
+    intervals = {}
+    for p, rs in draws.items():
+        rs.sort()
+        intervals[p] = (rs[int(0.025 * (len(rs) - 1))], rs[int(0.975 * (len(rs) - 1))])
+    return intervals
+
+
+class DecisionCost:
+    """Per-agent decision times pooled over all games (one histogram), and nodes per move."""
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.nodes = 0
+
+    def add(self, latency, nodes):
+        self.latency.merge(latency)
+        self.nodes += nodes
+
+    @property
+    def moves(self):
+        return self.latency.count
+
+    @property
+    def mean_ms(self):
+        return self.latency.mean / 1e6
+
+    @property
+    def p99_ms(self):
+        """99th percentile of every decision the agent made, across all its games."""
+        return self.latency.percentile(99) / 1e6
+
+    @property
+    def nodes_per_move(self):
+        return self.nodes / self.moves if self.moves else 0.0
+
+
+def run_tournament(prey_agents, monster_agents, games, workers=None, max_steps=DEFAULT_MAX_STEPS,
+                   first_seed=0):
+    """
+    Play every pairing on `games` placements.
+
+    Returns (results, costs, records): results is {(prey key, monster key):
+    [prey score per game]}, costs {key: DecisionCost}, and records the
+    per-pairing win/draw/loss counts. Keys are ("prey", label) /
+    ("monster", label) so the two roles can share a label.
+    """
+    jobs = [(i, j, seed) for seed in range(first_seed, first_seed + games)
+            for i in range(len(prey_agents)) for j in range(len(monster_agents))]
+    results = {}
+    costs = {}
+    records = {}
+    done = 0
+    t0 = time.perf_counter()
+    report_every = max(1, len(jobs) // 10)
+    for i, j, seed, m, latency in run_chunks(_play_chunk, jobs, prey_agents, monster_agents, max_steps,
+                                    workers=workers):
+        prey = ("prey", prey_agents[i][0])
+        monster = ("monster", monster_agents[j][0])
+        results.setdefault((prey, monster), []).append(_SCORES[m.winner])
+        record = records.setdefault((prey, monster), {"prey": 0, "monster": 0, None: 0})
+        record[m.winner] += 1
+        costs.setdefault(prey, DecisionCost()).add(latency[PREY], m.prey_nodes_expanded)
+        costs.setdefault(monster, DecisionCost()).add(latency[MONSTER], m.monster_nodes_expanded)
+        done += 1
+        if done % report_every == 0:
+            elapsed = time.perf_counter() - t0
+            print(f"  {done:>6}/{len(jobs)} games  {done / elapsed:7.1f} games/sec")
+    return results, costs, records
+
+
+def _pareto(rows):
+    """Labels of the agents no other agent beats on both rating and cost."""
+    front = set()
+    for label, rating, cost in rows:
+        if not any(r > rating and c <= cost or r >= rating and c < cost for _, r, c in rows):
+            front.add(label)
+    return front
+
+
+def print_report(role, agents, ratings, intervals, costs):
+    rows = [(label, ratings[role, label], costs[role, label].mean_ms) for label, *_ in agents]
+    front = _pareto(rows)
+    print(f"\n{role.upper()} AGENTS")
+    print(f"{'agent':<18} | {'rating':>6} | {'95% CI':>13} | {'ms/move':>8} | {'p99 ms':>8} | {'nodes/move':>10} | pareto")
+    print("-" * 88)
+    for label, rating, _ in sorted(rows, key=lambda r: -r[1]):
+        low, high = intervals[role, label]
+        cost = costs[role, label]
+        print(f"{label:<18} | {rating:>6.0f} | {low:>6.0f}-{high:<6.0f} | {cost.mean_ms:>8.3f} | "
+              f"{cost.p99_ms:>8.3f} | {cost.nodes_per_move:>10.1f} | {'*' if label in front else ''}")
+
+
+def best_per_budget(role, agents, ratings, costs, budgets=BUDGETS_MS):
+    """[(budget ms, label or None)]: the highest-rated agent whose mean ms/move fits each budget."""
+    picks = []
+    for budget in budgets:
+        fitting = [label for label, *_ in agents if costs[role, label].mean_ms <= budget]
+        picks.append((budget, max(fitting, key=lambda l: ratings[role, l]) if fitting else None))
+    return picks
+
+
+def print_pairings(prey_agents, monster_agents, records):
+    """Prey win / timeout / monster win counts for every pairing."""
+    width = max(len(label) for label, *_ in monster_agents) + 2
+    corner = "prey \\ monster"
+    print(f"\n{corner:<18}" + "".join(f"{label:>{max(width, 12)}}" for label, *_ in monster_agents))
+    for prey_label, *_ in prey_agents:
+        cells = []
+        for monster_label, *_ in monster_agents:
+            r = records[("prey", prey_label), ("monster", monster_label)]
+            cells.append(f"{r['prey']}/{r[None]}/{r['monster']}")
+        print(f"{prey_label:<18}" + "".join(f"{c:>{max(width, 12)}}" for c in cells))
+    print("(prey wins / timeouts / monster wins)")
+
+
+def save_ratings(path, agents_by_role, ratings, intervals, costs):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Role", "Agent", "Rating", "CI_Low", "CI_High", "Mean_ms", "P99_ms", "Nodes_per_move"])
+        for role, agents in agents_by_role:
+            for label, *_ in agents:
+                key = (role, label)
+                cost = costs[key]
+                writer.writerow([role, label, f"{ratings[key]:.1f}", f"{intervals[key][0]:.1f}",
+                                 f"{intervals[key][1]:.1f}", f"{cost.mean_ms:.4f}", f"{cost.p99_ms:.4f}",
+                                 f"{cost.nodes_per_move:.1f}"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Round-robin prey vs monster tournament with ratings.")
+    parser.add_argument("--games", type=int, default=DEFAULT_GAMES, help="placements (seeds) per pairing")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--max-steps", type=int, default=DEFAULT_MAX_STEPS)
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--bootstrap", type=int, default=DEFAULT_BOOTSTRAP, help="resamples for the intervals")
+    parser.add_argument("--mcts", action="store_true", help=f"add the {MCTS_PREY[0]} prey")
+    parser.add_argument("--output-dir", default=None, help="where to write tournament.csv (default: phase2/)")
+    args = parser.parse_args()
+
+    prey_agents = PREY_AGENTS + ([MCTS_PREY] if args.mcts else [])
+    monster_agents = MONSTER_AGENTS
+    pairings = len(prey_agents) * len(monster_agents)
+    print(f"{len(prey_agents)} prey x {len(monster_agents)} monster agents, {args.games} placements each: "
+          f"{pairings * args.games} games on {args.workers or os.cpu_count()} workers...")
+    t0 = time.perf_counter()
+    results, costs, records = run_tournament(prey_agents, monster_agents, args.games, args.workers,
+                                             args.max_steps, args.first_seed)
+    print(f"Played in {time.perf_counter() - t0:.1f}s")
+
+    players = [("prey", label) for label, *_ in prey_agents] + [("monster", label) for label, *_ in monster_agents]
+    ratings = fit_bradley_terry(players, results)
+    intervals = bootstrap_intervals(players, results, args.bootstrap)
+
+    print_pairings(prey_agents, monster_agents, records)
+    print_report("prey", prey_agents, ratings, intervals, costs)
+    print_report("monster", monster_agents, ratings, intervals, costs)
+
+    print("\nSTRONGEST AGENT PER CPU BUDGET (mean ms per move)")
+    print(f"{'budget':>8} | {'prey':<18} | {'monster':<18}")
+    print("-" * 50)
+    prey_picks = best_per_budget("prey", prey_agents, ratings, costs)
+    monster_picks = best_per_budget("monster", monster_agents, ratings, costs)
+    for (budget, prey), (_, monster) in zip(prey_picks, monster_picks):
+        print(f"{budget:>8g} | {prey or '-':<18} | {monster or '-':<18}")
+
+    path = output_path("tournament.csv", args.output_dir)
+    save_ratings(path, [("prey", prey_agents), ("monster", monster_agents)], ratings, intervals, costs)
+    print(f"\nRatings saved to {path}")
+
+
+if __name__ == "__main__":
+    profiling.install()
+    main()
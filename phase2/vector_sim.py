@@ -0,0 +1,227 @@
+"""
+Lockstep simulation of many independent prey/monster games in NumPy.
+
+GameSimulator plays one game at a time and pays Python overhead on every
+step. For policies that reduce to table lookups this module advances a whole
+batch of games per step instead: positions, rewards and results are arrays,
+and each step is a handful of fancy-indexing operations over the games still
+running.
+
+Policies (prey / monster):
+  "astar"    step along a shortest path: prey to its reward, monster to the
+             prey (next-hop table, first of Down, Up, Right, Left on ties)
+  "greedy"   prey only: maximize (maze distance to monster) - (maze distance
+             to reward), the one-ply greedy move of phase2/mcts.py playouts
+  "random"   uniformly random legal move
+
+Rules match ChaseGame: both agents pick a move from the current position,
+then both move; the prey wins on reaching the reward (checked first), the
+monster on sharing the prey's cell. Games still running after `max_steps`
+are timeouts.
+
+The next-hop table can differ from utils.get_astar_path where several
+shortest paths tie, so individual games may diverge from GameSimulator
+while the policies are the same.
+
+Usage: python3 phase2/vector_sim.py   (100k random games per policy pair)
+"""
+
+import sys
+import os
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import profiling
+from config import GRID_LARGE
+from phase2.game_engine import grid_graph
+from phase2.grid_arrays import padded_moves, distance_matrix
+
+PREY_POLICIES = ("astar", "greedy", "random")
+MONSTER_POLICIES = ("astar", "random")
+
+RUNNING = 0
+PREY_WINS = 1
+MONSTER_WINS = -1
+
+_NEXT_HOPS = {}
+
+
+def next_hop_table(graph):
+    """
+    (N, N) int32 table: next_hop[a, b] is the cell after `a` on a shortest path to `b`.
+
+    `a` itself if a == b or `b` is unreachable. Cached per graph (read-only).
+    """
+    entry = _NEXT_HOPS.get(id(graph))
+    if entry is None or entry[0] is not graph:
+        nbr, mask, _ = padded_moves(graph)
+        dist = distance_matrix(graph)
+        n = graph.size
+        far = np.int32(n)
+        best = np.where(dist >= 0, dist, far)              # staying put: current distance
+        hop = np.repeat(np.arange(n, dtype=np.int32)[:, None], n, axis=1)
+        for k in range(4):
+            d = dist[nbr[:, k]]                            # (N, N): from the k-th step to every b
+            d = np.where((d >= 0) & mask[:, k, None], d, far)
+            better = d < best
+            best = np.where(better, d, best)
+            hop = np.where(better, nbr[:, k, None].astype(np.int32), hop)
+        hop.flags.writeable = False
+        entry = _NEXT_HOPS[id(graph)] = (graph, hop)
+    return entry[1]
+
+
+def random_starts(graph, episodes, min_separation=10, seed=0):
+    """
+    (prey, monster, reward) cell-index arrays for `episodes` games.
+
+    Cells are open, connected and pairwise at least `min_separation` maze
+    steps apart (drawn by rejection sampling in batches).
+    """
+    rng = np.random.default_rng(seed)
+    _, _, open_cells = padded_moves(graph)
+    dist = distance_matrix(graph)
+    cells = np.flatnonzero(open_cells)
+    picks = []
+    count = 0
+    while count < episodes:
+        draw = cells[rng.integers(0, len(cells), size=(3, 2 * (episodes - count) + 16))]
+        p, m, r = draw
+        ok = ((dist[p, r] >= min_separation) & (dist[p, m] >= min_separation)
+              & (dist[m, r] >= min_separation))
+        picks.append(draw[:, ok])
+        count += int(ok.sum())
+    prey, monster, reward = np.concatenate(picks, axis=1)[:, :episodes]
+    return prey, monster, reward
+
+
+class VectorSim:
+    """Batched ChaseGame for table-lookup policies on one grid."""
+
+    def __init__(self, grid, prey_policy="astar", monster_policy="astar", seed=0):
+        if prey_policy not in PREY_POLICIES:
+            raise ValueError(f"Unknown prey policy: {prey_policy}")
+        if monster_policy not in MONSTER_POLICIES:
+            raise ValueError(f"Unknown monster policy: {monster_policy}")
+        self.grid = grid
+        self.graph = grid_graph(grid)
+        self.prey_policy = prey_policy
+        self.monster_policy = monster_policy
+        self.rng = np.random.default_rng(seed)
+        self.nbr, self.mask, _ = padded_moves(self.graph)
+        self.dist = distance_matrix(self.graph)
+        self.next_hop = next_hop_table(self.graph)
+
+    def _random_moves(self, cells):
+        noise = np.where(self.mask[cells], self.rng.random((len(cells), 4)), -1.0)
+        return self.nbr[cells, noise.argmax(axis=1)]
+
+    def _prey_moves(self, prey, monster, reward):
+        if self.prey_policy == "astar":
+            return self.next_hop[prey, reward]
+        if self.prey_policy == "random":
+            return self._random_moves(prey)
+        far = self.graph.size
+        cand = self.nbr[prey]                                   # (L, 4)
+        d_monster = self.dist[cand, monster[:, None]]
+        d_reward = self.dist[cand, reward[:, None]]
+        score = np.where(d_monster < 0, far, d_monster) - np.where(d_reward < 0, far, d_reward)
+        score = np.where(self.mask[prey], score, -4 * far)
+        return cand[np.arange(len(prey)), score.argmax(axis=1)]
+
+    def _monster_moves(self, prey, monster):
+        if self.monster_policy == "astar":
+            return self.next_hop[monster, prey]
+        return self._random_moves(monster)
+
+    def run(self, prey, monster, reward, max_steps=500):
+        """
+        Play one game per entry of the (prey, monster, reward) cell-index arrays.
+
+        Returns (result, steps): int8 results (PREY_WINS, MONSTER_WINS, or
+        RUNNING for a timeout) and the step each game ended on.
+        """
+        prey = np.array(prey, dtype=np.int64)
+        monster = np.array(monster, dtype=np.int64)
+        reward = np.asarray(reward, dtype=np.int64)
+        n = len(prey)
+        result = np.full(n, RUNNING, dtype=np.int8)
+        steps = np.full(n, max_steps, dtype=np.int32)
+
+        live = np.flatnonzero((prey != reward) & (prey != monster))
+        result[prey == reward] = PREY_WINS
+        result[(prey == monster) & (prey != reward)] = MONSTER_WINS
+        steps[result != RUNNING] = 0
+
+        for step in range(1, max_steps + 1):
+            if live.size == 0:
+                break
+            p, m, r = prey[live], monster[live], reward[live]
+            p_next = self._prey_moves(p, m, r)
+            m_next = self._monster_moves(p, m)
+            prey[live], monster[live] = p_next, m_next
+
+            won = p_next == r
+            caught = ~won & (p_next == m_next)
+            ended = won | caught
+            result[live[won]] = PREY_WINS
+            result[live[caught]] = MONSTER_WINS
+            steps[live[ended]] = step
+            live = live[~ended]
+
+        return result, steps
+
+
+# ==============================================================================
+#  POLICY SWEEP
+# ==============================================================================
+EPISODES = 100_000
+MAX_STEPS = 500
+
+
+def main():
+    graph = grid_graph(GRID_LARGE)
+    t0 = time.perf_counter()
+    next_hop_table(graph)
+    prey, monster, reward = random_starts(graph, EPISODES)
+    print(f"GRID_LARGE, {EPISODES} random starts, {MAX_STEPS}-step limit "
+          f"(tables + starts built in {time.perf_counter() - t0:.2f}s)\n")
+    print(f"{'prey':<8} | {'monster':<8} | {'prey':>6} | {'monster':>7} | {'timeout':>7} | "
+          f"{'steps':>6} | {'games/sec':>10}")
+    print("-" * 70)
+    for prey_policy in PREY_POLICIES:
+        for monster_policy in MONSTER_POLICIES:
+            sim = VectorSim(GRID_LARGE, prey_policy, monster_policy)
+            t0 = time.perf_counter()
+            result, steps = sim.run(prey, monster, reward, MAX_STEPS)
+            elapsed = time.perf_counter() - t0
+            print(f"{prey_policy:<8} | {monster_policy:<8} | {np.mean(result == PREY_WINS):>6.1%} | "
+                  f"{np.mean(result == MONSTER_WINS):>7.1%} | {np.mean(result == RUNNING):>7.1%} | "
+                  f"{steps.mean():>6.1f} | {EPISODES / elapsed:>10.0f}")
+
+    # Same starts through the one-game-at-a-time simulator, A* against A*
+    from phase2.compare_algorithms import GameSimulator
+
+    sample = 200
+    sim = VectorSim(GRID_LARGE, "astar", "astar")
+    result, _ = sim.run(prey[:sample], monster[:sample], reward[:sample], MAX_STEPS)
+    agree = 0
+    t0 = time.perf_counter()
+    for i in range(sample):
+        m = GameSimulator("check", "astar", "astar", max_steps=MAX_STEPS,
+                          prey_start=list(graph.position(int(prey[i]))),
+                          monster_start=list(graph.position(int(monster[i]))),
+                          reward_pos=list(graph.position(int(reward[i])))).run()
+        expected = {"prey": PREY_WINS, "monster": MONSTER_WINS, None: RUNNING}[m.winner]
+        agree += expected == result[i]
+    rate = sample / (time.perf_counter() - t0)
+    print(f"\nGameSimulator, A* vs A* on the first {sample} starts: {rate:.0f} games/sec, "
+          f"same winner in {agree}/{sample}")
+
+
+if __name__ == "__main__":
+    profiling.install()
+    main()
@@ -0,0 +1,290 @@
+"""
+Opt-in profiling for the project's scripts.
+
+A script calls install() when it starts. Profiling is then switched on by
+either
+
+    PROFILE=cprofile python3 phase2/minimax_both_players.py
+    python3 phase2/minimax_both_players.py --profile            (= cprofile)
+    python3 phase2/minimax_both_players.py --profile=sample
+
+and left off (install() does nothing) otherwise. Any script, wired or not,
+can also be run under the profiler directly:
+
+    python3 profiling.py [--sample] grid2/grid2_astar.py [script args]
+
+Modes:
+    cprofile   deterministic cProfile of the whole run
+    sample     statistical: the main thread's stack is recorded every
+               PROFILE_INTERVAL seconds of CPU time (SIGPROF timer, Unix
+               only); much lower overhead on hot loops
+
+At exit, PROFILE_DIR (default profiles/) gets <script>-<time>.* files:
+
+    .prof       cProfile stats (cprofile mode): pstats, snakeviz, gprof2dot
+    .collapsed  "frame;frame;frame count" lines for flamegraph.pl or
+                speedscope. In cprofile mode the stacks are rebuilt from
+                caller/callee times, so shared callees are apportioned by
+                their callers' share of the time
+    .txt        top functions and the phase table
+
+Phases: code marks named sections with `with phase("render"):` (or adds a
+time it already measured with add_phase_time). The totals are always kept
+- it is two clock reads per section - and reported when profiling is on, so
+a frame's time splits into search, render, export, ...
+"""
+
+import os
+import sys
+import time
+import atexit
+from contextlib import contextmanager
+
+ENV_VAR = "PROFILE"
+DIR_ENV_VAR = "PROFILE_DIR"
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles")
+MODES = ("cprofile", "sample")
+SAMPLE_INTERVAL = float(os.environ.get("PROFILE_INTERVAL", 0.001))
+MAX_STACK_DEPTH = 64
+MIN_STACK_SHARE = 1e-4    # cprofile stacks below this share of the run's time are dropped
+TOP_FUNCTIONS = 30
+
+# phase name -> [total ns, count]
+_phases = {}
+_active = None
+
+
+# ==============================================================================
+#  PHASE TIMERS
+# ==============================================================================
+def add_phase_time(name, ns):
+    """Add `ns` nanoseconds to phase `name`."""
+    entry = _phases.get(name)
+    if entry is None:
+        _phases[name] = [ns, 1]
+    else:
+        entry[0] += ns
+        entry[1] += 1
+
+
+@contextmanager
+def phase(name):
+    """Time the enclosed block as phase `name`."""
+    t0 = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        add_phase_time(name, time.perf_counter_ns() - t0)
+
+
+def phase_report(wall_ns=None):
+    """Phase table as text: total ms, calls, ms per call, share of the wall time."""
+    if not _phases:
+        return "(no phases recorded)"
+    lines = [f"{'phase':<12} | {'total ms':>10} | {'calls':>7} | {'ms/call':>8} | {'of wall':>7}"]
+    lines.append("-" * 56)
+    for name, (ns, count) in sorted(_phases.items(), key=lambda kv: -kv[1][0]):
+        share = f"{ns / wall_ns:>7.1%}" if wall_ns else f"{'':>7}"
+        lines.append(f"{name:<12} | {ns / 1e6:>10.1f} | {count:>7} | {ns / 1e6 / count:>8.3f} | {share}")
+    return "\n".join(lines)
+
+
+# ==============================================================================
+#  PROFILERS
+# ==============================================================================
+def _frame_label(code):
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+class SamplingProfiler:
+    """Counts the main thread's stacks on a CPU-time timer (signal.ITIMER_PROF)."""
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks = {}
+        self.samples = 0
+
+    def _sample(self, signum, frame):
+        labels = []
+        while frame is not None and len(labels) < MAX_STACK_DEPTH:
+            labels.append(_frame_label(frame.f_code))
+            frame = frame.f_back
+        key = ";".join(reversed(labels))
+        self.stacks[key] = self.stacks.get(key, 0) + 1
+        self.samples += 1
+
+    def enable(self):
+        import signal
+        if not hasattr(signal, "setitimer"):
+            raise RuntimeError("sampling needs signal.setitimer (Unix); use PROFILE=cprofile")
+        signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def disable(self):
+        import signal
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+
+    def collapsed(self):
+        return [f"{stack} {count}" for stack, count in sorted(self.stacks.items())]
+
+
+def collapsed_from_stats(stats):
+    """
+    Collapsed stacks (in microseconds) rebuilt from a pstats.Stats call graph.
+
+    Walks from the functions nobody called down the callee edges. A
+    function's time on one stack is its total time scaled by the share of
+    its cumulative time that came through that caller edge. Branches worth
+    less than MIN_STACK_SHARE of the total are cut, which keeps the walk
+    linear in the output even when many call paths share callees.
+    """
+    entries = stats.stats          # func -> (cc, nc, tt, ct, callers{caller: (cc, nc, tt, ct)})
+    callees = {}
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+    label = lambda f: f"{os.path.basename(f[0])}:{f[2]}" if f[0] != "~" else f[2]
+    out = {}
+    roots = [(func, ct) for func, (_, _, _, ct, callers) in entries.items() if not callers]
+    floor = MIN_STACK_SHARE * sum(ct for _, ct in roots)
+
+    def walk(func, share, stack, on_stack):
+        _, _, tt, ct, _ = entries[func]
+        if ct <= 0 or len(stack) >= MAX_STACK_DEPTH:
+            return
+        scale = share / ct
+        key = ";".join(stack)
+        us = int(tt * scale * 1e6)
+        if us:
+            out[key] = out.get(key, 0) + us
+        for child, edge_ct in callees.get(func, ()):
+            if child in on_stack or child not in entries or edge_ct * scale < floor:
+                continue
+            on_stack.add(child)
+            walk(child, edge_ct * scale, stack + [label(child)], on_stack)
+            on_stack.discard(child)
+
+    for func, ct in roots:
+        walk(func, ct, [label(func)], {func})
+    return [f"{stack} {count}" for stack, count in sorted(out.items())]
+
+
+class _Session:
+    """One profiled run: starts the profiler and writes the outputs at exit."""
+
+    def __init__(self, mode, name):
+        self.mode = mode
+        self.name = name
+        self.t0 = time.perf_counter_ns()
+        if mode == "sample":
+            self.profiler = SamplingProfiler()
+        else:
+            import cProfile
+            self.profiler = cProfile.Profile()
+        self.profiler.enable()
+        atexit.register(self.finish)
+
+    def finish(self):
+        global _active
+        self.profiler.disable()
+        _active = None
+        wall_ns = time.perf_counter_ns() - self.t0
+        out_dir = os.environ.get(DIR_ENV_VAR) or DEFAULT_DIR
+        os.makedirs(out_dir, exist_ok=True)
+        base = os.path.join(out_dir, f"{self.name}-{time.strftime('%Y%m%d-%H%M%S')}")
+
+        if self.mode == "sample":
+            stacks = self.profiler.collapsed()
+            header = f"{self.profiler.samples} samples every {1000 * self.profiler.interval:g} ms of CPU time"
+            top = _top_from_samples(self.profiler.stacks)
+        else:
+            import io
+            import pstats
+            self.profiler.dump_stats(base + ".prof")
+            stats = pstats.Stats(self.profiler)
+            stacks = collapsed_from_stats(stats)
+            buf = io.StringIO()
+            stats.stream = buf
+            stats.sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+            header = f"cProfile, {len(stats.stats)} functions"
+            top = buf.getvalue()
+
+        with open(base + ".collapsed", "w") as f:
+            f.write("\n".join(stacks) + "\n")
+        report = f"{self.name}: {header}, {wall_ns / 1e9:.2f} s wall\n\n{phase_report(wall_ns)}\n\n{top}"
+        with open(base + ".txt", "w") as f:
+            f.write(report)
+        print(f"\n[profile] {header}; phases:\n{phase_report(wall_ns)}", file=sys.stderr)
+        print(f"[profile] wrote {base}.{{{'prof,' if self.mode != 'sample' else ''}collapsed,txt}}",
+              file=sys.stderr)
+
+
+def _top_from_samples(stacks):
+    """Self and inclusive sample counts per function, as text."""
+    own, incl = {}, {}
+    total = sum(stacks.values()) or 1
+    for stack, count in stacks.items():
+        frames = stack.split(";")
+        own[frames[-1]] = own.get(frames[-1], 0) + count
+        for f in set(frames):
+            incl[f] = incl.get(f, 0) + count
+    lines = [f"{'self':>7} {'total':>7}  function"]
+    for f, n in sorted(incl.items(), key=lambda kv: -kv[1])[:TOP_FUNCTIONS]:
+        lines.append(f"{own.get(f, 0) / total:>7.1%} {n / total:>7.1%}  {f}")
+    return "\n".join(lines) + "\n"
+
+
+# ==============================================================================
+#  ENTRY POINTS
+# ==============================================================================
+def _requested_mode(argv):
+    """Mode from a --profile[=MODE] argument (removed from argv) or $PROFILE; None if off."""
+    mode = None
+    for arg in list(argv[1:]):
+        if arg == "--profile" or arg.startswith("--profile="):
+            argv.remove(arg)
+            mode = arg.partition("=")[2] or "cprofile"
+    if mode is None:
+        mode = os.environ.get(ENV_VAR, "").strip().lower() or None
+        if mode in ("1", "true", "yes"):
+            mode = "cprofile"
+    if mode is not None and mode not in MODES:
+        raise SystemExit(f"Unknown profile mode {mode!r}; expected one of {', '.join(MODES)}")
+    return mode
+
+
+def install(name=None, mode=None):
+    """
+    Start profiling this run if --profile, $PROFILE or `mode` asks for it.
+
+    Call once at the top of a script (before its argument parsing, since
+    --profile is taken out of sys.argv). Returns the mode, or None.
+    """
+    global _active
+    mode = _requested_mode(sys.argv) or mode
+    if mode is None or _active is not None:
+        return None
+    name = name or os.path.splitext(os.path.basename(sys.argv[0]))[0] or "profile"
+    _active = _Session(mode, name)
+    return mode
+
+
+def main():
+    import runpy
+
+    args = sys.argv[1:]
+    mode = "cprofile"
+    if args and args[0] in ("--sample", "--cprofile"):
+        mode = args.pop(0)[2:]
+    if not args:
+        print("Usage: python3 profiling.py [--sample] SCRIPT [ARGS...]")
+        sys.exit(1)
+    script = args[0]
+    sys.argv = args
+    sys.path.insert(0, os.path.dirname(os.path.abspath(script)))
+    install(mode=mode)
+    runpy.run_path(script, run_name="__main__")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+AdversarialSearch root behaviour that the scenario wrappers rely on.
+
+Run: python3 -m pytest -q tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from phase2.game_engine import grid_graph, AdversarialSearch, distance_evaluation
+
+# A loop with a two-cell pocket hanging off its bottom edge
+POCKET_GRID = [
+    [1, 1, 1, 1, 1, 1, 1],
+    [1, 0, 0, 0, 0, 0, 1],
+    [1, 0, 1, 1, 1, 0, 1],
+    [1, 0, 0, 0, 0, 0, 1],
+    [1, 1, 1, 0, 1, 1, 1],
+    [1, 1, 1, 0, 1, 1, 1],
+    [1, 1, 1, 1, 1, 1, 1],
+]
+REWARD = (5, 1)
+TRAPPED_PREY, BLOCKING_MONSTER = (3, 5), (3, 4)
+
+
+def test_trapped_root_still_returns_a_legal_move():
+    graph = grid_graph(POCKET_GRID)
+    prey, monster = graph.index(TRAPPED_PREY), graph.index(BLOCKING_MONSTER)
+    for prey_turn in (True, False):
+        for depth in (2, 3, 5):
+            pruned = AdversarialSearch(graph, graph.index(REWARD), distance_evaluation)
+            plain = AdversarialSearch(graph, graph.index(REWARD), distance_evaluation, dead_ends=False)
+            move, score = pruned.best_move(prey, monster, depth, prey_turn)
+            assert move in graph.moves[prey if prey_turn else monster]
+            assert (move, score) == plain.best_move(prey, monster, depth, prey_turn)
+
+
+def fractional_evaluation(graph, prey, monster, reward):
+    """distance_evaluation on a non-integer scale, with position-dependent tie breaks."""
+    return 0.37 * distance_evaluation(graph, prey, monster, reward) + 0.001 * (prey % 7)
+
+
+def test_parallel_search_matches_serial():
+    import random
+    from config import GRID_LARGE, GOAL_POS_LARGE
+    from phase2.parallel_search import ParallelSearch, BENCH_POSITIONS
+
+    rng = random.Random(0)
+    open_cells = [(x, y) for y, row in enumerate(GRID_LARGE) for x, cell in enumerate(row) if cell != 1]
+    random_positions = [(*rng.sample(open_cells, 2), rng.random() < 0.5) for _ in range(40)]
+    pocket_cells = [(x, y) for y, row in enumerate(POCKET_GRID) for x, cell in enumerate(row) if cell != 1]
+    pocket_positions = [(prey, monster, prey_turn) for prey in pocket_cells for monster in pocket_cells
+                        if prey != monster for prey_turn in (True, False)]
+    cases = [
+        (POCKET_GRID, REWARD, pocket_positions),
+        (GRID_LARGE, tuple(GOAL_POS_LARGE), BENCH_POSITIONS + random_positions),
+    ]
+    for grid, reward_pos, positions in cases:
+        graph = grid_graph(grid)
+        reward = graph.index(reward_pos)
+        for evaluate in (distance_evaluation, fractional_evaluation):
+            for ybw in (True, False):   # without YBW, siblings finish out of order and ties get re-searched
+                with ParallelSearch(grid, workers=2, evaluate=evaluate, ybw=ybw) as parallel:
+                    for prey_pos, monster_pos, prey_turn in positions:
+                        prey, monster = graph.index(prey_pos), graph.index(monster_pos)
+                        for depth in (1, 2, 3, 4):
+                            serial = AdversarialSearch(graph, reward, evaluate).best_move(
+                                prey, monster, depth, prey_turn)
+                            assert parallel.best_move(prey, monster, reward, depth, prey_turn) == serial
@@ -0,0 +1,45 @@
+"""
+MetricsSink resume: same columns append, different columns fail clearly.
+
+Run: python3 -m pytest -q tests
+"""
+import os
+import sys
+from dataclasses import dataclass
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from phase2.metrics_sink import MetricsSink
+
+
+@dataclass
+class Before:
+    scenario_name: str
+    steps_to_end: int
+
+
+@dataclass
+class After(Before):
+    prey_decisions: int = 0
+
+
+def test_csv_resume_appends_and_keeps_keys(tmp_path):
+    path = str(tmp_path / "games.csv")
+    with MetricsSink(path) as sink:
+        sink.write(Before("a", 10), seed=1)
+    with MetricsSink(path) as sink:
+        assert sink.done("a", 1)
+        sink.write(Before("a", 12), seed=2)
+    with MetricsSink(path) as sink:
+        assert sink.completed == {("a", 1), ("a", 2)}
+
+
+def test_csv_resume_with_new_column_raises(tmp_path):
+    path = str(tmp_path / "games.csv")
+    with MetricsSink(path) as sink:
+        sink.write(Before("a", 10), seed=1)
+    with MetricsSink(path) as sink:
+        with pytest.raises(ValueError, match="prey_decisions"):
+            sink.write(After("a", 12, 11), seed=2)
@@ -0,0 +1,33 @@
+"""
+batch_runner.random_placement on grids with and without a valid placement.
+
+Run: python3 -m pytest -q tests
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import GRID_LARGE
+from utils import get_bfs_distance_field
+from phase2.batch_runner import random_placement
+
+
+def test_placement_is_pairwise_separated():
+    width = len(GRID_LARGE[0])
+    for seed in range(20):
+        cells = random_placement(GRID_LARGE, seed, 10)
+        assert cells == random_placement(GRID_LARGE, seed, 10)
+        for i, a in enumerate(cells):
+            dist, _ = get_bfs_distance_field(a, GRID_LARGE)
+            for b in cells[i + 1:]:
+                assert dist[b[1] * width + b[0]] >= 10
+
+
+def test_no_valid_triple_raises():
+    corridor = [[0, 0, 0, 0, 0]]
+    assert sorted(random_placement(corridor, 0, 2)) == [[0, 0], [2, 0], [4, 0]]
+    with pytest.raises(ValueError):
+        random_placement(corridor, 0, 3)
@@ -0,0 +1,56 @@
+"""
+Replay files: read back tick for tick, also when the recorder was never closed.
+
+Run: python3 -m pytest -q tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from config import GRID_LARGE
+from phase2.game_engine import ChaseGame, AStarPolicy
+from phase2.replay import ReplayRecorder, Replay
+
+
+def _record(path, grid, prey, monster, reward, close=True, max_steps=None):
+    game = ChaseGame(grid, prey, monster, reward, AStarPolicy(), AStarPolicy(), max_steps=max_steps)
+    game.recorder = ReplayRecorder(path)
+    game.recorder.start(game)
+    states = [(list(game.prey_pos), list(game.monster_pos), list(game.prey_path))]
+    while not game.result and (max_steps is None or game.step_count < max_steps):
+        game.tick()
+        states.append((list(game.prey_pos), list(game.monster_pos), list(game.prey_path)))
+    if close:
+        game.recorder.close()
+    return states
+
+
+def _assert_matches(replay, states):
+    assert len(replay) == len(states)
+    for tick, (prey, monster, prey_path) in enumerate(states):
+        rec = replay[tick]
+        assert (rec["prey_pos"], rec["monster_pos"], rec["prey_path"]) == (prey, monster, prey_path)
+
+
+@pytest.mark.parametrize("close", [True, False])
+def test_replay_reads_back_closed_and_unclosed_files(tmp_path, close):
+    path = tmp_path / "game.rpl"
+    states = _record(path, GRID_LARGE, [1, 1], [28, 28], [20, 21], close=close)
+    replay = Replay(path)
+    assert replay.closed == close
+    _assert_matches(replay, states)
+
+
+def test_replay_records_grids_over_65536_cells(tmp_path):
+    path = tmp_path / "big.rpl"
+    grid = [[0] * 300 for _ in range(300)]
+    states = _record(path, grid, [0, 0], [299, 299], [299, 0], max_steps=10)
+    _assert_matches(Replay(path), states)
+
+
+def test_replay_rejects_unrecordable_grid(tmp_path):
+    with pytest.raises(ValueError):
+        _record(tmp_path / "wide.rpl", [[0] * 40000], [0, 0], [5, 0], [9, 0])
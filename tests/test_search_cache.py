@@ -0,0 +1,50 @@
+"""
+The scenario wrappers keep one transposition table across calls; a call with
+a different reward must not reuse scores searched for the previous one.
+
+Run: python3 -m pytest -q tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import GRID_LARGE
+from phase2 import minimax_both_players as both
+from phase2 import minimax_evasive_prey as evasive
+
+PREY, MONSTER = (1, 1), (28, 28)
+REWARDS = [(20, 21), (3, 1), (28, 28)]
+
+
+def _fresh_score(module, fn, *args):
+    module._minimax_cache.clear()
+    return fn(*args)[1]
+
+
+def test_both_players_cache_follows_reward():
+    fresh = {r: _fresh_score(both, both.minimax_both_players, PREY, MONSTER, r, 3, True, GRID_LARGE)
+             for r in REWARDS}
+    assert len(set(fresh.values())) > 1
+    for r in REWARDS + REWARDS[::-1]:
+        assert both.minimax_both_players(PREY, MONSTER, r, 3, True, GRID_LARGE)[1] == fresh[r]
+
+
+def test_evasive_prey_cache_follows_reward():
+    fresh = {r: _fresh_score(evasive, evasive.minimax_evasive_prey, PREY, MONSTER, r, 2, GRID_LARGE)
+             for r in REWARDS}
+    for r in REWARDS + REWARDS[::-1]:
+        assert evasive.minimax_evasive_prey(PREY, MONSTER, r, 2, GRID_LARGE)[1] == fresh[r]
+
+
+def test_principal_variation_follows_reward(monkeypatch):
+    monkeypatch.setattr(both, "REUSE_PRINCIPAL_VARIATION", True)
+    both._prey_pv.bind(None)
+    # Plan toward one reward, then ask from the position that plan expects next
+    both.find_prey_minimax_move(PREY, MONSTER, REWARDS[0], GRID_LARGE)
+    expected = [state for state, _ in both._prey_pv.ahead]
+    assert expected
+    prey, monster = (both.grid_graph(GRID_LARGE).position(i) for i in expected[0])
+    reused = both._prey_pv.reused
+    both.find_prey_minimax_move(prey, monster, REWARDS[1], GRID_LARGE)
+    assert both._prey_pv.reused == reused
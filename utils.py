@@ -67,6 +67,79 @@ def get_bfs_path(start, goal, grid=None, return_info=False):
     return []
 
 
+def get_bfs_distance_field(start, grid=None):
+    """
+    Runs a single BFS from start and records the distance to every reachable cell.
+
+    Cells are integer-encoded (index = y * grid_width + x) like get_astar_path_fast,
+    so one call answers "how far is start from X?" for every X on the grid.
+
+    Args:
+        start: [x, y] starting position
+        grid: Grid to use (defaults to GRID if not provided)
+
+    Returns:
+        (dist, parent) flat lists of length grid_width * grid_height.
+        dist[i] is -1 for unreachable cells; parent[i] is -1 for the start
+        and for unreachable cells. Use path_from_parents to rebuild a path.
+    """
+    if grid is None:
+        grid = GRID
+
+    grid_width = len(grid[0]) if grid else GRID_WIDTH
+    grid_height = len(grid) if grid else GRID_HEIGHT
+
+    size = grid_width * grid_height
+    dist = [-1] * size
+    parent = [-1] * size
+
+    start_idx = start[1] * grid_width + start[0]
+    dist[start_idx] = 0
+    q = collections.deque([start_idx])
+
+    while q:
+        current = q.popleft()
+        x = current % grid_width
+        y = current // grid_width
+        next_dist = dist[current] + 1
+
+        # neighbor order: Down, Up, Right, Left (same as get_bfs_path)
+        for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < grid_width and 0 <= ny < grid_height:
+                if grid[ny][nx] == 1:
+                    continue
+                neighbor_idx = ny * grid_width + nx
+                if dist[neighbor_idx] != -1:
+                    continue
+                dist[neighbor_idx] = next_dist
+                parent[neighbor_idx] = current
+                q.append(neighbor_idx)
+
+    return dist, parent
+
+
+def path_from_parents(parent, goal, grid_width):
+    """
+    Rebuilds the path to goal from a parent field produced by get_bfs_distance_field.
+
+    Args:
+        parent: flat parent list from get_bfs_distance_field
+        goal: [x, y] goal position (must be reachable)
+        grid_width: width of the grid the field was computed on
+
+    Returns:
+        List of tuples from the field's start to goal.
+    """
+    path = []
+    cur = goal[1] * grid_width + goal[0]
+    while cur != -1:
+        path.append((cur % grid_width, cur // grid_width))
+        cur = parent[cur]
+    path.reverse()
+    return path
+
+
 def get_manhattan_distance(pos1, pos2):
     """
     Calculates Manhattan distance between two positions.
@@ -394,3 +467,13 @@ def get_minimax_path(start, goal, grid=None, return_info=False, depth=10, is_max
     if return_info:
         return [], {"visited": closed, "nodes_expanded": nodes_expanded, "score": float('inf')}
     return []
+
+
+# Shortest-path functions with the common (start, goal, grid, return_info) signature,
+# by name. Benchmarks iterate over this, so a new pathfinder only needs an entry here.
+# get_minimax_path is depth-bounded (not always a shortest path) and is not listed.
+PATHFINDERS = {
+    "bfs": get_bfs_path,
+    "astar": get_astar_path,
+    "astar_fast": get_astar_path_fast,
+}